@@ -39,10 +39,10 @@ try:
 except ModuleNotFoundError:
     pass
 
-from .orchestrator import OrchestratorAgent
+from .orchestrator import OrchestratorAgent, WorkerCallError, WorkerCallPolicy
 from .emotion_worker import EmotionWorker
 from .churn_worker import ChurnWorker
 from .behavior_worker import BehaviorWorker
 
-__all__.append("OrchestratorAgent")
+__all__.extend(["OrchestratorAgent", "WorkerCallError", "WorkerCallPolicy"])
 __all__.extend(["EmotionWorker", "ChurnWorker", "BehaviorWorker"])
@@ -9,18 +9,25 @@ from __future__ import annotations
 from types import SimpleNamespace
 from typing import Any
 
-from autogen_core import MessageContext, RoutedAgent, rpc
+from autogen_core import MessageContext, rpc
 
 from ..domain.messages import InterventionTask, WorkerResponse
 from ..domain.schemas import BehaviorWorkerOutput
+from ..infrastructure.cache import ResultCache
 from ..infrastructure.validation.output_validator import OutputValidator
+from .task_worker import InterventionTaskWorker
 
 
-class BehaviorWorker(RoutedAgent):
+class BehaviorWorker(InterventionTaskWorker):
     """行为管控Worker"""
 
-    def __init__(self, model_client: Any, tools: list[Any]) -> None:
-        super().__init__("Behavior管控Worker")
+    def __init__(
+        self,
+        model_client: Any,
+        tools: list[Any],
+        result_cache: ResultCache | None = None,
+    ) -> None:
+        super().__init__("Behavior管控Worker", result_cache=result_cache)
         self.model_client = model_client
         self.tools = tools
         self.validator = OutputValidator(BehaviorWorkerOutput, max_retries=3)
@@ -42,6 +49,9 @@ class BehaviorWorker(RoutedAgent):
         self, message: InterventionTask, ctx: MessageContext
     ) -> WorkerResponse:
         """将干预任务转换为行为管控响应。"""
+        return self._respond_cached(message)
+
+    def _respond(self, message: InterventionTask) -> WorkerResponse:
         is_bot, confidence, risk_tags = self._infer_behavior_risk(message)
         measures = self._decide_measures(
             SimpleNamespace(is_bot=is_bot, confidence=confidence)
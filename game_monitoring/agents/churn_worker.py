@@ -9,18 +9,25 @@ from __future__ import annotations
 from types import SimpleNamespace
 from typing import Any
 
-from autogen_core import MessageContext, RoutedAgent, rpc
+from autogen_core import MessageContext, rpc
 
 from ..domain.messages import InterventionTask, WorkerResponse
 from ..domain.schemas import ChurnWorkerOutput
+from ..infrastructure.cache import ResultCache
 from ..infrastructure.validation.output_validator import OutputValidator
+from .task_worker import InterventionTaskWorker
 
 
-class ChurnWorker(RoutedAgent):
+class ChurnWorker(InterventionTaskWorker):
     """流失挽回Worker"""
 
-    def __init__(self, model_client: Any, tools: list[Any]) -> None:
-        super().__init__("Churn挽回Worker")
+    def __init__(
+        self,
+        model_client: Any,
+        tools: list[Any],
+        result_cache: ResultCache | None = None,
+    ) -> None:
+        super().__init__("Churn挽回Worker", result_cache=result_cache)
         self.model_client = model_client
         self.tools = tools
         self.validator = OutputValidator(ChurnWorkerOutput, max_retries=3)
@@ -42,6 +49,9 @@ class ChurnWorker(RoutedAgent):
         self, message: InterventionTask, ctx: MessageContext
     ) -> WorkerResponse:
         """将干预任务转换为流失挽回响应。"""
+        return self._respond_cached(message)
+
+    def _respond(self, message: InterventionTask) -> WorkerResponse:
         risk_level, risk_score = self._infer_risk(message)
         plan = self._create_retention_plan(SimpleNamespace(level=risk_level))
         validated = ChurnWorkerOutput.model_validate(
@@ -9,18 +9,25 @@ from __future__ import annotations
 from types import SimpleNamespace
 from typing import Any
 
-from autogen_core import MessageContext, RoutedAgent, rpc
+from autogen_core import MessageContext, rpc
 
 from ..domain.messages import InterventionTask, WorkerResponse
 from ..domain.schemas import EmotionWorkerOutput
+from ..infrastructure.cache import ResultCache
 from ..infrastructure.validation.output_validator import OutputValidator
+from .task_worker import InterventionTaskWorker
 
 
-class EmotionWorker(RoutedAgent):
+class EmotionWorker(InterventionTaskWorker):
     """情绪安抚Worker"""
 
-    def __init__(self, model_client: Any, tools: list[Any]) -> None:
-        super().__init__("Emotion安抚Worker")
+    def __init__(
+        self,
+        model_client: Any,
+        tools: list[Any],
+        result_cache: ResultCache | None = None,
+    ) -> None:
+        super().__init__("Emotion安抚Worker", result_cache=result_cache)
         self.model_client = model_client
         self.tools = tools
         self.validator = OutputValidator(EmotionWorkerOutput, max_retries=3)
@@ -45,6 +52,9 @@ class EmotionWorker(RoutedAgent):
         self, message: InterventionTask, ctx: MessageContext
     ) -> WorkerResponse:
         """将干预任务转换为情绪 Worker 响应。"""
+        return self._respond_cached(message)
+
+    def _respond(self, message: InterventionTask) -> WorkerResponse:
         emotion_type = self._infer_emotion(message)
         strategy = self._decide_strategy(SimpleNamespace(emotion=emotion_type))
         validated = EmotionWorkerOutput.model_validate(
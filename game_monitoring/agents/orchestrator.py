@@ -2,49 +2,273 @@
 Orchestrator Agent实现
 
 负责接收玩家事件、生成任务包、合并Worker结果。
+每个Worker调用可以设置截止时间和对冲请求，超时或失败的Worker不阻塞整体干预，
+合并结果中记录缺失的Worker。
+每次 Worker 调用和整体事件处理的耗时、结果写入指标注册表。
 """
 
 from __future__ import annotations
 
 import asyncio
+import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, Mapping, Optional
 
-from autogen_core import AgentId, MessageContext, RoutedAgent, rpc
+from autogen_core import AgentId, CancellationToken, MessageContext, RoutedAgent, rpc
 
-from ..domain.messages import InterventionTask, PlayerEvent, WorkerResponse
+from ..domain.messages import (
+    InterventionTask,
+    InterventionTaskBatch,
+    PlayerEvent,
+    PlayerEventBatch,
+    WorkerResponse,
+)
+from ..infrastructure.monitoring.metrics import MetricsRegistry, get_metrics_registry
+
+
+@dataclass(frozen=True)
+class WorkerCallPolicy:
+    """
+    单个Worker的调用策略
+
+    Attributes:
+        timeout: 截止时间（秒），None 表示不限时
+        hedge_after: 超过该时间仍未响应时发送一个重复请求，先返回者胜出；None 表示不对冲
+    """
+    timeout: Optional[float] = None
+    hedge_after: Optional[float] = None
+
+
+class WorkerCallError(Exception):
+    """Worker 超时或全部请求失败"""
+
+    def __init__(self, worker_type: str, reason: str):
+        super().__init__(f"{worker_type}: {reason}")
+        self.worker_type = worker_type
+        self.reason = reason
 
 
 class OrchestratorAgent(RoutedAgent):
     """干预编排Agent"""
 
-    def __init__(self, model_client: Any, worker_types: list[str]) -> None:
+    def __init__(
+        self,
+        model_client: Any,
+        worker_types: list[str],
+        worker_policies: Mapping[str, WorkerCallPolicy] | None = None,
+        default_policy: WorkerCallPolicy | None = None,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """
+        Args:
+            model_client: 模型客户端
+            worker_types: Worker agent 类型列表
+            worker_policies: 按 worker 类型（如 "emotion_worker"）覆盖的调用策略
+            default_policy: 未单独配置的 worker 使用的策略，默认不限时、不对冲
+            metrics: 指标注册表，默认使用进程级共享注册表
+        """
         super().__init__("Intervention orchestrator")
         self.model_client = model_client
         self.worker_types = worker_types
+        self.worker_policies = dict(worker_policies or {})
+        self.default_policy = default_policy or WorkerCallPolicy()
+
+        registry = metrics or get_metrics_registry()
+        self._event_latency = registry.histogram(
+            "orchestrator_event_seconds", "编排器处理一次事件（或事件批次）的耗时", ("mode",)
+        )
+        self._worker_latency = registry.histogram(
+            "worker_call_seconds", "Worker 调用耗时（含对冲）", ("worker_type", "outcome")
+        )
+        self._worker_hedges = registry.counter(
+            "worker_hedged_requests_total", "Worker 对冲请求次数", ("worker_type",)
+        )
+        self._worker_errors = registry.rolling_rate(
+            "worker_call_error_rate", "滑动窗口内 Worker 调用失败或超时的比例", ("worker_type",)
+        )
 
     @rpc
     async def handle_player_event(
         self, message: PlayerEvent, ctx: MessageContext
     ) -> dict:
-        """处理玩家事件并聚合所有 worker 响应。"""
+        """处理玩家事件并聚合按时返回的 worker 响应。"""
+        with self._event_latency.time(mode="single"):
+            return await self._handle_event(message)
+
+    async def _handle_event(self, message: PlayerEvent) -> dict:
         tasks = self._generate_tasks(message)
-        worker_results = await asyncio.gather(
+        outcomes = await asyncio.gather(
             *[
-                self.send_message(
-                    task,
-                    AgentId(f"{task.task_type}_worker", "default"),
-                )
+                self._call_worker(task, f"{task.task_type}_worker")
                 for task in tasks
-            ]
+            ],
+            return_exceptions=True,
         )
 
-        final_result = self._merge_results(worker_results)
+        worker_results: list[WorkerResponse] = []
+        missing: dict[str, str] = {}
+        for task, outcome in zip(tasks, outcomes):
+            if isinstance(outcome, BaseException):
+                missing[task.task_type] = self._failure_reason(outcome)
+            else:
+                worker_results.append(outcome)
+
+        final_result = self._merge_results(worker_results, missing)
         final_result["player_id"] = message.player_id
         final_result["session_id"] = message.session_id
         return final_result
 
+    @rpc
+    async def handle_player_event_batch(
+        self, message: PlayerEventBatch, ctx: MessageContext
+    ) -> list:
+        """批量处理玩家事件：每种 worker 只发送一次批量任务，再按玩家合并结果。"""
+        if not message.events:
+            return []
+
+        with self._event_latency.time(mode="batch"):
+            return await self._handle_event_batch(message)
+
+    async def _handle_event_batch(self, message: PlayerEventBatch) -> list:
+        batches = self._generate_task_batches(message)
+        outcomes = await asyncio.gather(
+            *[
+                self._call_worker(batch, f"{batch.task_type}_worker")
+                for batch in batches
+            ],
+            return_exceptions=True,
+        )
+
+        # 每个批次内任务与事件一一对应，响应按任务顺序返回；失败的批次对所有事件缺失
+        per_event: list[list[WorkerResponse]] = [[] for _ in message.events]
+        missing: dict[str, str] = {}
+        for batch, outcome in zip(batches, outcomes):
+            if isinstance(outcome, BaseException):
+                missing[batch.task_type] = self._failure_reason(outcome)
+                continue
+            for index, response in enumerate(outcome.responses):
+                per_event[index].append(response)
+
+        final_results = []
+        for event, responses in zip(message.events, per_event):
+            final_result = self._merge_results(responses, missing)
+            final_result["player_id"] = event.player_id
+            final_result["session_id"] = event.session_id
+            final_results.append(final_result)
+        return final_results
+
+    async def _call_worker(self, message: Any, worker_type: str) -> Any:
+        """
+        按调用策略向 worker 发送消息
+
+        hedge_after 到期仍未响应时再发一个相同请求，任一请求成功即返回并取消其余请求；
+        超过 timeout 或所有请求都失败时抛出 WorkerCallError。
+        耗时按 ok / timeout / failed / cancelled 分别记录。
+        """
+        policy = self.worker_policies.get(worker_type, self.default_policy)
+        recipient = AgentId(worker_type, "default")
+        loop = asyncio.get_running_loop()
+        deadline = None if policy.timeout is None else loop.time() + policy.timeout
+        hedge_at = None if policy.hedge_after is None else loop.time() + policy.hedge_after
+
+        attempts: dict[asyncio.Future, CancellationToken] = {}
+
+        def launch() -> None:
+            token = CancellationToken()
+            attempt = asyncio.ensure_future(
+                self.send_message(message, recipient, cancellation_token=token)
+            )
+            attempts[attempt] = token
+
+        launch()
+        last_error: BaseException | None = None
+        outcome = "failed"
+        start = time.perf_counter()
+        try:
+            while True:
+                pending = [attempt for attempt in attempts if not attempt.done()]
+                if not pending:
+                    raise WorkerCallError(worker_type, self._failure_reason(last_error))
+
+                wake_at = [at for at in (deadline, hedge_at) if at is not None]
+                timeout = max(min(wake_at) - loop.time(), 0) if wake_at else None
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for attempt in done:
+                    if attempt.cancelled():
+                        continue
+                    if attempt.exception() is None:
+                        outcome = "ok"
+                        return attempt.result()
+                    last_error = attempt.exception()
+
+                now = loop.time()
+                if deadline is not None and now >= deadline:
+                    outcome = "timeout"
+                    raise WorkerCallError(worker_type, "timeout")
+                if hedge_at is not None and now >= hedge_at:
+                    # 只对冲一次
+                    hedge_at = None
+                    self._worker_hedges.inc(worker_type=worker_type)
+                    launch()
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            for attempt, token in attempts.items():
+                if not attempt.done():
+                    token.cancel()
+                    attempt.cancel()
+            self._worker_latency.observe(
+                time.perf_counter() - start, worker_type=worker_type, outcome=outcome
+            )
+            if outcome != "cancelled":
+                self._worker_errors.record(outcome != "ok", worker_type=worker_type)
+
+    @staticmethod
+    def _failure_reason(error: BaseException | None) -> str:
+        if isinstance(error, WorkerCallError):
+            return error.reason
+        if error is None:
+            return "failed"
+        return f"{type(error).__name__}: {error}"
+
+    def _generate_task_batches(
+        self, message: PlayerEventBatch
+    ) -> list[InterventionTaskBatch]:
+        """为每种 worker 生成一个任务批次，整批共用一个时间戳。"""
+        timestamp = datetime.now().isoformat()
+        batches = []
+        for worker_type in self.worker_types:
+            task_type = worker_type.removesuffix("_worker")
+            tasks = [
+                InterventionTask(
+                    task_id=f"{message.batch_id}-{task_type}-{index}",
+                    player_id=event.player_id,
+                    session_id=event.session_id,
+                    task_type=task_type,
+                    context={
+                        "triggered_scenarios": event.triggered_scenarios,
+                        "behavior_history": event.behavior_history,
+                    },
+                    timestamp=timestamp,
+                )
+                for index, event in enumerate(message.events)
+            ]
+            batches.append(
+                InterventionTaskBatch(
+                    batch_id=message.batch_id,
+                    task_type=task_type,
+                    tasks=tasks,
+                )
+            )
+
+        return batches
+
     def _generate_tasks(self, message: PlayerEvent) -> list[InterventionTask]:
         """基于配置的 worker 类型生成任务包。"""
         tasks = []
@@ -65,8 +289,16 @@ class OrchestratorAgent(RoutedAgent):
 
         return tasks
 
-    def _merge_results(self, results: list[WorkerResponse]) -> dict[str, Any]:
-        """按优先级合并多个Worker结果并对动作去重。"""
+    def _merge_results(
+        self,
+        results: list[WorkerResponse],
+        missing: Mapping[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """
+        按优先级合并多个Worker结果并对动作去重。
+
+        missing 为未按时返回的 worker 类型 -> 原因，结果中标记为部分合并。
+        """
         prioritized = sorted(
             results,
             key=lambda response: response.metadata.get("priority", 0),
@@ -91,5 +323,7 @@ class OrchestratorAgent(RoutedAgent):
             "final_actions": list(unique_actions.values()),
             "overall_confidence": avg_confidence,
             "worker_count": len(results),
+            "missing_workers": dict(missing or {}),
+            "partial": bool(missing),
             "timestamp": datetime.now().isoformat(),
         }
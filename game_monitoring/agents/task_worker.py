@@ -0,0 +1,107 @@
+"""
+干预Worker基类
+
+单任务和批量任务共用同一套响应逻辑，批量时一次 RPC 处理多个玩家的任务。
+响应按任务上下文指纹缓存：大量玩家呈现相同模式时只计算一次。
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+from abc import abstractmethod
+from typing import Optional
+
+from autogen_core import MessageContext, RoutedAgent, rpc
+
+from ..domain.messages import (
+    InterventionTask,
+    InterventionTaskBatch,
+    WorkerResponse,
+    WorkerResponseBatch,
+)
+from ..infrastructure.cache import CacheStats, ResultCache, fingerprint
+
+
+class InterventionTaskWorker(RoutedAgent):
+    """支持批量任务和结果缓存的Worker基类"""
+
+    def __init__(
+        self, description: str, result_cache: Optional[ResultCache] = None
+    ) -> None:
+        """
+        Args:
+            description: Agent 描述
+            result_cache: 响应缓存，默认 1024 条、5 分钟过期；
+                传入 ResultCache(max_entries=0) 可关闭缓存
+        """
+        super().__init__(description)
+        self.result_cache: ResultCache[WorkerResponse] = (
+            result_cache if result_cache is not None else ResultCache()
+        )
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        """缓存命中/未命中统计"""
+        return self.result_cache.stats
+
+    @abstractmethod
+    def _respond(self, message: InterventionTask) -> WorkerResponse:
+        """把单个干预任务转换为响应。"""
+
+    def _fingerprint(self, message: InterventionTask) -> str:
+        """
+        任务上下文的规范化指纹
+
+        内置 Worker 只读取触发情景名和历史动作名，时间戳、参数和玩家ID不影响结果，
+        因此不进入指纹。读取更多上下文的子类需要覆盖此方法。
+        """
+        context = message.context
+        return fingerprint(
+            {
+                "task_type": message.task_type,
+                "scenarios": [
+                    str(item.get("scenario", ""))
+                    for item in context.get("triggered_scenarios", [])
+                ],
+                "actions": [
+                    str(item.get("action", ""))
+                    for item in context.get("behavior_history", [])
+                ],
+            }
+        )
+
+    def _respond_cached(self, message: InterventionTask) -> WorkerResponse:
+        """经缓存的 _respond，命中时复制缓存响应并换上当前任务ID。"""
+        if not self.result_cache.enabled:
+            return self._respond(message)
+
+        key = self._fingerprint(message)
+        cached = self.result_cache.get(key)
+        if cached is None:
+            response = self._respond(message)
+            self.result_cache.put(key, self._copy_response(response, response.task_id))
+            return response
+        return self._copy_response(cached, message.task_id)
+
+    @staticmethod
+    def _copy_response(response: WorkerResponse, task_id: str) -> WorkerResponse:
+        # 深复制可变字段，调用方修改响应不会污染缓存
+        return dataclasses.replace(
+            response,
+            task_id=task_id,
+            intervention_actions=copy.deepcopy(response.intervention_actions),
+            metadata=copy.deepcopy(response.metadata),
+        )
+
+    @rpc
+    async def handle_intervention_task_batch(
+        self, message: InterventionTaskBatch, ctx: MessageContext
+    ) -> WorkerResponseBatch:
+        """批量处理同类型的干预任务，响应顺序与任务一致。"""
+        responses = [self._respond_cached(task) for task in message.tasks]
+        return WorkerResponseBatch(
+            batch_id=message.batch_id,
+            worker_type=message.task_type,
+            responses=responses,
+        )
@@ -4,12 +4,24 @@ Application Services - 应用服务层
 协调领域层的业务用例，无UI依赖
 """
 
-from .action_service import ActionProcessingService, ActionProcessingResult
+from .action_service import ActionEvaluation, ActionProcessingService, ActionProcessingResult
 from .agent_service import AgentService, InterventionResult
+from .intervention_scheduler import (
+    InterventionScheduler,
+    SchedulerStats,
+    intervention_priority,
+)
+from .parallel_ingestion import ParallelActionIngestion, create_worker_monitor
 
 __all__ = [
+    'ActionEvaluation',
     'ActionProcessingService',
     'ActionProcessingResult',
     'AgentService',
-    'InterventionResult'
+    'InterventionResult',
+    'InterventionScheduler',
+    'ParallelActionIngestion',
+    'SchedulerStats',
+    'create_worker_monitor',
+    'intervention_priority'
 ]
\ No newline at end of file
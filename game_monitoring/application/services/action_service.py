@@ -39,6 +39,45 @@ class ActionProcessingResult:
     threshold: int = 3
     emotion_type: str = "neutral"
     action_sequence_length: int = 0
+    intervention_payload: Any = None
+
+
+@dataclass
+class ActionEvaluation:
+    """
+    单个动作的分析结果（只含普通数据，可跨进程传递）
+
+    triggered 保留监控器返回的原始场景字典。
+    """
+    player_id: str
+    action_name: str
+    triggered: List[Dict[str, Any]]
+    emotion_type: str
+    should_intervene: bool
+    current_negative_count: int
+    threshold: int
+    action_sequence_length: int
+
+    def to_result(self) -> ActionProcessingResult:
+        if self.should_intervene:
+            result = ActionResult.INTERVENTION_TRIGGERED
+        elif self.triggered:
+            result = ActionResult.RULE_TRIGGERED
+        else:
+            result = ActionResult.SUCCESS
+
+        return ActionProcessingResult(
+            result=result,
+            player_id=self.player_id,
+            action_name=self.action_name,
+            message="处理完成",
+            triggered_rules=[type('obj', (), r) for r in self.triggered],
+            should_intervene=self.should_intervene,
+            current_negative_count=self.current_negative_count,
+            threshold=self.threshold,
+            emotion_type=self.emotion_type,
+            action_sequence_length=self.action_sequence_length
+        )
 
 
 class ActionProcessingService:
@@ -83,39 +122,7 @@ class ActionProcessingService:
             处理结果，包含是否触发干预的标记
         """
         try:
-            # 1. 添加到监控器
-            triggered = self._monitor.add_atomic_action(
-                player_id, action_name, action_params
-            )
-
-            # 2. 获取情绪类型
-            emotion_type = "neutral"
-            if triggered:
-                emotion_type = self._get_emotion_from_rules(triggered)
-
-            # 3. 更新负面计数
-            should_intervene = False
-            if emotion_type == "negative":
-                current_count = self._increment_negative_count(player_id)
-                should_intervene = current_count >= self._monitor.threshold
-            else:
-                current_count = self._get_negative_count(player_id)
-
-            # 4. 获取序列长度
-            sequence = self._monitor.get_player_action_sequence(player_id)
-
-            return ActionProcessingResult(
-                result=ActionResult.INTERVENTION_TRIGGERED if should_intervene else ActionResult.RULE_TRIGGERED if triggered else ActionResult.SUCCESS,
-                player_id=player_id,
-                action_name=action_name,
-                message="处理完成",
-                triggered_rules=[type('obj', (), r) for r in triggered],
-                should_intervene=should_intervene,
-                current_negative_count=current_count,
-                threshold=self._monitor.threshold,
-                emotion_type=emotion_type,
-                action_sequence_length=len(sequence)
-            )
+            return self.evaluate(player_id, action_name, action_params).to_result()
 
         except Exception as e:
             return ActionProcessingResult(
@@ -127,10 +134,54 @@ class ActionProcessingService:
                 should_intervene=False
             )
 
+    def evaluate(
+        self,
+        player_id: str,
+        action_name: str,
+        action_params: Dict[str, Any] = None
+    ) -> ActionEvaluation:
+        """
+        同步分析一个动作（process_action 的核心逻辑）
+
+        多进程采集模式下由工作进程直接调用，结果可序列化回主进程。
+        """
+        # 1. 添加到监控器
+        triggered = self._monitor.add_atomic_action(
+            player_id, action_name, action_params
+        )
+
+        # 2. 获取情绪类型
+        emotion_type = "neutral"
+        if triggered:
+            emotion_type = self._get_emotion_from_rules(triggered)
+
+        # 3. 更新负面计数
+        should_intervene = False
+        if emotion_type == "negative":
+            current_count = self._increment_negative_count(player_id)
+            should_intervene = current_count >= self._monitor.threshold
+        else:
+            current_count = self._get_negative_count(player_id)
+
+        # 4. 获取序列长度
+        sequence = self._monitor.get_player_action_sequence(player_id)
+
+        return ActionEvaluation(
+            player_id=player_id,
+            action_name=action_name,
+            triggered=list(triggered),
+            emotion_type=emotion_type,
+            should_intervene=should_intervene,
+            current_negative_count=current_count,
+            threshold=self._monitor.threshold,
+            action_sequence_length=len(sequence)
+        )
+
     def _get_emotion_from_rules(self, rules: List[Dict]) -> str:
         """从规则结果推断情绪"""
         for rule in rules:
-            scenario = rule.get('scenario', '')
+            # 旧版监控器返回 scenario，V2 规则引擎返回 scenario_name
+            scenario = rule.get('scenario') or rule.get('scenario_name', '')
             if any(kw in scenario for kw in ['失败', '风险', '退出', '攻击']):
                 return "negative"
             if any(kw in scenario for kw in ['充值', '胜利', '成就']):
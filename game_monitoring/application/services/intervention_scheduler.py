@@ -0,0 +1,314 @@
+"""
+干预调度器
+
+干预原本由发现触发的调用方直接 await，检测循环会被分析阻塞。
+InterventionScheduler 位于 GameMonitoringTeamV2 之前:
+- submit 立即返回 Future，检测方不等待分析
+- 有界并发：同时进行的分析不超过 max_concurrency
+- 优先级队列：按 RulePriority 和流失/情绪严重程度排序，卸载、卖号等风险排在积极场景之前
+- 同一玩家排队中的重复触发合并为一个任务，优先级取较高者
+- 背压：队列深度超过高水位时通知采集方，降到低水位后恢复；队列满时拒绝提交
+
+使用示例:
+```python
+scheduler = InterventionScheduler.for_team(team, monitor, max_concurrency=4)
+if scheduler.saturated:
+    await scheduler.wait_for_capacity()
+future = scheduler.submit(player_id, monitor.get_triggered_scenarios(player_id))
+```
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from ...infrastructure.monitoring.tracer import get_tracer
+from ...rules.engine import RuleCategory, RulePriority
+
+InterventionHandler = Callable[[str], Awaitable[Any]]
+PriorityKey = Tuple[int, int]
+
+# 类别严重程度：流失 > 情绪 > 机器人 > 其他
+_CATEGORY_SEVERITY = {
+    RuleCategory.CHURN_RISK.value: 0,
+    RuleCategory.EMOTION.value: 1,
+    RuleCategory.BOT_DETECTION.value: 2,
+}
+_DEFAULT_SEVERITY = 3
+_LOWEST_PRIORITY: PriorityKey = (RulePriority.INFO.value + 1, _DEFAULT_SEVERITY)
+
+_scenario_profiles: Optional[Dict[str, Tuple[int, str]]] = None
+
+
+def _legacy_profiles() -> Dict[str, Tuple[int, str]]:
+    """旧版规则引擎的情景不带优先级，按 build_legacy_rules 的声明补齐"""
+    global _scenario_profiles
+    if _scenario_profiles is None:
+        from ...rules.definitions import build_legacy_rules
+
+        _scenario_profiles = {
+            rule.scenario_name: (rule.priority.value, rule.category.value)
+            for rule in build_legacy_rules()
+        }
+    return _scenario_profiles
+
+
+def scenario_priority(scenario: Mapping[str, Any]) -> PriorityKey:
+    """
+    单个情景的排序键 (RulePriority 值, 类别严重程度)，越小越优先
+
+    RuleResult.to_dict() 产生的情景自带 priority/category；
+    旧版引擎的情景按情景名查表。
+    """
+    name = scenario.get('scenario') or scenario.get('scenario_name') or ''
+    default_priority, default_category = _legacy_profiles().get(
+        name, (RulePriority.MEDIUM.value, '')
+    )
+
+    priority = scenario.get('priority', default_priority)
+    if isinstance(priority, RulePriority):
+        priority = priority.value
+    category = scenario.get('category', default_category)
+    if isinstance(category, RuleCategory):
+        category = category.value
+    return int(priority), _CATEGORY_SEVERITY.get(category, _DEFAULT_SEVERITY)
+
+
+def intervention_priority(scenarios: Iterable[Mapping[str, Any]]) -> PriorityKey:
+    """一次触发的排序键：取其中最紧急的情景，没有情景时排在最后"""
+    return min((scenario_priority(s) for s in scenarios), default=_LOWEST_PRIORITY)
+
+
+@dataclass
+class SchedulerStats:
+    """调度统计"""
+    submitted: int = 0
+    merged: int = 0
+    rejected: int = 0
+    completed: int = 0
+    failed: int = 0
+    max_queue_depth: int = 0
+
+
+@dataclass
+class _Job:
+    player_id: str
+    priority: PriorityKey
+    future: asyncio.Future
+
+
+class InterventionScheduler:
+    """有界并发、按优先级调度的干预执行器"""
+
+    def __init__(
+        self,
+        handler: InterventionHandler,
+        max_concurrency: int = 4,
+        max_queue_size: int = 1_000,
+        high_watermark: Optional[int] = None,
+        low_watermark: Optional[int] = None,
+        on_backpressure: Optional[Callable[[bool], None]] = None,
+    ):
+        """
+        Args:
+            handler: 执行单个玩家干预的协程函数
+            max_concurrency: 最大并发分析数
+            max_queue_size: 排队上限，超过时 submit 抛出 asyncio.QueueFull
+            high_watermark: 进入背压的队列深度，默认 max_queue_size 的 80%
+            low_watermark: 解除背压的队列深度，默认高水位的一半
+            on_backpressure: 背压状态变化回调，参数为是否处于背压
+        """
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        if max_queue_size <= 0:
+            raise ValueError("max_queue_size must be positive")
+        self._handler = handler
+        self._max_concurrency = max_concurrency
+        self._max_queue_size = max_queue_size
+        self._high = high_watermark if high_watermark is not None else max(1, max_queue_size * 4 // 5)
+        self._low = low_watermark if low_watermark is not None else self._high // 2
+        self._on_backpressure = on_backpressure
+
+        self._heap: List[Tuple[PriorityKey, int, _Job]] = []
+        self._queued: Dict[str, _Job] = {}
+        self._sequence = itertools.count()
+        self._workers: List[asyncio.Task] = []
+        self._notify_tasks: Set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Condition] = None
+        self._capacity: Optional[asyncio.Event] = None
+        self._saturated = False
+        self._running = 0
+        self._closed = False
+        self.stats = SchedulerStats()
+
+    @classmethod
+    def for_team(cls, team: Any, monitor: Any, **kwargs: Any) -> 'InterventionScheduler':
+        """为 GameMonitoringTeamV2（或同接口对象）创建调度器"""
+        return cls(
+            lambda player_id: team.trigger_analysis_and_intervention(player_id, monitor),
+            **kwargs,
+        )
+
+    # ---- 状态 ----
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queued)
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def saturated(self) -> bool:
+        """是否处于背压状态，采集方应暂停或降速"""
+        return self._saturated
+
+    @property
+    def load(self) -> float:
+        """队列占用率 (0~1)"""
+        return len(self._queued) / self._max_queue_size
+
+    # ---- 提交 ----
+
+    def submit(
+        self,
+        player_id: str,
+        scenarios: Iterable[Mapping[str, Any]] = (),
+    ) -> asyncio.Future:
+        """
+        提交一次干预，立即返回 Future
+
+        玩家已在队列中时合并为同一个任务；队列满时抛出 asyncio.QueueFull。
+        """
+        if self._closed:
+            raise RuntimeError("scheduler is closed")
+        self._ensure_started()
+        priority = intervention_priority(scenarios)
+
+        job = self._queued.get(player_id)
+        if job is not None:
+            self.stats.merged += 1
+            if priority < job.priority:
+                # 旧堆条目保留，出队时按优先级不一致跳过
+                job.priority = priority
+                heapq.heappush(self._heap, (priority, next(self._sequence), job))
+            return job.future
+
+        if len(self._queued) >= self._max_queue_size:
+            self.stats.rejected += 1
+            raise asyncio.QueueFull(f"intervention queue is full ({self._max_queue_size})")
+
+        self.stats.submitted += 1
+        job = _Job(player_id, priority, asyncio.get_running_loop().create_future())
+        self._queued[player_id] = job
+        heapq.heappush(self._heap, (priority, next(self._sequence), job))
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, len(self._queued))
+        self._update_backpressure()
+        self._notify()
+        return job.future
+
+    async def wait_for_capacity(self) -> None:
+        """背压期间挂起，直到队列降到低水位"""
+        if self._workers:
+            await self._capacity.wait()
+
+    async def drain(self) -> None:
+        """等待队列清空且所有分析完成"""
+        if not self._workers:
+            return
+        async with self._wakeup:
+            await self._wakeup.wait_for(lambda: not self._queued and self._running == 0)
+
+    async def close(self) -> None:
+        """处理完剩余任务后停止工作协程"""
+        if not self._workers:
+            self._closed = True
+            return
+        await self.drain()
+        self._closed = True
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, *self._notify_tasks, return_exceptions=True)
+        self._workers.clear()
+
+    # ---- 内部 ----
+
+    def _ensure_started(self) -> None:
+        if self._workers:
+            return
+        self._wakeup = asyncio.Condition()
+        self._capacity = asyncio.Event()
+        self._capacity.set()
+        loop = asyncio.get_running_loop()
+        self._workers = [
+            loop.create_task(self._worker_loop()) for _ in range(self._max_concurrency)
+        ]
+
+    def _notify(self) -> None:
+        async def notify() -> None:
+            async with self._wakeup:
+                self._wakeup.notify_all()
+
+        # submit 是同步方法，唤醒放到事件循环中执行；事件循环只弱引用任务，需自行持有
+        task = asyncio.get_running_loop().create_task(notify())
+        self._notify_tasks.add(task)
+        task.add_done_callback(self._notify_tasks.discard)
+
+    def _pop(self) -> Optional[_Job]:
+        while self._heap:
+            priority, _, job = heapq.heappop(self._heap)
+            if self._queued.get(job.player_id) is job and job.priority == priority:
+                del self._queued[job.player_id]
+                return job
+        return None
+
+    def _update_backpressure(self) -> None:
+        depth = len(self._queued)
+        if not self._saturated and depth >= self._high:
+            self._saturated = True
+            self._capacity.clear()
+            if self._on_backpressure:
+                self._on_backpressure(True)
+        elif self._saturated and depth <= self._low:
+            self._saturated = False
+            self._capacity.set()
+            if self._on_backpressure:
+                self._on_backpressure(False)
+
+    async def _worker_loop(self) -> None:
+        while True:
+            async with self._wakeup:
+                await self._wakeup.wait_for(lambda: bool(self._queued))
+                job = self._pop()
+                if job is None:
+                    continue
+                self._running += 1
+                self._update_backpressure()
+
+            try:
+                result = await self._handler(job.player_id)
+            except Exception as e:
+                self.stats.failed += 1
+                get_tracer().warning(
+                    "scheduler.intervention_failed",
+                    "玩家 {player_id} 干预失败: {error}",
+                    player_id=job.player_id,
+                    error=str(e),
+                )
+                if not job.future.done():
+                    job.future.set_exception(e)
+                    # 失败已记录，未等待结果的提交方不会收到未取回异常的警告
+                    job.future.add_done_callback(lambda future: future.exception())
+            else:
+                self.stats.completed += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                async with self._wakeup:
+                    self._running -= 1
+                    self._wakeup.notify_all()
@@ -0,0 +1,285 @@
+"""
+多进程动作采集
+
+规则分析是 CPU 密集的纯 Python 代码，受 GIL 限制无法靠线程扩展。
+ParallelActionIngestion 把玩家按 ID 稳定分区到多个工作进程:
+- 每个分区是一个单进程执行器，独占自己的 BehaviorMonitorV2 和 RuleEngine
+- 同一玩家的动作总是进入同一进程并按提交顺序执行，序列和增量规则状态保持一致
+- 批量提交时每个分区只跨进程传递一次，摊薄序列化开销
+- 触发干预的结果回到主进程后转发给 GameMonitoringTeamV2
+
+使用示例:
+```python
+with ParallelActionIngestion(workers=4, team=team) as ingestion:
+    results = await ingestion.process_batch([
+        ("player_1", "lose_pvp", {}),
+        ("player_2", "login", {}),
+    ])
+```
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .action_service import (
+    ActionEvaluation,
+    ActionProcessingResult,
+    ActionProcessingService,
+    ActionResult,
+)
+from ...core.context import GameContext
+from ...monitoring.behavior_monitor_v2 import BehaviorMonitorV2
+from ...monitoring.player_state import PlayerStateManager
+from ...monitoring.sharded_monitor import shard_index
+from ...rules import RuleEngine, RuleRegistry
+from ...rules.definitions import build_legacy_rules
+
+ActionInput = Tuple[str, str, Optional[Dict[str, Any]]]
+MonitorFactory = Callable[[], Any]
+
+
+def create_worker_monitor(
+    threshold: int = 3,
+    max_sequence_length: int = 50,
+    recent_actions_window: int = 3,
+) -> BehaviorMonitorV2:
+    """工作进程默认使用的监控器：BehaviorMonitorV2 + 旧版规则集"""
+    registry = RuleRegistry()
+    for rule in build_legacy_rules():
+        registry.register(rule)
+    return BehaviorMonitorV2(
+        engine=RuleEngine(registry, window_size=recent_actions_window),
+        threshold=threshold,
+        max_sequence_length=max_sequence_length,
+        recent_actions_window=recent_actions_window,
+    )
+
+
+# ---- 工作进程侧 ----
+
+_worker_monitor: Any = None
+_worker_service: Optional[ActionProcessingService] = None
+
+
+def _init_worker(monitor_factory: MonitorFactory) -> None:
+    global _worker_monitor, _worker_service
+    _worker_monitor = monitor_factory()
+    context = GameContext(
+        monitor=_worker_monitor,
+        player_state_manager=PlayerStateManager(),
+    )
+    _worker_service = ActionProcessingService(context)
+
+
+@dataclass
+class _WorkerOutcome:
+    """工作进程返回的单条结果，需要干预时附带规则命中和序列快照"""
+    evaluation: Optional[ActionEvaluation]
+    error: Optional[str] = None
+    sequence: Optional[List[Dict[str, Any]]] = None
+
+
+def _process_chunk(actions: Sequence[ActionInput]) -> List[_WorkerOutcome]:
+    service = _worker_service
+    outcomes = []
+    for player_id, action_name, params in actions:
+        try:
+            evaluation = service.evaluate(player_id, action_name, params)
+        except Exception as e:
+            outcomes.append(_WorkerOutcome(evaluation=None, error=str(e)))
+            continue
+
+        sequence = None
+        if evaluation.should_intervene:
+            sequence = [
+                dict(action)
+                for action in _worker_monitor.get_player_action_sequence(player_id)
+            ]
+        outcomes.append(_WorkerOutcome(evaluation=evaluation, sequence=sequence))
+    return outcomes
+
+
+def _reset_negative_count(player_id: str) -> None:
+    _worker_service.reset_negative_count(player_id)
+
+
+# ---- 主进程侧 ----
+
+class WorkerSnapshotMonitor:
+    """
+    工作进程状态的只读快照
+
+    提供 GameMonitoringTeamV2 构造 PlayerEvent 所需的监控器接口。
+    """
+
+    def __init__(
+        self,
+        player_id: str,
+        triggered: List[Dict[str, Any]],
+        sequence: List[Dict[str, Any]],
+        threshold: int,
+    ):
+        self._player_id = player_id
+        self._triggered = triggered
+        self._sequence = sequence
+        self.threshold = threshold
+
+    def get_triggered_scenarios(self, player_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        if player_id not in (None, self._player_id):
+            return []
+        return list(self._triggered)
+
+    def get_player_action_sequence(self, player_id: str) -> List[Dict[str, Any]]:
+        return list(self._sequence) if player_id == self._player_id else []
+
+
+class ParallelActionIngestion:
+    """按玩家ID分区的多进程动作采集服务"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        monitor_factory: Optional[MonitorFactory] = None,
+        team: Any = None,
+        chunk_size: int = 1_000,
+        mp_context: Any = None,
+    ):
+        """
+        Args:
+            workers: 工作进程数，默认使用 CPU 核数
+            monitor_factory: 工作进程内创建监控器的可序列化工厂（模块级函数或 partial）
+            team: 接收干预事件的团队（GameMonitoringTeamV2 或同接口对象）
+            chunk_size: 单次跨进程提交的最大动作数
+            mp_context: multiprocessing 上下文，默认使用平台默认启动方式
+        """
+        worker_count = workers or os.cpu_count() or 1
+        factory = monitor_factory or create_worker_monitor
+        self._team = team
+        self._chunk_size = chunk_size
+        self._partitions: Tuple[Executor, ...] = tuple(
+            ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(factory,),
+            )
+            for _ in range(worker_count)
+        )
+
+    @property
+    def worker_count(self) -> int:
+        return len(self._partitions)
+
+    def partition_of(self, player_id: str) -> int:
+        return shard_index(player_id, len(self._partitions))
+
+    async def process_action(
+        self,
+        player_id: str,
+        action_name: str,
+        action_params: Dict[str, Any] = None
+    ) -> ActionProcessingResult:
+        """与 ActionProcessingService.process_action 相同的单动作接口"""
+        results = await self.process_batch([(player_id, action_name, action_params)])
+        return results[0]
+
+    async def process_batch(self, actions: Iterable[ActionInput]) -> List[ActionProcessingResult]:
+        """
+        批量处理动作，返回顺序与输入一致
+
+        同一玩家的动作保持输入顺序；需要干预的结果会转发给团队，
+        团队返回值写入 intervention_payload。
+        """
+        actions = list(actions)
+        buckets: List[List[int]] = [[] for _ in self._partitions]
+        for index, (player_id, _, _) in enumerate(actions):
+            buckets[self.partition_of(player_id)].append(index)
+
+        loop = asyncio.get_running_loop()
+        pending = []
+        for partition, indexes in enumerate(buckets):
+            for start in range(0, len(indexes), self._chunk_size):
+                chunk_indexes = indexes[start:start + self._chunk_size]
+                future = self._partitions[partition].submit(
+                    _process_chunk, [actions[i] for i in chunk_indexes]
+                )
+                pending.append((chunk_indexes, asyncio.wrap_future(future, loop=loop)))
+
+        outcomes: List[Optional[_WorkerOutcome]] = [None] * len(actions)
+        chunk_results = await asyncio.gather(*(future for _, future in pending))
+        for (chunk_indexes, _), chunk in zip(pending, chunk_results):
+            for index, outcome in zip(chunk_indexes, chunk):
+                outcomes[index] = outcome
+
+        results = [self._to_result(actions[i], outcome) for i, outcome in enumerate(outcomes)]
+        await self._forward_interventions(results, outcomes)
+        return results
+
+    async def reset_negative_count(self, player_id: str) -> None:
+        """在玩家所属的工作进程内重置负面计数（干预后调用）"""
+        future = self._partitions[self.partition_of(player_id)].submit(
+            _reset_negative_count, player_id
+        )
+        await asyncio.wrap_future(future)
+
+    def close(self) -> None:
+        for executor in self._partitions:
+            executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'ParallelActionIngestion':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def _to_result(action: ActionInput, outcome: _WorkerOutcome) -> ActionProcessingResult:
+        if outcome.evaluation is not None:
+            return outcome.evaluation.to_result()
+
+        player_id, action_name, _ = action
+        return ActionProcessingResult(
+            result=ActionResult.ERROR,
+            player_id=player_id,
+            action_name=action_name,
+            message=f"错误: {outcome.error}",
+        )
+
+    async def _forward_interventions(
+        self,
+        results: List[ActionProcessingResult],
+        outcomes: List[_WorkerOutcome],
+    ) -> None:
+        if self._team is None:
+            return
+
+        targets = [
+            (result, outcome)
+            for result, outcome in zip(results, outcomes)
+            if result.should_intervene
+        ]
+        if not targets:
+            return
+
+        payloads = await asyncio.gather(
+            *(
+                self._team.trigger_analysis_and_intervention(
+                    result.player_id,
+                    WorkerSnapshotMonitor(
+                        result.player_id,
+                        outcome.evaluation.triggered,
+                        outcome.sequence or [],
+                        result.threshold,
+                    ),
+                )
+                for result, outcome in targets
+            ),
+            return_exceptions=True,
+        )
+        for (result, _), payload in zip(targets, payloads):
+            result.intervention_payload = payload
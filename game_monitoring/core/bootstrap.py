@@ -26,7 +26,7 @@ from ..infrastructure.repositories.memory_player_repository import (
     InMemoryPlayerRepository, InMemoryCommanderOrderRepository
 )
 from ..infrastructure.validation.output_validator import OutputValidator
-from ..agents.orchestrator import OrchestratorAgent
+from ..agents.orchestrator import OrchestratorAgent, WorkerCallPolicy
 from autogen_core import SingleThreadedAgentRuntime
 
 
@@ -87,6 +87,14 @@ DEFAULT_PLAYERS = {
 }
 
 
+def _worker_call_policy(config: SystemConfig) -> WorkerCallPolicy:
+    """按系统配置生成 Orchestrator 的默认 Worker 调用策略"""
+    return WorkerCallPolicy(
+        timeout=config.worker_timeout_seconds,
+        hedge_after=config.worker_hedge_after_seconds,
+    )
+
+
 def create_production_container(
     config: Optional[SystemConfig] = None,
     custom_model_client: Any = None
@@ -137,15 +145,26 @@ def create_production_container(
         lifetime=LifetimeScope.SINGLETON
     )
 
-    # BehaviorMonitor - 单例
+    # BehaviorMonitor - 单例（monitor_shards > 1 时使用分片加锁的线程安全版本）
     from ..monitoring.behavior_monitor import BehaviorMonitor
+    from ..monitoring.sharded_monitor import ShardedBehaviorMonitor
+
+    def create_behavior_monitor(c: DIContainer):
+        cfg = c.resolve(SystemConfig)
+        options = dict(
+            threshold=cfg.behavior_threshold,
+            max_sequence_length=cfg.max_sequence_length,
+            recent_actions_window=cfg.recent_actions_window,
+            max_history_length=cfg.max_history_length,
+            max_player_history_length=cfg.max_player_history_length
+        )
+        if cfg.monitor_shards > 1:
+            return ShardedBehaviorMonitor(shard_count=cfg.monitor_shards, **options)
+        return BehaviorMonitor(**options)
+
     container.register_factory(
         'BehaviorMonitorType',
-        lambda c: BehaviorMonitor(
-            threshold=c.resolve(SystemConfig).behavior_threshold,
-            max_sequence_length=c.resolve(SystemConfig).max_sequence_length,
-            recent_actions_window=c.resolve(SystemConfig).recent_actions_window
-        ),
+        create_behavior_monitor,
         lifetime=LifetimeScope.SINGLETON
     )
 
@@ -202,13 +221,27 @@ def create_production_container(
     )
 
     from ..team.team_manager import GameMonitoringTeamV2
+    from ..team.worker_hosting import WorkerDeployment
+
+    def create_team(c: DIContainer) -> GameMonitoringTeamV2:
+        """配置了 worker_processes 时，对应的 Worker 运行在独立进程中"""
+        system_config = c.resolve(SystemConfig)
+        deployment = (
+            WorkerDeployment(system_config.worker_processes)
+            if system_config.worker_processes
+            else None
+        )
+        return GameMonitoringTeamV2(
+            model_client=custom_model_client,
+            runtime=c.resolve(SingleThreadedAgentRuntime),
+            debounce_seconds=system_config.event_debounce_seconds,
+            worker_deployment=deployment,
+            default_worker_policy=_worker_call_policy(system_config),
+        )
 
     container.register_factory(
         GameMonitoringTeamV2,
-        lambda c: GameMonitoringTeamV2(
-            model_client=custom_model_client,
-            runtime=c.resolve(SingleThreadedAgentRuntime),
-        ),
+        create_team,
         lifetime=LifetimeScope.SINGLETON
     )
 
@@ -216,7 +249,8 @@ def create_production_container(
         'OrchestratorAgent',
         lambda c: OrchestratorAgent(
             model_client=custom_model_client,
-            worker_types=['emotion_worker', 'churn_worker', 'behavior_worker']
+            worker_types=['emotion_worker', 'churn_worker', 'behavior_worker'],
+            default_policy=_worker_call_policy(c.resolve(SystemConfig)),
         ),
         lifetime=LifetimeScope.SINGLETON
     )
@@ -33,6 +33,13 @@ class SystemConfig:
     behavior_threshold: int = 3
     max_sequence_length: int = 50
     recent_actions_window: int = 3
+    max_history_length: int = 100_000
+    max_player_history_length: int = 1_000
+    monitor_shards: int = 1
+    event_debounce_seconds: float = 0.0
+    worker_processes: Optional[Dict[str, int]] = None
+    worker_timeout_seconds: Optional[float] = None
+    worker_hedge_after_seconds: Optional[float] = None
     auto_reset_after_intervention: bool = True
     use_yaml_repository: bool = False
     players_config_path: str = "config/players.yaml"
@@ -213,10 +220,7 @@ class PlayerContext:
 
     def get_action_history(self, limit: int = None) -> List[Any]:
         """获取玩家动作历史"""
-        history = self._game.monitor.get_player_history(self._player_id)
-        if limit:
-            return history[-limit:]
-        return history
+        return self._game.monitor.get_player_history(self._player_id, limit=limit or None)
 
     def get_action_sequence(self) -> List[Dict[str, Any]]:
         """获取玩家动作序列"""
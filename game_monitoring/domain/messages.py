@@ -40,3 +40,26 @@ class WorkerResponse:
     intervention_actions: List[Dict[str, Any]]
     confidence: float
     metadata: Dict[str, Any]
+
+
+@dataclass
+class PlayerEventBatch:
+    """批量玩家事件：事件高峰时一次提交多个玩家"""
+    batch_id: str
+    events: List[PlayerEvent]
+
+
+@dataclass
+class InterventionTaskBatch:
+    """批量干预任务：每种Worker一个批次"""
+    batch_id: str
+    task_type: Literal["emotion", "churn", "behavior"]
+    tasks: List[InterventionTask]
+
+
+@dataclass
+class WorkerResponseBatch:
+    """批量Worker响应：与任务批次中的任务一一对应"""
+    batch_id: str
+    worker_type: str
+    responses: List[WorkerResponse]
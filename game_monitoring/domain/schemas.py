@@ -8,10 +8,12 @@ from typing import Any, Literal
 
 from pydantic import BaseModel, Field, field_validator
 
+EMOTION_ALLOWED_ACTIONS = frozenset({"send_email", "grant_reward", "assign_support"})
+
 
 def _validate_action_type(
     actions: list[dict[str, Any]],
-    allowed_actions: set[str] | None = None,
+    allowed_actions: frozenset[str] | None = None,
 ) -> list[dict[str, Any]]:
     """校验动作列表包含 action_type，并在需要时限制允许值。"""
     for action in actions:
@@ -36,8 +38,7 @@ class EmotionWorkerOutput(BaseModel):
     @field_validator("intervention_actions")
     @classmethod
     def validate_actions(cls, actions: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        allowed_actions = {"send_email", "grant_reward", "assign_support"}
-        return _validate_action_type(actions, allowed_actions)
+        return _validate_action_type(actions, EMOTION_ALLOWED_ACTIONS)
 
 
 class ChurnWorkerOutput(BaseModel):
@@ -0,0 +1,6 @@
+"""Cache infrastructure package."""
+
+from .persistent_cache import PersistentResultCache
+from .result_cache import CacheStats, ResultCache, fingerprint
+
+__all__ = ["CacheStats", "PersistentResultCache", "ResultCache", "fingerprint"]
@@ -0,0 +1,161 @@
+"""
+持久化结果缓存
+
+与 ResultCache 接口一致，条目保存在 SQLite 中，进程重启后仍然有效:
+- 值需可 JSON 序列化
+- TTL 按墙上时钟计算（跨进程有效）
+- 超过容量时按最近使用时间淘汰
+- path 为 ":memory:" 时不落盘，便于测试
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from .result_cache import CacheStats
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+class PersistentResultCache:
+    """
+    线程安全的 SQLite 结果缓存
+
+    使用示例:
+    ```python
+    cache = PersistentResultCache(".cache/orders.sqlite3", max_entries=5000, ttl_seconds=86400)
+    value = cache.get_or_compute(fingerprint(payload), lambda: expensive(payload))
+    ```
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 5_000,
+        ttl_seconds: Optional[float] = 24 * 3600.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: SQLite 文件路径，":memory:" 表示仅在内存中
+            max_entries: 最大条目数，0 表示不缓存
+            ttl_seconds: 条目存活时间（秒），None 表示不过期
+            clock: 时间源，测试时可替换
+        """
+        if max_entries < 0:
+            raise ValueError("max_entries must not be negative")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+        self.stats = CacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Any]:
+        """查询缓存，未命中或已过期返回 None"""
+        now = self._clock()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                value, expires_at = row
+                if expires_at >= now:
+                    self._db.execute(
+                        "UPDATE cache_entries SET last_used = ? WHERE key = ?", (now, key)
+                    )
+                    self._db.commit()
+                    self.stats.hits += 1
+                    return json.loads(value)
+                self._db.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._db.commit()
+                self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        """写入缓存，超过容量时淘汰最久未使用的条目"""
+        if not self.enabled:
+            return
+        now = self._clock()
+        expires_at = float("inf") if self._ttl is None else now + self._ttl
+        encoded = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, encoded, expires_at, now),
+            )
+            overflow = (
+                self._db.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+                - self._max_entries
+            )
+            if overflow > 0:
+                self._db.execute(
+                    "DELETE FROM cache_entries WHERE key IN ("
+                    "SELECT key FROM cache_entries ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self.stats.evictions += overflow
+            self._db.commit()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """命中时返回缓存值，否则计算并写入"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            self._db.commit()
+
+    def purge_expired(self) -> int:
+        """删除所有过期条目，返回删除数量"""
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM cache_entries WHERE expires_at < ?", (self._clock(),)
+            )
+            self._db.commit()
+            self.stats.expirations += cursor.rowcount
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """清空条目，统计保留"""
+        with self._lock:
+            self._db.execute("DELETE FROM cache_entries")
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,138 @@
+"""
+结果缓存
+
+按键缓存确定性计算的结果，同时支持容量上限（LRU 淘汰）和存活时间（TTL 过期），
+并统计命中、未命中、淘汰和过期次数。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+def fingerprint(payload: Any) -> str:
+    """
+    生成稳定指纹
+
+    payload 先序列化为键有序的 JSON，无法直接序列化的值使用 str()，
+    因此相同内容在不同进程、不同运行之间得到相同的指纹。
+    """
+    encoded = json.dumps(
+        payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """缓存统计"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率，未查询过时为 0"""
+        if self.lookups == 0:
+            return 0.0
+        return self.hits / self.lookups
+
+
+class ResultCache(Generic[V]):
+    """
+    线程安全的 LRU/TTL 结果缓存
+
+    使用示例:
+    ```python
+    cache = ResultCache(max_entries=1024, ttl_seconds=300)
+    value = cache.get_or_compute(key, lambda: expensive(key))
+    print(cache.stats.hit_rate)
+    ```
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_entries: 最大条目数，0 表示不缓存（每次都重新计算）
+            ttl_seconds: 条目存活时间（秒），None 表示不过期
+            clock: 时间源，测试时可替换
+        """
+        if max_entries < 0:
+            raise ValueError("max_entries must not be negative")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """查询缓存，未命中或已过期返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= self._clock():
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return value
+                del self._entries[key]
+                self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: V) -> None:
+        """写入缓存，超过容量时淘汰最久未使用的条目"""
+        if not self.enabled:
+            return
+        expires_at = float("inf") if self._ttl is None else self._clock() + self._ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], V]) -> V:
+        """命中时返回缓存值，否则计算并写入"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """清空条目，统计保留"""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,41 @@
+"""
+LLM 访问层
+
+所有模型调用共用的异步网关：连接池、并发与 token 限流、重试、请求合并。
+"""
+
+from .fake_server import FakeLLMServer
+from .gateway import (
+    ChatChoice,
+    ChatCompletion,
+    ChatMessage,
+    ChatUsage,
+    GatewayStats,
+    HTTPBackend,
+    LLMGateway,
+    LLMGatewayError,
+    ModelClientBackend,
+    configure_llm_gateway,
+    get_llm_gateway,
+    parse_retry_after,
+    to_autogen_messages,
+)
+from .rate_limit import TokenBucket
+
+__all__ = [
+    'ChatChoice',
+    'ChatCompletion',
+    'ChatMessage',
+    'ChatUsage',
+    'FakeLLMServer',
+    'GatewayStats',
+    'HTTPBackend',
+    'LLMGateway',
+    'LLMGatewayError',
+    'ModelClientBackend',
+    'TokenBucket',
+    'configure_llm_gateway',
+    'get_llm_gateway',
+    'parse_retry_after',
+    'to_autogen_messages',
+]
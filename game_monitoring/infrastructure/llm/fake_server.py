@@ -0,0 +1,153 @@
+"""
+本地假 LLM 服务
+
+OpenAI 兼容的 /v1/chat/completions 接口，供测试和离线演示使用:
+- HTTP/1.1 keep-alive，可验证连接复用
+- responder 根据请求体生成回复文本，默认回显最后一条用户消息
+- 可注入 429 失败（带 Retry-After）和固定延迟
+- 统计请求数、连接数和最大并发数
+
+使用示例:
+```python
+with FakeLLMServer(responder=lambda request: "ok") as server:
+    gateway = LLMGateway.from_url(server.base_url)
+```
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Union
+
+Responder = Callable[[Dict[str, Any]], str]
+
+
+def _echo(request: Dict[str, Any]) -> str:
+    messages = request.get("messages") or [{}]
+    return f"echo: {messages[-1].get('content', '')}"
+
+
+class FakeLLMServer:
+    """在后台线程运行的 OpenAI 兼容假服务"""
+
+    def __init__(
+        self,
+        responder: Responder = _echo,
+        delay: float = 0.0,
+        fail_first: int = 0,
+        retry_after: Union[float, str] = 0.0,
+    ):
+        """
+        Args:
+            responder: 根据请求体生成回复文本
+            delay: 每个请求的处理延迟（秒）
+            fail_first: 前 N 个请求返回 429
+            retry_after: 429 响应的 Retry-After 值（秒数或 HTTP 日期）
+        """
+        self.responder = responder
+        self.delay = delay
+        self.fail_first = fail_first
+        self.retry_after = retry_after
+        self.requests: List[Dict[str, Any]] = []
+        self.connections = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'FakeLLMServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'FakeLLMServer':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    # ---- 请求处理 ----
+
+    def _handle(self, body: Dict[str, Any]) -> tuple:
+        with self._lock:
+            index = len(self.requests)
+            self.requests.append(body)
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            if index < self.fail_first:
+                error = {"error": {"message": "rate limited", "type": "rate_limit_error"}}
+                return 429, {"Retry-After": str(self.retry_after)}, error
+
+            content = self.responder(body)
+            prompt_tokens = sum(len(m.get("content") or "") for m in body.get("messages", [])) // 4
+            return 200, {}, {
+                "id": f"chatcmpl-{index}",
+                "object": "chat.completion",
+                "model": body.get("model") or "fake-model",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(content) // 4,
+                    "total_tokens": prompt_tokens + len(content) // 4,
+                },
+            }
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if not self.path.endswith("/chat/completions"):
+                    status, headers, payload = 404, {}, {"error": {"message": "not found"}}
+                else:
+                    status, headers, payload = server._handle(body)
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
@@ -0,0 +1,587 @@
+"""
+LLM 网关
+
+所有模型调用（军令生成、输出自我修正、记忆压缩）共用的异步网关:
+- 连接池：HTTP 后端按事件循环共用一个 httpx.AsyncClient，复用 keep-alive 连接
+- 限流：并发上限 + 每分钟 token 令牌桶
+- 重试：429/5xx/连接错误按指数退避加抖动重试，遵守 Retry-After（秒数或 HTTP 日期）
+- 请求合并：同一事件循环中内容完全相同的并发请求只发送一次
+- 指标：每次调用（含重试与限流等待）的耗时、token 用量和滑动窗口错误率写入指标注册表
+
+create() 的参数和返回值与 OpenAI chat.completions 兼容
+（response.choices[0].message.content），可直接替代原先直接调用的 model_client。
+同步代码通过 complete_sync() 在网关自有的后台事件循环上执行，不再每次 asyncio.run。
+
+使用示例:
+```python
+gateway = LLMGateway.from_url("http://localhost:8000/v1", model="doubao", tokens_per_minute=60_000)
+configure_llm_gateway(gateway)
+
+text = await gateway.complete("生成军令", system_message="你是军事顾问")
+```
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Protocol, TypeVar
+
+import httpx
+
+from ..cache import fingerprint
+from ..monitoring.metrics import MetricsRegistry, get_metrics_registry
+from .rate_limit import TokenBucket
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+
+# ---- 响应结构（OpenAI 兼容） ----
+
+@dataclass
+class ChatMessage:
+    role: str
+    content: str
+
+
+@dataclass
+class ChatChoice:
+    index: int
+    message: ChatMessage
+    finish_reason: Optional[str] = None
+
+
+@dataclass
+class ChatUsage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+@dataclass
+class ChatCompletion:
+    """chat.completions 响应"""
+    id: str
+    model: str
+    choices: List[ChatChoice]
+    usage: ChatUsage = field(default_factory=ChatUsage)
+
+    @property
+    def content(self) -> str:
+        return self.choices[0].message.content if self.choices else ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ChatCompletion':
+        choices = [
+            ChatChoice(
+                index=choice.get("index", index),
+                message=ChatMessage(
+                    role=choice.get("message", {}).get("role", "assistant"),
+                    content=choice.get("message", {}).get("content") or "",
+                ),
+                finish_reason=choice.get("finish_reason"),
+            )
+            for index, choice in enumerate(data.get("choices", []))
+        ]
+        usage = data.get("usage") or {}
+        return cls(
+            id=data.get("id", ""),
+            model=data.get("model", ""),
+            choices=choices,
+            usage=ChatUsage(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)),
+        )
+
+
+class LLMGatewayError(Exception):
+    """模型调用失败"""
+
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        retryable: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+# ---- 后端 ----
+
+class LLMBackend(Protocol):
+    async def send(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """发送 chat.completions 请求体，返回响应 JSON"""
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class HTTPBackend:
+    """OpenAI 兼容 HTTP 接口，每个事件循环共用一个 httpx.AsyncClient 连接池"""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        max_connections: int = 10,
+        timeout: float = 60.0,
+    ):
+        self.base_url = base_url
+        self._api_key = api_key
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._timeout = timeout
+        # httpx 客户端绑定创建它的事件循环，网关后台循环和调用方循环各用一个
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(base_url=self.base_url, limits=self._limits, timeout=self._timeout)
+            self._clients[loop] = client
+        return client
+
+    async def send(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        headers = {"Content-Type": "application/json"}
+        if self._api_key:
+            headers["Authorization"] = f"Bearer {self._api_key}"
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        try:
+            response = await self._client().post("/chat/completions", content=body, headers=headers)
+        except httpx.TransportError as e:
+            # 连接、超时和协议解析错误（如状态行不完整）都可重试
+            raise LLMGatewayError(f"transport error: {e!r}", retryable=True) from e
+
+        if response.status_code != 200:
+            raise LLMGatewayError(
+                f"HTTP {response.status_code}: {response.text[:200]}",
+                status=response.status_code,
+                retryable=response.status_code in RETRYABLE_STATUSES,
+                retry_after=parse_retry_after(response.headers.get("retry-after")),
+            )
+        try:
+            return json.loads(response.content)
+        except ValueError as e:
+            raise LLMGatewayError(f"invalid response body: {e}", retryable=True) from e
+
+    async def close(self) -> None:
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After（秒数或 HTTP 日期，RFC 9110），返回需要等待的秒数
+
+    无法解析时返回 None，按正常退避重试。
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def to_autogen_messages(messages: List[Dict[str, str]]) -> List[Any]:
+    """OpenAI 格式的消息转换为 autogen LLMMessage"""
+    from autogen_core.models import AssistantMessage, SystemMessage, UserMessage
+
+    converted = []
+    for message in messages:
+        role, content = message.get("role"), message.get("content", "")
+        if role == "system":
+            converted.append(SystemMessage(content=content))
+        elif role == "assistant":
+            converted.append(AssistantMessage(content=content, source="assistant"))
+        else:
+            converted.append(UserMessage(content=content, source="user"))
+    return converted
+
+
+def _error_status(error: BaseException) -> Optional[int]:
+    """SDK 异常携带的 HTTP 状态码（openai.APIStatusError.status_code、aiohttp 的 status 等）"""
+    for source in (error, getattr(error, "response", None)):
+        for name in ("status_code", "status"):
+            status = getattr(source, name, None)
+            if isinstance(status, int):
+                return status
+    return None
+
+
+def _is_transport_error(error: BaseException) -> bool:
+    """没有状态码时，只有连接和超时错误可以重试（与 HTTPBackend 一致）"""
+    if isinstance(error, (OSError, asyncio.TimeoutError)):
+        return True
+    # openai.APIConnectionError / APITimeoutError、httpx.ConnectError / TimeoutException 等
+    return any(
+        marker in cls.__name__
+        for cls in type(error).__mro__
+        for marker in ("Connect", "Timeout")
+    )
+
+
+class ModelClientBackend:
+    """适配 autogen ChatCompletionClient，使现有 model_client 也经过网关限流和重试"""
+
+    def __init__(self, model_client: Any):
+        self.model_client = model_client
+
+    async def send(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        messages = to_autogen_messages(payload["messages"])
+        extra = {
+            key: payload[key]
+            for key in ("temperature", "top_p", "max_tokens")
+            if payload.get(key) is not None
+        }
+        try:
+            result = await self.model_client.create(messages, extra_create_args=extra)
+        except Exception as e:
+            status = _error_status(e)
+            raise LLMGatewayError(
+                f"model client error: {e}",
+                status=status,
+                retryable=status in RETRYABLE_STATUSES if status is not None else _is_transport_error(e),
+            ) from e
+
+        usage = getattr(result, "usage", None)
+        return {
+            "model": payload.get("model") or "",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": str(result.content)},
+                    "finish_reason": getattr(result, "finish_reason", None),
+                }
+            ],
+            "usage": {
+                "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+                "completion_tokens": getattr(usage, "completion_tokens", 0),
+            },
+        }
+
+    async def close(self) -> None:
+        pass
+
+
+# ---- 网关 ----
+
+@dataclass
+class GatewayStats:
+    """网关统计"""
+    requests: int = 0
+    coalesced: int = 0
+    retries: int = 0
+    failures: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    rate_limited_seconds: float = 0.0
+
+
+class _InFlight:
+    """网关自有的一次调用及等待它的调用方数量"""
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class _LoopState:
+    __slots__ = ('semaphore', 'in_flight')
+
+    def __init__(self, max_concurrency: int):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight: Dict[str, _InFlight] = {}
+
+
+class LLMGateway:
+    """共享的异步 LLM 网关"""
+
+    def __init__(
+        self,
+        backend: LLMBackend,
+        model: Optional[str] = None,
+        max_concurrency: int = 8,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        default_max_tokens: int = 1024,
+        jitter: Callable[[], float] = random.random,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        """
+        Args:
+            backend: 实际发送请求的后端
+            model: 默认模型名
+            max_concurrency: 每个事件循环的最大并发请求数
+            tokens_per_minute: 每分钟 token 上限，None 表示不限
+            max_retries: 可重试错误的最大重试次数
+            backoff_base: 退避基数（秒），第 n 次重试最多等待 base * 2**n
+            backoff_max: 单次退避上限（秒）
+            default_max_tokens: 估算 token 用量时未指定 max_tokens 的默认值
+            jitter: [0, 1) 随机数源，测试时可替换
+            metrics: 指标注册表，默认使用进程级共享注册表
+        """
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        self.backend = backend
+        self.model = model
+        self._max_concurrency = max_concurrency
+        self._bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._default_max_tokens = default_max_tokens
+        self._jitter = jitter
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sync_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_lock = threading.Lock()
+        self.stats = GatewayStats()
+
+        registry = metrics or get_metrics_registry()
+        self._call_latency = registry.histogram(
+            "llm_call_seconds", "LLM 调用耗时（含限流等待和重试）", ("model", "outcome")
+        )
+        self._tokens = registry.counter("llm_tokens_total", "LLM token 用量", ("model", "kind"))
+        self._call_errors = registry.rolling_rate(
+            "llm_call_error_rate", "滑动窗口内 LLM 调用失败的比例", ("model",)
+        )
+
+    @classmethod
+    def from_url(
+        cls,
+        base_url: str,
+        api_key: Optional[str] = None,
+        max_connections: int = 10,
+        timeout: float = 60.0,
+        **kwargs: Any,
+    ) -> 'LLMGateway':
+        """连接 OpenAI 兼容服务"""
+        return cls(HTTPBackend(base_url, api_key, max_connections, timeout), **kwargs)
+
+    @classmethod
+    def from_model_client(cls, model_client: Any, **kwargs: Any) -> 'LLMGateway':
+        """包装已有的 autogen model_client"""
+        return cls(ModelClientBackend(model_client), **kwargs)
+
+    # ---- 异步接口 ----
+
+    async def create(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **extra: Any,
+    ) -> ChatCompletion:
+        """发送 chat.completions 请求，相同的并发请求共享一次调用"""
+        payload: Dict[str, Any] = {"model": model or self.model, "messages": messages}
+        for key, value in (("temperature", temperature), ("top_p", top_p), ("max_tokens", max_tokens)):
+            if value is not None:
+                payload[key] = value
+        payload.update(extra)
+
+        state = self._state()
+        key = fingerprint(payload)
+        call = state.in_flight.get(key)
+        if call is None:
+            task = asyncio.get_running_loop().create_task(self._call(payload, state))
+            call = _InFlight(task)
+            state.in_flight[key] = call
+            task.add_done_callback(lambda t: self._forget(state, key, call))
+        else:
+            self.stats.coalesced += 1
+
+        # 调用在网关自有的任务中执行：单个调用方取消不会影响合并进来的其他调用方，
+        # 最后一个调用方离开时才取消请求
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                self._forget(state, key, call)
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    async def complete(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        **kwargs: Any,
+    ) -> str:
+        """单轮对话，返回回复文本"""
+        messages = []
+        if system_message:
+            messages.append({"role": "system", "content": system_message})
+        messages.append({"role": "user", "content": prompt})
+        return (await self.create(messages, **kwargs)).content
+
+    async def aclose(self) -> None:
+        await self.backend.close()
+
+    # ---- 同步接口 ----
+
+    def run_sync(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """在网关的后台事件循环上执行协程并等待结果（同步代码使用）"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._background_loop()).result()
+
+    def complete_sync(self, prompt: str, system_message: Optional[str] = None, **kwargs: Any) -> str:
+        return self.run_sync(self.complete(prompt, system_message, **kwargs))
+
+    def close(self) -> None:
+        """关闭后台事件循环及其连接"""
+        with self._sync_lock:
+            loop, self._sync_loop = self._sync_loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._sync_lock:
+            if self._sync_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-gateway", daemon=True).start()
+                self._sync_loop = loop
+            return self._sync_loop
+
+    # ---- 内部 ----
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = _LoopState(self._max_concurrency)
+            self._states[loop] = state
+        return state
+
+    @staticmethod
+    def _forget(state: _LoopState, key: str, call: _InFlight) -> None:
+        if state.in_flight.get(key) is call:
+            del state.in_flight[key]
+        if call.task.done() and not call.task.cancelled():
+            # 所有调用方都已离开时不产生未取回异常的警告
+            call.task.exception()
+
+    async def _call(self, payload: Dict[str, Any], state: _LoopState) -> ChatCompletion:
+        model_label = str(payload["model"])
+        start = time.perf_counter()
+        try:
+            result = await self._send_with_retry(payload, state)
+        except Exception:
+            self._call_latency.observe(time.perf_counter() - start, model=model_label, outcome="failed")
+            self._call_errors.record(True, model=model_label)
+            raise
+        self._call_latency.observe(time.perf_counter() - start, model=model_label, outcome="ok")
+        self._call_errors.record(False, model=model_label)
+        return result
+
+    def _estimate_tokens(self, payload: Dict[str, Any]) -> int:
+        prompt_chars = sum(len(message.get("content") or "") for message in payload["messages"])
+        return prompt_chars // 4 + 1 + payload.get("max_tokens", self._default_max_tokens)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        delay = min(self._backoff_max, self._backoff_base * (2 ** attempt)) * self._jitter()
+        return max(delay, retry_after or 0.0)
+
+    async def _send_with_retry(self, payload: Dict[str, Any], state: _LoopState) -> ChatCompletion:
+        estimate = self._estimate_tokens(payload)
+        attempt = 0
+        while True:
+            if self._bucket is not None:
+                self.stats.rate_limited_seconds += await self._bucket.acquire(estimate)
+            async with state.semaphore:
+                self.stats.requests += 1
+                try:
+                    data = await self.backend.send(payload)
+                except LLMGatewayError as e:
+                    if not e.retryable or attempt >= self._max_retries:
+                        self.stats.failures += 1
+                        raise
+                    error = e
+                else:
+                    completion = ChatCompletion.from_dict(data)
+                    self._record_usage(completion, estimate, str(payload["model"]))
+                    return completion
+
+            # 失败的请求按估算值计入，退避期间不占用并发名额
+            attempt += 1
+            self.stats.retries += 1
+            await asyncio.sleep(self._backoff(attempt - 1, error.retry_after))
+
+    def _record_usage(self, completion: ChatCompletion, estimate: int, model_label: str) -> None:
+        usage = completion.usage
+        self.stats.prompt_tokens += usage.prompt_tokens
+        self.stats.completion_tokens += usage.completion_tokens
+        self._tokens.inc(usage.prompt_tokens, model=model_label, kind="prompt")
+        self._tokens.inc(usage.completion_tokens, model=model_label, kind="completion")
+        if self._bucket is not None and usage.total_tokens:
+            self._bucket.debit(usage.total_tokens - estimate)
+
+
+# ---- 进程级共享网关 ----
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def configure_llm_gateway(gateway: Optional[LLMGateway]) -> None:
+    """设置进程级共享网关（None 表示清除）"""
+    global _gateway
+    with _gateway_lock:
+        _gateway = gateway
+
+
+def get_llm_gateway() -> Optional[LLMGateway]:
+    """
+    获取进程级共享网关
+
+    未显式配置时，如果设置了 LLM_BASE_URL 环境变量，
+    按 LLM_BASE_URL / LLM_API_KEY / LLM_MODEL 创建一个。
+    """
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None and os.environ.get("LLM_BASE_URL"):
+            _gateway = LLMGateway.from_url(
+                os.environ["LLM_BASE_URL"],
+                api_key=os.environ.get("LLM_API_KEY"),
+                model=os.environ.get("LLM_MODEL"),
+            )
+        return _gateway
@@ -0,0 +1,74 @@
+"""
+令牌桶限流
+
+按每分钟 token 数限速，桶容量即允许的突发量。
+余额允许为负：请求完成后按实际用量补扣，后续请求相应等待更久。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """线程安全的异步令牌桶"""
+
+    def __init__(
+        self,
+        tokens_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            tokens_per_minute: 每分钟补充的 token 数
+            capacity: 桶容量，默认等于一分钟的补充量
+            clock: 时间源，测试时可替换
+        """
+        if tokens_per_minute <= 0:
+            raise ValueError("tokens_per_minute must be positive")
+        self._rate = tokens_per_minute / 60.0
+        self._capacity = capacity if capacity is not None else float(tokens_per_minute)
+        self._clock = clock
+        self._tokens = self._capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    async def acquire(self, tokens: float) -> float:
+        """
+        扣除 tokens，余额不足时等待补充
+
+        超过桶容量的请求按容量计算等待时间，避免永远无法满足。
+        返回实际等待的秒数。
+        """
+        needed = min(tokens, self._capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= needed:
+                    self._tokens -= tokens
+                    return waited
+                delay = (needed - self._tokens) / self._rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def debit(self, tokens: float) -> None:
+        """按实际用量补扣（可以为负数表示退还）"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens - tokens, self._capacity)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
@@ -2,14 +2,26 @@
 Redis记忆服务
 
 提供分层 Contextual Memory 的短期与长期记忆能力。
+
+默认使用 redis.asyncio 客户端，不阻塞事件循环；每次写入的多条命令放在一个事务管道
+（MULTI/EXEC）中一次往返完成，批量读写多个会话同样只用一个管道。
+注入的同步客户端（如 redis.Redis）的管道在线程中执行；没有 pipeline 的简单客户端逐条调用。
 """
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 import json
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Iterable
+
+from ..llm import get_llm_gateway
+
+SHORT_TERM_TTL = 7 * 24 * 3600
+LONG_TERM_TTL = 30 * 24 * 3600
 
 
 @dataclass
@@ -34,6 +46,20 @@ class LongTermMemory:
     compression_ratio: float
 
 
+class _CommandQueue:
+    """为没有 pipeline 的客户端记录命令，按管道的调用方式排队。"""
+
+    def __init__(self) -> None:
+        self.commands: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Callable[..., "_CommandQueue"]:
+        def queue(*args: Any, **kwargs: Any) -> "_CommandQueue":
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+
 class MemoryService:
     """Redis 记忆服务。"""
 
@@ -51,12 +77,12 @@ class MemoryService:
     def client(self) -> Any:
         if self._client is None:
             try:
-                import redis
+                import redis.asyncio as aioredis
             except ModuleNotFoundError as exc:
                 raise ModuleNotFoundError(
                     "redis package is required when no memory client is injected"
                 ) from exc
-            self._client = redis.from_url(self.redis_url)
+            self._client = aioredis.from_url(self.redis_url)
         return self._client
 
     async def append_short_term(
@@ -64,14 +90,22 @@ class MemoryService:
         session_id: str,
         memory: ShortTermMemory,
     ) -> None:
-        """追加短期记忆。"""
-        key = f"memory:session:{session_id}:short"
-        serialized = self._serialize_short_term(memory)
-        score = memory.timestamp.isoformat()
+        """追加短期记忆（写入、裁剪窗口、续期在一个事务中完成）。"""
+        await self._run(lambda pipe: self._queue_append(pipe, session_id, [memory]))
+
+    async def append_many(self, memories: Iterable[ShortTermMemory]) -> None:
+        """批量追加多个会话的短期记忆，按 memory.session_id 分组，一次往返完成。"""
+        by_session: dict[str, list[ShortTermMemory]] = defaultdict(list)
+        for memory in memories:
+            by_session[memory.session_id].append(memory)
+        if not by_session:
+            return
+
+        def queue(pipe: Any) -> None:
+            for session_id, session_memories in by_session.items():
+                self._queue_append(pipe, session_id, session_memories)
 
-        self.client.zadd(key, {serialized: score})
-        self.client.zremrangebyrank(key, 0, -self.short_term_window - 1)
-        self.client.expire(key, 7 * 24 * 3600)
+        await self._run(queue)
 
     async def get_short_term(
         self,
@@ -79,10 +113,28 @@ class MemoryService:
         limit: int | None = None,
     ) -> list[ShortTermMemory]:
         """获取短期记忆。"""
-        key = f"memory:session:{session_id}:short"
+        return (await self.get_short_term_many([session_id], limit))[session_id]
+
+    async def get_short_term_many(
+        self,
+        session_ids: Iterable[str],
+        limit: int | None = None,
+    ) -> dict[str, list[ShortTermMemory]]:
+        """批量获取多个会话的短期记忆，一次往返完成。"""
+        session_ids = list(dict.fromkeys(session_ids))
+        if not session_ids:
+            return {}
         limit = limit or self.short_term_window
-        memories_data = self.client.zrange(key, -limit, -1)
-        return [self._deserialize_short_term(data) for data in memories_data]
+
+        def queue(pipe: Any) -> None:
+            for session_id in session_ids:
+                pipe.zrange(self._short_term_key(session_id), -limit, -1)
+
+        results = await self._run(queue, transaction=False)
+        return {
+            session_id: [self._deserialize_short_term(data) for data in memories_data or []]
+            for session_id, memories_data in zip(session_ids, results)
+        }
 
     async def update_long_term(
         self,
@@ -99,19 +151,27 @@ class MemoryService:
             last_updated=datetime.now(),
             compression_ratio=self._calculate_compression_ratio(summary, key_events),
         )
-        self.client.set(key, self._serialize_long_term(memory))
-        self.client.expire(key, 30 * 24 * 3600)
+        serialized = self._serialize_long_term(memory)
+
+        def queue(pipe: Any) -> None:
+            pipe.set(key, serialized)
+            pipe.expire(key, LONG_TERM_TTL)
+
+        await self._run(queue)
 
     async def get_long_term(self, session_id: str) -> LongTermMemory | None:
         """获取长期记忆。"""
         key = f"memory:session:{session_id}:long:summary"
-        data = self.client.get(key)
+        data = (await self._run(lambda pipe: pipe.get(key), transaction=False))[0]
         if data is None:
             return None
         return self._deserialize_long_term(data)
 
-    async def compress_history(self, session_id: str, llm_client: Any) -> None:
-        """递归摘要压缩。"""
+    async def compress_history(self, session_id: str, llm_client: Any | None = None) -> None:
+        """递归摘要压缩；未传入 llm_client 时使用共享 LLM 网关。"""
+        llm_client = llm_client if llm_client is not None else get_llm_gateway()
+        if llm_client is None:
+            raise RuntimeError("no LLM client is configured for memory compression")
         short_memories = await self.get_short_term(session_id)
         long_memory = await self.get_long_term(session_id)
         compression_prompt = self._build_compression_prompt(short_memories, long_memory)
@@ -125,6 +185,52 @@ class MemoryService:
 
         await self.update_long_term(session_id, new_summary, key_events)
 
+    def _queue_append(
+        self,
+        pipe: Any,
+        session_id: str,
+        memories: list[ShortTermMemory],
+    ) -> None:
+        key = self._short_term_key(session_id)
+        # 分数用时间戳数值，Redis 有序集合只接受浮点分数
+        pipe.zadd(
+            key,
+            {self._serialize_short_term(memory): memory.timestamp.timestamp() for memory in memories},
+        )
+        pipe.zremrangebyrank(key, 0, -self.short_term_window - 1)
+        pipe.expire(key, SHORT_TERM_TTL)
+
+    async def _run(self, queue: Callable[[Any], None], transaction: bool = True) -> list[Any]:
+        """把 queue 排入的命令放在一个管道中执行，返回各命令结果。"""
+        client = self.client
+        if not hasattr(client, "pipeline"):
+            commands = _CommandQueue()
+            queue(commands)
+            return [
+                await self._call(getattr(client, name), *args, **kwargs)
+                for name, args, kwargs in commands.commands
+            ]
+
+        pipe = client.pipeline(transaction=transaction)
+        queue(pipe)
+        if inspect.iscoroutinefunction(pipe.execute):
+            return await pipe.execute()
+        # 同步客户端的网络往返放到线程中，不阻塞事件循环
+        return await asyncio.to_thread(pipe.execute)
+
+    @staticmethod
+    async def _call(method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if inspect.iscoroutinefunction(method):
+            return await method(*args, **kwargs)
+        result = method(*args, **kwargs)
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    @staticmethod
+    def _short_term_key(session_id: str) -> str:
+        return f"memory:session:{session_id}:short"
+
     def _build_compression_prompt(
         self,
         short_memories: list[ShortTermMemory],
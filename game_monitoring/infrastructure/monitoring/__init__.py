@@ -1,5 +1,38 @@
 """Monitoring infrastructure package."""
 
-from .output_metrics import OutputMetrics
+from .metrics import (
+    Counter,
+    Histogram,
+    HistogramSnapshot,
+    MetricsRegistry,
+    RollingRate,
+    get_metrics_registry,
+    serve_metrics,
+)
+from .output_metrics import OutputMetrics, get_output_metrics
+from .tracer import (
+    TraceEvent,
+    TraceLevel,
+    Tracer,
+    console_subscriber,
+    get_tracer,
+    subscribe_console,
+)
 
-__all__ = ["OutputMetrics"]
+__all__ = [
+    "Counter",
+    "Histogram",
+    "HistogramSnapshot",
+    "MetricsRegistry",
+    "OutputMetrics",
+    "RollingRate",
+    "TraceEvent",
+    "TraceLevel",
+    "Tracer",
+    "console_subscriber",
+    "get_metrics_registry",
+    "get_output_metrics",
+    "get_tracer",
+    "serve_metrics",
+    "subscribe_console",
+]
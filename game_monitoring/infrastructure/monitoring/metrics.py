@@ -0,0 +1,361 @@
+"""
+固定内存的运行指标
+
+为编排器-Worker 流水线提供延迟和错误率观测:
+- Counter：按标签累加的计数器
+- Histogram：固定分桶的延迟直方图，每组标签只保存桶计数、总和与次数，内存不随观测次数增长
+- RollingRate：滑动时间窗口内的错误率，窗口切分为固定数量的时间片循环复用
+- MetricsRegistry：按名称注册指标，render() 输出 Prometheus 文本格式，
+  serve_metrics() 在本地开一个 /metrics 端点供抓取
+
+标签组合由调用方控制（Schema 名、Worker 类型、模型名等有限集合），
+不要把玩家 ID 之类的高基数值作为标签。
+
+使用示例:
+```python
+registry = get_metrics_registry()
+latency = registry.histogram("worker_call_seconds", "Worker 调用耗时", ("worker_type",))
+
+with latency.time(worker_type="emotion_worker"):
+    await call_worker()
+
+print(registry.render())
+```
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+Clock = Callable[[], float]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if len(labels) != len(self.labelnames) or any(name not in labels for name in self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> Iterator[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """按标签累加的计数器"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("counter can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name, self._labels(key), value
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    """直方图某组标签的快照，counts 为各桶（含 +Inf）的非累计计数"""
+    buckets: Tuple[float, ...]
+    counts: Tuple[int, ...]
+    count: int
+    sum: float
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """按桶内线性插值估算分位数，落在 +Inf 桶时返回最大有限边界"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for upper, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return self.buckets[-1] if self.buckets else 0.0
+
+
+class Histogram(_Metric):
+    """固定分桶直方图"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        clock: Clock = time.perf_counter,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if bound != math.inf))
+        self._clock = clock
+        # 每组标签：[各桶计数..., +Inf 桶计数], 总和
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """记录代码块耗时（秒），异常时同样记录"""
+        self._key(labels)
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.observe(self._clock() - start, **labels)
+
+    def snapshot(self, **labels: Any) -> HistogramSnapshot:
+        key = self._key(labels)
+        with self._lock:
+            counts = tuple(self._counts.get(key) or [0] * (len(self.buckets) + 1))
+            total = self._sums.get(key, 0.0)
+        return HistogramSnapshot(self.buckets, counts, sum(counts), total)
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            items = sorted((key, list(counts), self._sums[key]) for key, counts in self._counts.items())
+        for key, counts, total in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class RollingRate(_Metric):
+    """
+    滑动窗口错误率
+
+    窗口切分为 slots 个时间片，每组标签保存 slots 个 (总数, 错误数)，
+    过期的时间片在下次写入或读取时清零复用。导出为 gauge。
+    """
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        window_seconds: float = 300.0,
+        slots: int = 30,
+        clock: Clock = time.monotonic,
+    ):
+        super().__init__(name, documentation, labelnames)
+        if window_seconds <= 0 or slots <= 0:
+            raise ValueError("window_seconds and slots must be positive")
+        self.window_seconds = window_seconds
+        self._slots = slots
+        self._slot_seconds = window_seconds / slots
+        self._clock = clock
+        # 每组标签：各时间片的 [时间片序号, 总数, 错误数]
+        self._rings: Dict[LabelValues, List[List[int]]] = {}
+
+    def record(self, error: bool, **labels: Any) -> None:
+        key = self._key(labels)
+        tick = self._tick()
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None:
+                ring = self._rings[key] = [[-1, 0, 0] for _ in range(self._slots)]
+            slot = ring[tick % self._slots]
+            if slot[0] != tick:
+                slot[:] = [tick, 0, 0]
+            slot[1] += 1
+            if error:
+                slot[2] += 1
+
+    def totals(self, **labels: Any) -> Tuple[int, int]:
+        """窗口内的 (总数, 错误数)；不传标签时汇总所有标签"""
+        keys = [self._key(labels)] if labels or not self.labelnames else None
+        oldest = self._tick() - self._slots + 1
+        total = errors = 0
+        with self._lock:
+            rings = [self._rings.get(key) for key in keys] if keys is not None else list(self._rings.values())
+            for ring in rings:
+                for tick, count, error_count in ring or ():
+                    if tick >= oldest:
+                        total += count
+                        errors += error_count
+        return total, errors
+
+    def rate(self, **labels: Any) -> float:
+        total, errors = self.totals(**labels)
+        return errors / total if total else 0.0
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            keys = sorted(self._rings)
+        for key in keys:
+            yield self.name, self._labels(key), self.rate(**self._labels(key))
+
+    def _tick(self) -> int:
+        return int(self._clock() // self._slot_seconds)
+
+
+class MetricsRegistry:
+    """指标注册表，同名指标重复注册时返回已有实例"""
+
+    def __init__(self, clock: Clock = time.monotonic):
+        self._clock = clock
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def rolling_rate(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        window_seconds: float = 300.0,
+        slots: int = 30,
+    ) -> RollingRate:
+        return self._register(
+            RollingRate, name, documentation, labelnames,
+            window_seconds=window_seconds, slots=slots, clock=self._clock,
+        )
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus 文本格式（text/plain; version=0.0.4）"""
+        lines: List[str] = []
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for sample_name, labels, value in metric.samples():
+                if labels:
+                    label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+                    lines.append(f"{sample_name}{{{label_text}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{sample_name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, cls: type, name: str, documentation: str, labelnames: Sequence[str], **kwargs: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"metric {name!r} already registered with a different type or labels")
+            return metric
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """获取进程级共享指标注册表。"""
+    return _registry
+
+
+def serve_metrics(
+    registry: Optional[MetricsRegistry] = None,
+    host: str = "127.0.0.1",
+    port: int = 9464,
+) -> ThreadingHTTPServer:
+    """
+    在后台线程提供 GET /metrics，返回已启动的服务器（调用 shutdown() 停止）
+
+    port 传 0 时由系统分配端口，实际端口见 server.server_address。
+    """
+    registry = registry or get_metrics_registry()
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -1,24 +1,74 @@
 """
 输出质量监控
 
-记录验证成功率、重试次数等指标。
+记录验证成功率、重试次数和验证耗时。
+累计值用计数器保存，重试明细只保留最近 recent_size 次，内存不随运行时间增长；
+按 Schema 分组的计数、耗时直方图和滑动窗口错误率写入指标注册表，可通过 render() 导出。
 """
 
+from __future__ import annotations
+
+from collections import deque
+from typing import Optional
+
+from .metrics import MetricsRegistry, get_metrics_registry
+
+RETRY_BUCKETS = (0, 1, 2, 3, 5)
+
 
 class OutputMetrics:
     """输出质量监控。"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        registry: Optional[MetricsRegistry] = None,
+        recent_size: int = 1000,
+        window_seconds: float = 300.0,
+    ) -> None:
         self.total_outputs = 0
         self.validation_errors = 0
-        self.retry_counts: list[int] = []
+        self.total_retries = 0
+        self._recent_retries: deque[int] = deque(maxlen=recent_size)
 
-    def record_validation(self, success: bool, retries: int) -> None:
+        self.registry = registry or get_metrics_registry()
+        self.validations = self.registry.counter(
+            "output_validations_total", "输出验证次数", ("schema", "outcome")
+        )
+        self.retries = self.registry.histogram(
+            "output_validation_retries", "单次验证的 LLM 重试次数", ("schema",), buckets=RETRY_BUCKETS
+        )
+        self.latency = self.registry.histogram(
+            "output_validation_seconds", "单次验证耗时（含修正）", ("schema",)
+        )
+        self.error_window = self.registry.rolling_rate(
+            "output_validation_error_rate", "滑动窗口内的验证错误率", ("schema",), window_seconds=window_seconds
+        )
+
+    @property
+    def retry_counts(self) -> list[int]:
+        """最近 recent_size 次验证的重试次数。"""
+        return list(self._recent_retries)
+
+    def record_validation(
+        self,
+        success: bool,
+        retries: int,
+        schema: str = "unknown",
+        latency: Optional[float] = None,
+    ) -> None:
         """记录一次验证结果。"""
         self.total_outputs += 1
+        self.total_retries += retries
         if not success:
             self.validation_errors += 1
-        self.retry_counts.append(retries)
+        self._recent_retries.append(retries)
+
+        outcome = "failed" if not success else ("ok" if retries == 0 else "retried")
+        self.validations.inc(schema=schema, outcome=outcome)
+        self.retries.observe(retries, schema=schema)
+        self.error_window.record(not success, schema=schema)
+        if latency is not None:
+            self.latency.observe(latency, schema=schema)
 
     def get_error_rate(self) -> float:
         """返回验证错误率。"""
@@ -26,8 +76,29 @@ class OutputMetrics:
             return 0.0
         return self.validation_errors / self.total_outputs
 
+    def get_recent_error_rate(self, schema: Optional[str] = None) -> float:
+        """返回滑动窗口内的错误率，不指定 schema 时汇总所有 Schema（含其他实例的记录）。"""
+        if schema is None:
+            return self.error_window.rate()
+        return self.error_window.rate(schema=schema)
+
     def get_avg_retries(self) -> float:
         """返回平均重试次数。"""
-        if not self.retry_counts:
+        if self.total_outputs == 0:
             return 0.0
-        return sum(self.retry_counts) / len(self.retry_counts)
+        return self.total_retries / self.total_outputs
+
+    def render(self) -> str:
+        """以 Prometheus 文本格式导出注册表中的全部指标。"""
+        return self.registry.render()
+
+
+_output_metrics: Optional[OutputMetrics] = None
+
+
+def get_output_metrics() -> OutputMetrics:
+    """获取进程级共享的输出质量监控。"""
+    global _output_metrics
+    if _output_metrics is None:
+        _output_metrics = OutputMetrics()
+    return _output_metrics
@@ -0,0 +1,171 @@
+"""
+结构化分级追踪
+
+替代热路径中的 print 调试输出:
+- 事件带名称、级别和结构化字段，模板只在订阅者渲染时才格式化
+- 没有订阅者或级别不足时，emit 只做一次整数比较即返回
+- 支持按事件名采样，降低高频事件的开销
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import IntEnum
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class TraceLevel(IntEnum):
+    """追踪级别，数值与标准 logging 级别一致。"""
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+    OFF = 100
+
+
+@dataclass(frozen=True)
+class TraceEvent:
+    """一条追踪事件"""
+    name: str
+    level: TraceLevel
+    message: str = ""
+    fields: Dict[str, Any] = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    def render(self) -> str:
+        """渲染为单行文本，模板渲染失败时回退为 key=value 形式。"""
+        if self.message:
+            try:
+                return self.message.format(**self.fields)
+            except (KeyError, IndexError, ValueError):
+                pass
+        details = " ".join(f"{key}={value!r}" for key, value in self.fields.items())
+        return f"{self.name} {details}".strip()
+
+
+TraceSubscriber = Callable[[TraceEvent], None]
+
+
+class Tracer:
+    """
+    分级追踪器
+
+    使用示例:
+    ```python
+    tracer = get_tracer()
+    unsubscribe = tracer.subscribe(lambda event: print(event.render()), TraceLevel.INFO)
+
+    tracer.info("tool.emotion.start", "正在分析玩家 {player_id}", player_id="p1")
+
+    # 构造字段本身较贵时，先判断是否启用
+    if tracer.enabled(TraceLevel.DEBUG):
+        tracer.debug("monitor.sequence", actions=[a["action"] for a in sequence])
+    ```
+    """
+
+    def __init__(self, random_source: Callable[[], float] = random.random):
+        self._subscribers: Tuple[Tuple[TraceSubscriber, TraceLevel], ...] = ()
+        self._min_level = TraceLevel.OFF
+        self._sample_rates: Dict[str, float] = {}
+        self._random = random_source
+        self._lock = threading.Lock()
+
+    def enabled(self, level: TraceLevel) -> bool:
+        """是否有订阅者会接收该级别的事件。"""
+        return level >= self._min_level
+
+    def subscribe(
+        self,
+        subscriber: TraceSubscriber,
+        level: TraceLevel = TraceLevel.INFO,
+    ) -> Callable[[], None]:
+        """注册订阅者，返回取消订阅的函数。"""
+        with self._lock:
+            self._subscribers = self._subscribers + ((subscriber, level),)
+            self._refresh_min_level()
+
+        return lambda: self.unsubscribe(subscriber)
+
+    def unsubscribe(self, subscriber: TraceSubscriber) -> None:
+        with self._lock:
+            self._subscribers = tuple(
+                item for item in self._subscribers if item[0] != subscriber
+            )
+            self._refresh_min_level()
+
+    def set_sample_rate(self, name: str, rate: Optional[float]) -> None:
+        """为指定事件名设置采样率（0~1），传 None 取消采样。"""
+        with self._lock:
+            if rate is None:
+                self._sample_rates.pop(name, None)
+            else:
+                self._sample_rates[name] = min(max(rate, 0.0), 1.0)
+
+    def emit(self, level: TraceLevel, name: str, message: str = "", **fields: Any) -> None:
+        if level < self._min_level:
+            return
+
+        rate = self._sample_rates.get(name)
+        if rate is not None and self._random() >= rate:
+            return
+
+        event = TraceEvent(name=name, level=level, message=message, fields=fields)
+        for subscriber, subscriber_level in self._subscribers:
+            if level >= subscriber_level:
+                subscriber(event)
+
+    def debug(self, name: str, message: str = "", **fields: Any) -> None:
+        self.emit(TraceLevel.DEBUG, name, message, **fields)
+
+    def info(self, name: str, message: str = "", **fields: Any) -> None:
+        self.emit(TraceLevel.INFO, name, message, **fields)
+
+    def warning(self, name: str, message: str = "", **fields: Any) -> None:
+        self.emit(TraceLevel.WARNING, name, message, **fields)
+
+    def error(self, name: str, message: str = "", **fields: Any) -> None:
+        self.emit(TraceLevel.ERROR, name, message, **fields)
+
+    def _refresh_min_level(self) -> None:
+        self._min_level = min(
+            (level for _, level in self._subscribers),
+            default=TraceLevel.OFF,
+        )
+
+
+def console_subscriber(event: TraceEvent) -> None:
+    """把追踪事件输出到终端，供命令行模式订阅。"""
+    print(event.render())
+
+
+def subscribe_console(
+    level: Optional[TraceLevel] = None,
+    tracer: Optional[Tracer] = None,
+) -> Callable[[], None]:
+    """
+    命令行入口订阅终端输出，重复调用只保留一个订阅，返回取消订阅的函数。
+
+    level 未指定时读取 TRACE_LEVEL 环境变量（DEBUG/INFO/WARNING/ERROR/OFF），
+    默认 DEBUG，与改用追踪器之前命令行的终端输出一致。
+    """
+    if level is None:
+        level = TraceLevel.__members__.get(
+            os.environ.get("TRACE_LEVEL", "").strip().upper(), TraceLevel.DEBUG
+        )
+    tracer = tracer or get_tracer()
+    tracer.unsubscribe(console_subscriber)
+    if level >= TraceLevel.OFF:
+        return lambda: None
+    return tracer.subscribe(console_subscriber, level)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """获取进程级共享追踪器。"""
+    return _tracer
@@ -1,5 +1,18 @@
 """Validation infrastructure package."""
 
 from .output_validator import OutputValidationError, OutputValidator
+from .streaming import (
+    IncrementalObjectParser,
+    StreamAborted,
+    StreamingOutputValidator,
+    stream_from_model_client,
+)
 
-__all__ = ["OutputValidationError", "OutputValidator"]
+__all__ = [
+    "IncrementalObjectParser",
+    "OutputValidationError",
+    "OutputValidator",
+    "StreamAborted",
+    "StreamingOutputValidator",
+    "stream_from_model_client",
+]
@@ -0,0 +1,141 @@
+"""
+JSON 对象提取
+
+从 LLM 输出（可能夹杂思考过程、Markdown 代码块和花括号）中提取第一个 JSON 对象:
+- 先整体解析，成功即返回
+- 再尝试 ``` 代码块中的内容
+- 再单次扫描全文：跟踪字符串和转义，按括号配对记录每个完整的 {...} 区间，
+  按起始位置依次解析候选区间，而不是在每个 { 处从头解码
+  只有出现在 { [ , : 之后的引号才开始字符串，正文花括号中的孤立引号不会打乱后续扫描
+- 仍然找不到时（例如孤立引号恰好跟在冒号后），在扫描未覆盖的前若干个 {" 位置直接 raw_decode
+
+安装了 orjson 时优先用它解析，解析失败再交给标准库，结果与标准库一致。
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Iterator, List, Optional, Set, Tuple
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+_FENCE = re.compile(r"```[ \t]*[\w-]*[ \t]*\r?\n(.*?)```", re.DOTALL)
+# 合法对象的 { 之后只能是键（"）或空对象（}），其余区间无需尝试解析
+_OBJECT_START = re.compile(r'\{\s*["}]')
+# JSON 字符串只能出现在这些字符之后（忽略空白）
+_STRING_PRECEDERS = frozenset('{[,:')
+# 兜底解码最多尝试的起点数，避免对无对象的长文本退化为平方复杂度
+_MAX_FALLBACK_STARTS = 64
+
+
+def loads(text: str) -> Any:
+    """解析 JSON，优先使用 orjson"""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+def object_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    扫描出所有括号配对完整的 {...} 区间，按起始位置排序
+
+    只在括号内部、且紧跟 { [ , : 的引号处开始跟踪字符串，正文中的引号不会影响配对。
+    """
+    spans: List[Tuple[int, int]] = []
+    stack: List[int] = []
+    in_string = False
+    escaped = False
+    previous = ""
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                previous = char
+            continue
+        if char == "{":
+            stack.append(index)
+        elif char == "}":
+            if stack:
+                spans.append((stack.pop(), index + 1))
+        elif char == '"' and stack and previous in _STRING_PRECEDERS:
+            in_string = True
+        if not char.isspace():
+            previous = char
+    spans.sort()
+    return spans
+
+
+def _spans(text: str, tried: Optional[Set[int]] = None) -> Iterator[str]:
+    for start, end in object_spans(text):
+        if _OBJECT_START.match(text, start):
+            if tried is not None:
+                tried.add(start)
+            yield text[start:end]
+
+
+def _decode_untried(text: str, tried: Set[int]) -> Optional[dict]:
+    """在扫描未覆盖的对象起点处直接解码，不依赖括号配对"""
+    decoder = json.JSONDecoder()
+    attempts = 0
+    for match in _OBJECT_START.finditer(text):
+        if match.start() in tried:
+            continue
+        attempts += 1
+        if attempts > _MAX_FALLBACK_STARTS:
+            break
+        try:
+            parsed, _ = decoder.raw_decode(text, match.start())
+        except (json.JSONDecodeError, RecursionError):
+            continue
+        if isinstance(parsed, dict):
+            return parsed
+    return None
+
+
+def _candidates(text: str, tried: Set[int]) -> Iterator[str]:
+    if "```" in text:
+        blocks = _FENCE.findall(text)
+        for block in blocks:
+            yield block.strip()
+        for block in blocks:
+            yield from _spans(block)
+    yield from _spans(text, tried)
+
+
+def extract_json_object(text: str) -> Any:
+    """
+    提取第一个可解析的 JSON 对象
+
+    整体就是合法 JSON 时原样返回解析结果；否则返回第一个可解析为 dict 的候选区间。
+    找不到时抛出 json.JSONDecodeError。
+    """
+    try:
+        return loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    tried: Set[int] = set()
+    for candidate in _candidates(text, tried):
+        try:
+            parsed = loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(parsed, dict):
+            return parsed
+
+    parsed = _decode_untried(text, tried)
+    if parsed is not None:
+        return parsed
+
+    raise json.JSONDecodeError("No valid JSON object found", text, 0)
@@ -7,10 +7,16 @@
 from __future__ import annotations
 
 import json
+import time
 from typing import Any
 
 from pydantic import BaseModel, ValidationError
 
+from ..llm import get_llm_gateway
+from ..monitoring.output_metrics import OutputMetrics, get_output_metrics
+from .json_extract import extract_json_object
+from .repair import repair_json_text, repair_payload
+
 
 class OutputValidationError(Exception):
     """输出验证错误"""
@@ -23,48 +29,102 @@ class OutputValidationError(Exception):
 class OutputValidator:
     """统一的输出验证器"""
 
-    def __init__(self, schema: type[BaseModel], max_retries: int = 3) -> None:
+    def __init__(
+        self,
+        schema: type[BaseModel],
+        max_retries: int = 3,
+        local_repair: bool = True,
+        metrics: OutputMetrics | None = None,
+    ) -> None:
         self.schema = schema
         self.max_retries = max_retries
+        self.local_repair = local_repair
+        self.metrics = metrics or get_output_metrics()
+        self.local_repairs = 0
+        self.llm_corrections = 0
 
     async def validate_output(
         self,
         raw_output: str,
-        model_client: Any,
+        model_client: Any | None = None,
         temperature: float = 0.7,
     ) -> BaseModel:
-        """验证输出并在失败时尝试自我修正。"""
-        for attempt in range(self.max_retries):
-            try:
-                parsed = self._extract_json(raw_output)
-                return self.schema.model_validate(parsed)
-            except (json.JSONDecodeError, ValidationError, ValueError) as exc:
-                if attempt >= self.max_retries - 1:
-                    raise OutputValidationError(
-                        f"Failed to validate after {self.max_retries} attempts: {exc}",
-                        retry_count=self.max_retries,
-                    ) from exc
-
-                raw_output = await self._self_correction(
-                    invalid_output=raw_output,
-                    error_message=str(exc),
-                    model_client=model_client,
-                    temperature=max(0.0, temperature - 0.1 * attempt),
-                )
+        """
+        验证输出，失败时先本地修复，仍失败才请求 LLM 自我修正。
+
+        未传入 model_client 时使用共享 LLM 网关。
+        """
+        start = time.perf_counter()
+        retries = 0
+        try:
+            for attempt in range(self.max_retries):
+                try:
+                    parsed = self._extract_json(raw_output)
+                    result = self.schema.model_validate(parsed)
+                except (json.JSONDecodeError, ValidationError, ValueError) as exc:
+                    result = self._repair_locally(raw_output)
+                    if result is None:
+                        if attempt >= self.max_retries - 1:
+                            raise OutputValidationError(
+                                f"Failed to validate after {self.max_retries} attempts: {exc}",
+                                retry_count=self.max_retries,
+                            ) from exc
+
+                        retries += 1
+                        raw_output = await self._self_correction(
+                            invalid_output=raw_output,
+                            error_message=str(exc),
+                            model_client=model_client,
+                            temperature=max(0.0, temperature - 0.1 * attempt),
+                        )
+                        continue
+
+                self._record(True, retries, start)
+                return result
+        except Exception:
+            self._record(False, retries, start)
+            raise
 
         raise OutputValidationError(
             "Validation loop exited unexpectedly",
             retry_count=self.max_retries,
         )
 
+    def _record(self, success: bool, retries: int, start: float) -> None:
+        self.metrics.record_validation(
+            success,
+            retries,
+            schema=self.schema.__name__,
+            latency=time.perf_counter() - start,
+        )
+
+    def _repair_locally(self, raw_output: str) -> BaseModel | None:
+        """确定性本地修复，无法修复时返回 None。"""
+        if not self.local_repair:
+            return None
+        try:
+            parsed = self._extract_json(repair_json_text(raw_output))
+            result = self.schema.model_validate(repair_payload(self.schema, parsed))
+        except (json.JSONDecodeError, ValidationError, ValueError):
+            return None
+        self.local_repairs += 1
+        return result
+
     async def _self_correction(
         self,
         invalid_output: str,
         error_message: str,
-        model_client: Any,
+        model_client: Any | None,
         temperature: float,
     ) -> str:
         """请求模型客户端修正无效输出。"""
+        self.llm_corrections += 1
+        client = model_client if model_client is not None else get_llm_gateway()
+        if client is None:
+            raise OutputValidationError(
+                f"Output is invalid and no LLM client is available for correction: {error_message}"
+            )
+
         correction_prompt = f"""
 The previous output was invalid due to: {error_message}
 
@@ -80,7 +140,7 @@ Ensure:
 Corrected output:
 """
 
-        response = await model_client.create(
+        response = await client.create(
             messages=[{"role": "user", "content": correction_prompt}],
             temperature=temperature,
             top_p=0.9,
@@ -89,23 +149,5 @@ Corrected output:
         return response.choices[0].message.content
 
     def _extract_json(self, text: str) -> dict[str, Any]:
-        """从纯 JSON 或混合文本中提取第一个可解析的 JSON 对象。"""
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            pass
-
-        decoder = json.JSONDecoder()
-        for index, char in enumerate(text):
-            if char != "{":
-                continue
-
-            try:
-                parsed, _ = decoder.raw_decode(text[index:])
-            except json.JSONDecodeError:
-                continue
-
-            if isinstance(parsed, dict):
-                return parsed
-
-        raise json.JSONDecodeError("No valid JSON object found", text, 0)
+        """从纯 JSON、代码块或混合文本中提取第一个可解析的 JSON 对象（线性扫描）。"""
+        return extract_json_object(text)
@@ -0,0 +1,184 @@
+"""
+本地确定性修复
+
+大多数验证失败是格式小问题（尾逗号、单引号、数值写成字符串、置信度越界、理由过长），
+在请求 LLM 自我修正之前先在本地修复:
+- 文本层：去掉尾逗号、单引号字符串改为双引号、Python 的 True/False/None 改为 JSON 字面量
+- 字段层：按 Schema 把数值/布尔字符串转换为对应类型，把数值截断到 ge/le 范围，
+  把字符串截断到 max_length
+- 动作列表：字符串动作补成 {"action_type": ...}，丢弃缺少 action_type 或不在允许集合中的动作
+
+修复只做确定性的变换，无法修复时交给 LLM。
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from ...domain.schemas import (
+    EMOTION_ALLOWED_ACTIONS,
+    BehaviorWorkerOutput,
+    ChurnWorkerOutput,
+    EmotionWorkerOutput,
+)
+
+# Schema -> (动作列表字段, 允许的 action_type，None 表示不限)
+ACTION_FIELDS: Dict[type, Tuple[str, Optional[frozenset]]] = {
+    EmotionWorkerOutput: ("intervention_actions", EMOTION_ALLOWED_ACTIONS),
+    ChurnWorkerOutput: ("retention_plan", None),
+    BehaviorWorkerOutput: ("control_measures", None),
+}
+
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_TRUE_STRINGS = {"true", "yes", "y", "1", "是", "真"}
+_FALSE_STRINGS = {"false", "no", "n", "0", "否", "假"}
+
+
+def repair_json_text(text: str) -> str:
+    """
+    修复常见的 JSON 文本问题，只处理第一个 { 到最后一个 } 之间的内容
+
+    单次扫描，跟踪当前字符串的引号类型，字符串内部的内容不做改动。
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        return text
+    body = text[start:end + 1]
+
+    out = []
+    quote: Optional[str] = None
+    index, length = 0, len(body)
+    while index < length:
+        char = body[index]
+        if quote is not None:
+            if char == "\\" and index + 1 < length:
+                escaped = body[index + 1]
+                # 单引号字符串中的 \' 在双引号字符串中不需要转义
+                out.append("'" if quote == "'" and escaped == "'" else char + escaped)
+                index += 2
+                continue
+            if char == quote:
+                out.append('"')
+                quote = None
+            elif quote == "'" and char == '"':
+                out.append('\\"')
+            else:
+                out.append(char)
+            index += 1
+            continue
+
+        if char in "\"'":
+            quote = char
+            out.append('"')
+            index += 1
+        elif char == ",":
+            lookahead = index + 1
+            while lookahead < length and body[lookahead].isspace():
+                lookahead += 1
+            if lookahead >= length or body[lookahead] not in "}]":
+                out.append(char)
+            index += 1
+        elif char.isalpha():
+            word_end = index
+            while word_end < length and (body[word_end].isalnum() or body[word_end] == "_"):
+                word_end += 1
+            word = body[index:word_end]
+            out.append(_LITERALS.get(word, word))
+            index = word_end
+        else:
+            out.append(char)
+            index += 1
+
+    return text[:start] + "".join(out) + text[end + 1:]
+
+
+def _constraint(field: Any, name: str) -> Any:
+    for item in field.metadata:
+        value = getattr(item, name, None)
+        if value is not None:
+            return value
+    return None
+
+
+def _to_number(value: Any) -> Any:
+    if isinstance(value, str):
+        stripped = value.strip()
+        try:
+            if stripped.endswith("%"):
+                return float(stripped[:-1]) / 100
+            return float(stripped)
+        except ValueError:
+            return value
+    return value
+
+
+def _to_bool(value: Any) -> Any:
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+    return value
+
+
+def _repair_actions(actions: Any, allowed: Optional[frozenset]) -> Any:
+    if not isinstance(actions, list):
+        return actions
+    repaired = []
+    for action in actions:
+        if isinstance(action, str):
+            action = {"action_type": action}
+        if not isinstance(action, dict):
+            continue
+        action_type = action.get("action_type")
+        if not isinstance(action_type, str) or not action_type:
+            continue
+        if allowed is not None and action_type not in allowed:
+            continue
+        repaired.append(action)
+    return repaired
+
+
+def repair_payload(schema: type[BaseModel], payload: Any) -> Any:
+    """按 Schema 修复字段值，返回新的字典（非字典原样返回）"""
+    if not isinstance(payload, dict):
+        return payload
+    repaired = dict(payload)
+
+    for name, field in schema.model_fields.items():
+        if name not in repaired:
+            continue
+        value = repaired[name]
+        annotation = field.annotation
+
+        if annotation in (int, float):
+            number = _to_number(value)
+            # NaN/inf 不是格式小问题，保持原值让验证失败
+            if isinstance(number, (int, float)) and not isinstance(number, bool) and math.isfinite(number):
+                lower, upper = _constraint(field, "ge"), _constraint(field, "le")
+                if lower is not None:
+                    number = max(lower, number)
+                if upper is not None:
+                    number = min(upper, number)
+                value = int(number) if annotation is int else number
+        elif annotation is bool:
+            value = _to_bool(value)
+        elif annotation is str:
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                value = str(value)
+            max_length = _constraint(field, "max_length")
+            if isinstance(value, str) and max_length is not None:
+                value = value[:max_length]
+        repaired[name] = value
+
+    action_field = ACTION_FIELDS.get(schema)
+    if action_field is not None:
+        name, allowed = action_field
+        if name in repaired:
+            repaired[name] = _repair_actions(repaired[name], allowed)
+
+    return repaired
@@ -0,0 +1,301 @@
+"""
+流式增量验证
+
+OutputValidator 要等完整回复后才开始解析。StreamingOutputValidator 边接收边解析:
+- 顶层字段一完成就按 Schema 单独校验（先做本地修复），不合法立即中止本次生成
+- Literal 字段在字符串还没结束时就检查前缀，例如 emotion_type 写成 "开心" 时第一个字就中止
+- 顶层对象的右括号一到达就停止读取并返回结果，不等模型把剩余内容输出完
+- 中止后带着已生成的片段和错误原因重新提示，最多 max_retries 次
+
+流来源是 messages -> 文本块异步迭代器 的函数，stream_from_model_client
+把 autogen ChatCompletionClient.create_stream 适配为这种形式。
+
+使用示例:
+```python
+validator = StreamingOutputValidator(EmotionWorkerOutput)
+result = await validator.validate_stream(stream_from_model_client(model_client), messages)
+```
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Annotated, Any, AsyncIterator, Callable, Dict, List, Literal, Optional, Tuple, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from ..llm import to_autogen_messages
+from ..monitoring.output_metrics import OutputMetrics, get_output_metrics
+from .json_extract import extract_json_object
+from .output_validator import OutputValidationError
+from .repair import repair_json_text, repair_payload
+
+Messages = List[Dict[str, str]]
+StreamFactory = Callable[[Messages], AsyncIterator[Any]]
+
+
+class StreamAborted(ValueError):
+    """部分输出已不可能满足 Schema"""
+
+    def __init__(self, reason: str, partial: str) -> None:
+        self.partial = partial
+        super().__init__(reason)
+
+
+class IncrementalObjectParser:
+    """
+    逐块解析第一个顶层 JSON 对象
+
+    每个顶层成员（"key": value）在遇到同层的逗号或右括号时完成，
+    只对完成的成员单独解析，整体仍是一次线性扫描。
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._start: Optional[int] = None
+        self._member_start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._after_colon = False
+        self._key: Optional[str] = None
+        self._value_string_start: Optional[int] = None
+        self._end: Optional[int] = None
+        self.complete = False
+
+    @property
+    def text(self) -> str:
+        """已接收的对象文本（从第一个 { 开始，对象闭合后到右括号为止）"""
+        if self._start is None:
+            return ""
+        return self._text[self._start:self._end]
+
+    def partial_string_value(self) -> Optional[Tuple[str, str]]:
+        """当前正在输出的顶层字符串值 (键, 已输出部分)"""
+        if self._value_string_start is None or self._key is None:
+            return None
+        return self._key, self._text[self._value_string_start:]
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """追加文本块，返回本块中完成的顶层成员"""
+        if self.complete:
+            return []
+        offset = len(self._text)
+        self._text += chunk
+        text = self._text
+        completed: List[Tuple[str, Any]] = []
+
+        for position in range(offset, len(text)):
+            char = text[position]
+            if self._start is None:
+                if char == "{":
+                    self._start = position
+                    self._member_start = position + 1
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._value_string_start = None
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._after_colon:
+                    self._value_string_start = position + 1
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete_member(text, position, completed)
+                    self._end = position + 1
+                    self.complete = True
+                    break
+            elif self._depth == 1 and char == ":":
+                self._after_colon = True
+                try:
+                    self._key = json.loads(text[self._member_start:position].strip())
+                except json.JSONDecodeError:
+                    self._key = None
+            elif self._depth == 1 and char == ",":
+                self._complete_member(text, position, completed)
+                self._member_start = position + 1
+
+        return completed
+
+    def _complete_member(self, text: str, end: int, completed: List[Tuple[str, Any]]) -> None:
+        member = text[self._member_start:end].strip()
+        self._after_colon = False
+        self._key = None
+        if not member:
+            return
+        try:
+            parsed = json.loads("{" + member + "}")
+        except json.JSONDecodeError:
+            # 交给最终验证（可能需要本地修复）
+            return
+        completed.extend(parsed.items())
+
+
+@dataclass
+class StreamingStats:
+    """流式验证统计"""
+    streams: int = 0
+    aborted: int = 0
+    closed_early: int = 0
+    local_repairs: int = 0
+
+
+class StreamingOutputValidator:
+    """流式增量输出验证器"""
+
+    def __init__(
+        self,
+        schema: type[BaseModel],
+        max_retries: int = 3,
+        local_repair: bool = True,
+        metrics: Optional[OutputMetrics] = None,
+    ) -> None:
+        self.schema = schema
+        self.max_retries = max_retries
+        self.local_repair = local_repair
+        self.metrics = metrics or get_output_metrics()
+        self._adapters: Dict[str, TypeAdapter] = {}
+        self._literals: Dict[str, Tuple[str, ...]] = {}
+        for name, field in schema.model_fields.items():
+            annotation = field.annotation
+            if field.metadata:
+                annotation = Annotated[(annotation, *field.metadata)]
+            self._adapters[name] = TypeAdapter(annotation)
+            if get_origin(field.annotation) is Literal:
+                self._literals[name] = tuple(str(option) for option in get_args(field.annotation))
+        self.stats = StreamingStats()
+
+    async def validate_stream(
+        self,
+        stream: StreamFactory,
+        messages: Messages,
+    ) -> BaseModel:
+        """消费流式输出并验证，部分输出不合法时中止并重新提示。"""
+        start = time.perf_counter()
+        for attempt in range(self.max_retries):
+            partial = ""
+            try:
+                partial = await self._consume(stream(messages))
+                result = self._finalize(partial)
+            except (json.JSONDecodeError, ValidationError, ValueError) as exc:
+                if isinstance(exc, StreamAborted):
+                    partial = exc.partial
+                if attempt >= self.max_retries - 1:
+                    self._record(False, attempt, start)
+                    raise OutputValidationError(
+                        f"Failed to validate stream after {self.max_retries} attempts: {exc}",
+                        retry_count=self.max_retries,
+                    ) from exc
+                messages = self._correction_messages(messages, partial, str(exc))
+            else:
+                self._record(True, attempt, start)
+                return result
+
+        raise OutputValidationError(
+            "Validation loop exited unexpectedly",
+            retry_count=self.max_retries,
+        )
+
+    def _record(self, success: bool, retries: int, start: float) -> None:
+        self.metrics.record_validation(
+            success,
+            retries,
+            schema=self.schema.__name__,
+            latency=time.perf_counter() - start,
+        )
+
+    async def _consume(self, stream: AsyncIterator[Any]) -> str:
+        self.stats.streams += 1
+        parser = IncrementalObjectParser()
+        iterator = stream.__aiter__()
+        try:
+            async for chunk in iterator:
+                if not isinstance(chunk, str):
+                    # 流结束时的汇总结果（如 autogen CreateResult）
+                    continue
+                for key, value in parser.feed(chunk):
+                    self._check_member(key, value, parser.text)
+                self._check_partial(parser)
+                if parser.complete:
+                    self.stats.closed_early += 1
+                    return parser.text
+        finally:
+            close = getattr(iterator, "aclose", None)
+            if close is not None:
+                await close()
+        return parser.text
+
+    def _check_member(self, key: str, value: Any, partial: str) -> None:
+        adapter = self._adapters.get(key)
+        if adapter is None:
+            return
+        if self.local_repair:
+            value = repair_payload(self.schema, {key: value})[key]
+        try:
+            adapter.validate_python(value)
+        except ValidationError as exc:
+            self.stats.aborted += 1
+            raise StreamAborted(f"field {key!r} is invalid: {exc.errors()[0]['msg']}", partial) from exc
+
+    def _check_partial(self, parser: IncrementalObjectParser) -> None:
+        current = parser.partial_string_value()
+        if current is None:
+            return
+        key, prefix = current
+        options = self._literals.get(key)
+        if options and not any(option.startswith(prefix) for option in options):
+            self.stats.aborted += 1
+            raise StreamAborted(
+                f"field {key!r} must be one of {list(options)}, got {prefix!r}...",
+                parser.text,
+            )
+
+    def _finalize(self, text: str) -> BaseModel:
+        try:
+            return self.schema.model_validate(extract_json_object(text))
+        except (json.JSONDecodeError, ValidationError, ValueError):
+            if not self.local_repair:
+                raise
+        parsed = extract_json_object(repair_json_text(text))
+        result = self.schema.model_validate(repair_payload(self.schema, parsed))
+        self.stats.local_repairs += 1
+        return result
+
+    @staticmethod
+    def _correction_messages(messages: Messages, partial: str, error_message: str) -> Messages:
+        correction_prompt = f"""
+The previous output was aborted because: {error_message}
+
+Partial output:
+{partial}
+
+Please output the complete JSON object again, matching the required schema.
+Corrected output:
+"""
+        return [*messages, {"role": "user", "content": correction_prompt}]
+
+
+def stream_from_model_client(model_client: Any, **create_args: Any) -> StreamFactory:
+    """把 autogen ChatCompletionClient.create_stream 适配为流工厂"""
+
+    def factory(messages: Messages) -> AsyncIterator[Any]:
+        return model_client.create_stream(
+            to_autogen_messages(messages),
+            extra_create_args=create_args,
+        )
+
+    return factory
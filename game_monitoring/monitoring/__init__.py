@@ -1,7 +1,22 @@
 # Monitoring Module
 # 行为监控和玩家状态管理模块
 
+from .action_buffer import ActionRingBuffer, ActionWindowView
+from .action_record import ActionRecord, ActionVocabulary, get_action_vocabulary
 from .behavior_monitor import BehaviorMonitor
+from .event_store import PlayerEventStore
 from .player_state import PlayerState, PlayerStateManager
+from .sharded_monitor import ShardedBehaviorMonitor
 
-__all__ = ['BehaviorMonitor', 'PlayerState', 'PlayerStateManager']
\ No newline at end of file
+__all__ = [
+    'ActionRecord',
+    'ActionRingBuffer',
+    'ActionVocabulary',
+    'ActionWindowView',
+    'BehaviorMonitor',
+    'PlayerEventStore',
+    'PlayerState',
+    'PlayerStateManager',
+    'ShardedBehaviorMonitor',
+    'get_action_vocabulary',
+]
\ No newline at end of file
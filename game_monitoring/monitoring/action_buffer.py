@@ -0,0 +1,115 @@
+"""
+玩家动作环形缓冲区
+
+为每个玩家保存固定容量的动作窗口:
+- append 为 O(1)，超出容量时覆盖最旧的记录，不再重建列表
+- window/view 返回零拷贝的只读视图，按需从底层槽位读取
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+class ActionRingBuffer:
+    """固定容量的动作环形缓冲区。"""
+
+    __slots__ = ("_slots", "_capacity", "_total")
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._slots: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._capacity = capacity
+        # 累计写入次数，用于把逻辑序号映射到槽位并识别已被覆盖的记录
+        self._total = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return min(self._total, self._capacity)
+
+    def append(self, action: Dict[str, Any]) -> None:
+        """追加一条动作，容量已满时覆盖最旧的记录。"""
+        self._slots[self._total % self._capacity] = action
+        self._total += 1
+
+    def view(self) -> "ActionWindowView":
+        """返回当前全部动作的只读视图。"""
+        return self.window(self._capacity)
+
+    def window(self, size: int) -> "ActionWindowView":
+        """返回最近 size 条动作的只读视图。"""
+        length = min(max(size, 0), len(self))
+        return ActionWindowView(self, self._total - length, length)
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """返回最近一条动作，缓冲区为空时返回 None。"""
+        if self._total == 0:
+            return None
+        return self._slots[(self._total - 1) % self._capacity]
+
+    def _get(self, position: int) -> Dict[str, Any]:
+        if position < self._total - self._capacity or position >= self._total:
+            raise IndexError("action has been overwritten by newer records")
+        return self._slots[position % self._capacity]
+
+
+class ActionWindowView(Sequence):
+    """
+    环形缓冲区上的只读窗口视图
+
+    视图固定指向创建时的那一段记录，不复制数据；
+    记录被后续写入覆盖后再访问会抛出 IndexError。
+    需要长期持有时请使用 list(view) 生成快照。
+    """
+
+    __slots__ = ("_buffer", "_start", "_length")
+
+    def __init__(self, buffer: ActionRingBuffer, start: int, length: int):
+        self._buffer = buffer
+        self._start = start
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step == 1:
+                return ActionWindowView(
+                    self._buffer, self._start + start, max(stop - start, 0)
+                )
+            return [self[i] for i in range(start, stop, step)]
+
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError("action window index out of range")
+        return self._buffer._get(self._start + index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        get = self._buffer._get
+        for position in range(self._start, self._start + self._length):
+            yield get(position)
+
+    def __reversed__(self) -> Iterator[Dict[str, Any]]:
+        get = self._buffer._get
+        for position in range(self._start + self._length - 1, self._start - 1, -1):
+            yield get(position)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        if len(other) != self._length:
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ActionWindowView({list(self)!r})"
@@ -0,0 +1,166 @@
+"""
+紧凑动作记录
+
+监控器中每条动作原本是一个四键字典，在数百万条事件规模下内存和字符串比较开销明显:
+- ActionVocabulary 把动作名驻留为整数编码，预置 PlayerActionDefinitions 中的全部动作
+- ActionRecord 使用 __slots__ 存储编码，同时实现只读 Mapping 接口，
+  record['action'] / record.get('params') / dict(record) 等旧用法保持不变
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional
+
+from ..simulator.player_behavior import PlayerActionDefinitions
+
+
+class ActionVocabulary:
+    """动作名 <-> 整数编码的驻留表，未登记的动作名在首次出现时追加编码。"""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._names: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        for name in names:
+            self.code(name)
+
+    @classmethod
+    def from_definitions(cls, definitions: Optional[PlayerActionDefinitions] = None) -> 'ActionVocabulary':
+        """按 PlayerActionDefinitions 的声明顺序建立编码，签名中的参数部分会被去掉"""
+        definitions = definitions or PlayerActionDefinitions()
+        signatures = (
+            definitions.core_game_actions
+            + definitions.social_actions
+            + definitions.economic_actions
+            + definitions.meta_actions
+        )
+        return cls(signature.split('(', 1)[0].strip() for signature in signatures)
+
+    def code(self, name: str) -> int:
+        """返回动作名的编码，必要时登记新动作"""
+        code = self._codes.get(name)
+        if code is not None:
+            return code
+        with self._lock:
+            code = self._codes.get(name)
+            if code is None:
+                code = len(self._names)
+                self._names.append(sys.intern(name))
+                self._codes[self._names[code]] = code
+            return code
+
+    def name(self, code: int) -> str:
+        """返回编码对应的驻留动作名"""
+        return self._names[code]
+
+    def codes_for(self, names: Iterable[str]) -> FrozenSet[int]:
+        """把一组动作名转换为编码集合，便于规则做整数比较"""
+        return frozenset(self.code(name) for name in names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._codes
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+_vocabulary = ActionVocabulary.from_definitions()
+
+
+def get_action_vocabulary() -> ActionVocabulary:
+    """获取进程级共享的动作编码表"""
+    return _vocabulary
+
+
+_KEYS = ('action', 'params', 'timestamp', 'player_id')
+
+
+class ActionRecord(Mapping):
+    """
+    紧凑的动作记录
+
+    只保存动作编码、参数、时间戳和玩家ID；
+    作为只读 Mapping 提供与旧版动作字典相同的键，
+    同时提供 PlayerBehavior 的 action/timestamp/result/metadata 属性。
+    """
+
+    __slots__ = ('action_code', 'player_id', 'timestamp', '_params')
+
+    def __init__(
+        self,
+        player_id: str,
+        action_code: int,
+        timestamp: datetime,
+        params: Optional[Dict[str, Any]] = None,
+    ):
+        self.action_code = action_code
+        self.player_id = player_id
+        self.timestamp = timestamp
+        # 无参数的动作不额外持有空字典
+        self._params = params or None
+
+    @classmethod
+    def create(
+        cls,
+        player_id: str,
+        action: str,
+        params: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> 'ActionRecord':
+        """按动作名创建记录，动作名和玩家ID都会被驻留"""
+        return cls(
+            sys.intern(player_id),
+            _vocabulary.code(action),
+            timestamp or datetime.now(),
+            params,
+        )
+
+    @property
+    def action(self) -> str:
+        return _vocabulary.name(self.action_code)
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return self._params if self._params is not None else {}
+
+    # 与 PlayerBehavior 相同的字段，便于直接作为行为历史记录使用
+    @property
+    def result(self) -> str:
+        return "success"
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.params
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'action':
+            return _vocabulary.name(self.action_code)
+        if key == 'params':
+            return self.params
+        if key == 'timestamp':
+            return self.timestamp
+        if key == 'player_id':
+            return self.player_id
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_KEYS)
+
+    def __len__(self) -> int:
+        return len(_KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """生成旧版动作字典"""
+        return {
+            'action': self.action,
+            'params': self.params,
+            'timestamp': self.timestamp,
+            'player_id': self.player_id,
+        }
+
+    def __repr__(self) -> str:
+        return f"ActionRecord({self.to_dict()!r})"
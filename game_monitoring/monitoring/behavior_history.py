@@ -0,0 +1,107 @@
+"""
+玩家行为历史存储
+
+按玩家建立索引，同时保留全局按写入顺序排列的视图:
+- 单玩家查询只遍历该玩家自己的记录，成本为 O(k)
+- 全局与单玩家两级保留上限，长期运行时内存不会无限增长
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, Iterator, List, Optional, Union
+
+from .action_record import ActionRecord
+from ..simulator.player_behavior import PlayerBehavior
+
+# 监控器写入的 ActionRecord 与旧版 PlayerBehavior 提供相同的历史字段
+HistoryRecord = Union[ActionRecord, PlayerBehavior]
+
+
+class BehaviorHistoryStore:
+    """带保留上限的行为历史存储。"""
+
+    def __init__(
+        self,
+        max_records: int = 100_000,
+        max_records_per_player: int = 1_000,
+    ):
+        """
+        Args:
+            max_records: 全局最多保留的记录数，超出后淘汰最旧记录
+            max_records_per_player: 单个玩家最多保留的记录数
+        """
+        if max_records <= 0 or max_records_per_player <= 0:
+            raise ValueError("retention limits must be positive")
+        self._max_records = max_records
+        self._max_records_per_player = max_records_per_player
+        self._records: Deque[HistoryRecord] = deque()
+        self._by_player: Dict[str, Deque[HistoryRecord]] = {}
+
+    @property
+    def max_records(self) -> int:
+        return self._max_records
+
+    @property
+    def max_records_per_player(self) -> int:
+        return self._max_records_per_player
+
+    def append(self, behavior: HistoryRecord) -> None:
+        """追加一条行为记录，并按保留上限淘汰旧记录。"""
+        if len(self._records) >= self._max_records:
+            self._evict_oldest()
+        self._records.append(behavior)
+
+        player_records = self._by_player.get(behavior.player_id)
+        if player_records is None:
+            player_records = deque(maxlen=self._max_records_per_player)
+            self._by_player[behavior.player_id] = player_records
+        player_records.append(behavior)
+
+    def for_player(
+        self, player_id: str, limit: Optional[int] = None
+    ) -> List[HistoryRecord]:
+        """返回玩家的行为历史（按时间顺序），limit 限制只取最近若干条。"""
+        player_records = self._by_player.get(player_id)
+        if not player_records:
+            return []
+        if limit is None or limit >= len(player_records):
+            return list(player_records)
+        if limit <= 0:
+            return []
+        # 从右端倒序取出最近 limit 条，避免遍历整个玩家历史
+        recent = list(islice(reversed(player_records), limit))
+        recent.reverse()
+        return recent
+
+    def count(self, player_id: str) -> int:
+        """返回玩家当前保留的行为记录数。"""
+        player_records = self._by_player.get(player_id)
+        return len(player_records) if player_records else 0
+
+    def player_ids(self) -> List[str]:
+        """返回有历史记录的玩家ID。"""
+        return list(self._by_player)
+
+    def clear(self) -> None:
+        self._records.clear()
+        self._by_player.clear()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[HistoryRecord]:
+        return iter(self._records)
+
+    def __getitem__(self, index: int) -> HistoryRecord:
+        return self._records[index]
+
+    def _evict_oldest(self) -> None:
+        oldest = self._records.popleft()
+        player_records = self._by_player.get(oldest.player_id)
+        # 单玩家队列可能已因自身上限淘汰了这条记录
+        if player_records and player_records[0] is oldest:
+            player_records.popleft()
+            if not player_records:
+                del self._by_player[oldest.player_id]
@@ -1,23 +1,50 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 
+from .action_buffer import ActionRingBuffer
+from .behavior_history import BehaviorHistoryStore, HistoryRecord
+from .event_store import PlayerEventStore
+from ..infrastructure.monitoring.tracer import TraceLevel, get_tracer
+from ..rules.engine import RuleCategory, RulePriority
 from ..simulator.player_behavior import PlayerBehavior
 from ..simulator.behavior_simulator import PlayerBehaviorRuleEngine
 
+# 旧版高层负面行为 -> (情景名, 类别, 优先级)，阈值触发时作为命中情景交给调度器排序
+LEGACY_NEGATIVE_SCENARIOS = {
+    "发布消极评论": ("消极评论情绪风险", RuleCategory.EMOTION, RulePriority.HIGH),
+    "突然不充了": ("付费中断流失风险", RuleCategory.CHURN_RISK, RulePriority.HIGH),
+    "不买月卡了": ("付费中断流失风险", RuleCategory.CHURN_RISK, RulePriority.MEDIUM),
+    "玩家点击退出游戏": ("游戏卸载流失风险", RuleCategory.CHURN_RISK, RulePriority.HIGH),
+}
+
 
 class BehaviorMonitor:
-    def __init__(self, threshold: int = 3, max_sequence_length: int = 50, recent_actions_window: int = 3):
+    def __init__(
+        self,
+        threshold: int = 3,
+        max_sequence_length: int = 50,
+        recent_actions_window: int = 3,
+        max_history_length: int = 100_000,
+        max_player_history_length: int = 1_000,
+    ):
         """初始化行为监控器
         
         Args:
             threshold: 触发干预的负面行为阈值
             max_sequence_length: 最大序列长度
             recent_actions_window: 最近行为窗口大小（用于情景识别）
+            max_history_length: 全局行为历史保留上限
+            max_player_history_length: 单个玩家行为历史保留上限
         """
         self.rule_engine = PlayerBehaviorRuleEngine()
-        self.player_action_sequences = {}  # 存储每个玩家的动作序列
-        self.behavior_history = []  # 存储所有行为历史
+        # 唯一的动作记录存储，序列视图与历史视图共享同一批记录
+        self.events = PlayerEventStore(
+            max_sequence_length, max_history_length, max_player_history_length
+        )
+        self.player_action_sequences: Dict[str, ActionRingBuffer] = self.events.sequences  # 每个玩家的动作环形缓冲区
+        self.behavior_history: BehaviorHistoryStore = self.events.history  # 按玩家索引的行为历史（带保留上限）
         self._negative_counts = {}  # 保持旧版高层行为阈值统计兼容
+        self._negative_actions: Dict[str, Dict[str, int]] = {}  # 计数周期内各负面行为次数
         self.triggered_scenarios_by_player = {}  # 存储每个玩家最近一次规则命中
         self.threshold = threshold
         self.max_sequence_length = max_sequence_length
@@ -25,22 +52,42 @@ class BehaviorMonitor:
     
     def add_behavior(self, behavior: PlayerBehavior) -> bool:
         """添加行为数据（保持向后兼容）"""
-        self.behavior_history.append(behavior)
+        self.events.append_history(behavior)
 
-        legacy_negative_actions = {
-            "发布消极评论",
-            "突然不充了",
-            "不买月卡了",
-            "玩家点击退出游戏",
-        }
-        if behavior.action in legacy_negative_actions:
+        if behavior.action in LEGACY_NEGATIVE_SCENARIOS:
             current = self._negative_counts.get(behavior.player_id, 0) + 1
             self._negative_counts[behavior.player_id] = current
+            actions = self._negative_actions.setdefault(behavior.player_id, {})
+            actions[behavior.action] = actions.get(behavior.action, 0) + 1
             if current >= self.threshold:
-                print(f"⚠️  触发监控阈值: 玩家 {behavior.player_id} 行为触发")
+                self.triggered_scenarios_by_player[behavior.player_id] = (
+                    self._legacy_negative_scenarios(actions)
+                )
+                get_tracer().warning(
+                    "monitor.threshold_reached",
+                    "⚠️  触发监控阈值: 玩家 {player_id} 行为触发",
+                    player_id=behavior.player_id,
+                )
                 return True
 
         return False
+
+    @staticmethod
+    def _legacy_negative_scenarios(actions: Dict[str, int]) -> List[Dict]:
+        """把计数周期内的负面行为转换为命中情景（同名情景取最高优先级）"""
+        scenarios: Dict[str, Dict] = {}
+        for action, count in actions.items():
+            name, category, priority = LEGACY_NEGATIVE_SCENARIOS[action]
+            existing = scenarios.get(name)
+            if existing is not None and existing['priority'] <= priority.value:
+                continue
+            scenarios[name] = {
+                'scenario': name,
+                'description': f'{action}{count}次，达到监控阈值',
+                'category': category.value,
+                'priority': priority.value,
+            }
+        return list(scenarios.values())
     
     def add_atomic_action(
         self,
@@ -57,65 +104,43 @@ class BehaviorMonitor:
         Returns:
             触发的场景列表
         """
-        # 初始化玩家序列（如果不存在）
-        if player_id not in self.player_action_sequences:
-            self.player_action_sequences[player_id] = []
-        
-        # 创建动作数据
-        action_data = {
-            'action': action_name,
-            'params': params or {},
-            'timestamp': datetime.now(),
-            'player_id': player_id
-        }
+        # 记录一次动作：同一条紧凑记录同时进入动作序列和行为历史
+        self.events.record(player_id, action_name, params)
+
+        # 获取最近的行为窗口用于情景识别
+        current_sequence = self.events.sequence(player_id)
+        recent_actions = self.events.window(player_id, self.recent_actions_window)
         
-        # 添加到玩家序列
-        self.player_action_sequences[player_id].append(action_data)
-        self.behavior_history.append(
-            PlayerBehavior(
+        tracer = get_tracer()
+        if tracer.enabled(TraceLevel.DEBUG):
+            tracer.debug(
+                "monitor.action_window",
+                "玩家 {player_id} 动作 {action}: 序列 {sequence}，分析窗口 {window}",
                 player_id=player_id,
-                timestamp=action_data['timestamp'],
                 action=action_name,
-                result="success",
-                metadata=params or {},
+                sequence=[a['action'] for a in current_sequence],
+                window=[a['action'] for a in recent_actions],
             )
-        )
-        
-        # 限制序列长度
-        if len(self.player_action_sequences[player_id]) > self.max_sequence_length:
-            self.player_action_sequences[player_id] = self.player_action_sequences[player_id][-self.max_sequence_length:]
-        
-        # 获取最近的行为窗口用于情景识别
-        current_sequence = self.player_action_sequences[player_id]
-        recent_actions = current_sequence[-self.recent_actions_window:] if len(current_sequence) >= self.recent_actions_window else current_sequence
-        
-        # 输出调试信息
-        print(f"\n=== 玩家 {player_id} 行为分析 ===")
-        print(f"当前动作: {action_name}")
-        print(f"完整动作序列 ({len(current_sequence)} 个): {[a['action'] for a in current_sequence]}")
-        print(f"分析窗口 ({len(recent_actions)} 个): {[a['action'] for a in recent_actions]}")
         
         # 使用规则引擎分析最近行为窗口
         triggered_scenarios = self.rule_engine.analyze_action_sequence(player_id, recent_actions)
         self.triggered_scenarios_by_player[player_id] = triggered_scenarios
         
-        # 输出触发的场景信息
-        if triggered_scenarios:
-            print(f"触发的场景 ({len(triggered_scenarios)} 个):")
-            for i, scenario in enumerate(triggered_scenarios, 1):
-                scenario_name = scenario.get('scenario', '未知场景')
-                scenario_desc = scenario.get('description', '无描述')
-                print(f"  {i}. {scenario_name}: {scenario_desc}")
-        else:
-            print("未触发任何场景")
-        
-        print(f"=== 分析完成 ===\n")
+        if triggered_scenarios and tracer.enabled(TraceLevel.INFO):
+            for scenario in triggered_scenarios:
+                tracer.info(
+                    "monitor.scenario_triggered",
+                    "玩家 {player_id} 触发场景 {scenario}: {description}",
+                    player_id=player_id,
+                    scenario=scenario.get('scenario', '未知场景'),
+                    description=scenario.get('description', '无描述'),
+                )
         
         return triggered_scenarios
 
     def analyze_current_sequence(self, player_id: str) -> List[Dict]:
         """重新分析玩家当前动作序列。"""
-        recent_actions = self.get_recent_actions_for_analysis(player_id)
+        recent_actions = self.events.window(player_id, self.recent_actions_window)
         triggered_scenarios = self.rule_engine.analyze_action_sequence(
             player_id, recent_actions
         )
@@ -145,32 +170,28 @@ class BehaviorMonitor:
     def reset_negative_count(self, player_id: str) -> None:
         """重置玩家的负面行为计数。"""
         self._negative_counts[player_id] = 0
+        self._negative_actions.pop(player_id, None)
     
-    def get_recent_actions_for_analysis(self, player_id: str) -> List[Dict]:
+    def get_recent_actions_for_analysis(self, player_id: str) -> List[Dict[str, Any]]:
         """获取用于分析的最近行为
         
         Args:
             player_id: 玩家ID
             
         Returns:
-            最近的行为列表
+            最近行为的列表快照（后续写入不影响已返回的结果）
         """
-        if player_id not in self.player_action_sequences:
-            return []
-        
-        current_sequence = self.player_action_sequences[player_id]
-        return current_sequence[-self.recent_actions_window:] if len(current_sequence) >= self.recent_actions_window else current_sequence
+        return list(self.events.window(player_id, self.recent_actions_window))
     
-    def get_player_history(self, player_id: str) -> List[PlayerBehavior]:
-        """获取玩家行为历史"""
-        return [b for b in self.behavior_history if b.player_id == player_id]
+    def get_player_history(self, player_id: str, limit: Optional[int] = None) -> List[HistoryRecord]:
+        """获取玩家行为历史（limit 仅返回最近若干条）"""
+        return self.events.player_history(player_id, limit)
     
     def get_player_action_sequence(self, player_id: str) -> List[Dict[str, Any]]:
-        """获取玩家当前动作序列"""
-        return self.player_action_sequences.get(player_id, [])
+        """获取玩家当前动作序列的列表快照（内部热路径直接使用 events 的零拷贝视图）"""
+        return list(self.events.sequence(player_id))
     
     def clear_player_sequence(self, player_id: str):
         """清空玩家动作序列（用于测试或重置）"""
-        if player_id in self.player_action_sequences:
-            self.player_action_sequences[player_id] = []
+        self.events.reset_sequence(player_id)
         self.triggered_scenarios_by_player[player_id] = []
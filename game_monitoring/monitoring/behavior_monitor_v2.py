@@ -5,7 +5,8 @@ Behavior Monitor V2 - 集成新规则引擎
 """
 
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from .behavior_history import BehaviorHistoryStore, HistoryRecord
+from .event_store import PlayerEventStore
 from ..rules import RuleEngine, RuleRegistry
 from ..core.context import GameContext
 from ..simulator.player_behavior import PlayerBehavior
@@ -23,16 +24,19 @@ class BehaviorMonitorV2:
         engine: RuleEngine = None,
         threshold: int = 3,
         max_sequence_length: int = 50,
-        recent_actions_window: int = 3
+        recent_actions_window: int = 3,
+        max_history_length: int = 100_000,
+        max_player_history_length: int = 1_000
     ):
         self._engine = engine or RuleEngine()
         self._threshold = threshold
         self._max_sequence_length = max_sequence_length
         self._recent_window = recent_actions_window
 
-        # 数据存储
-        self._player_sequences: Dict[str, List[Dict]] = {}
-        self._behavior_history: List[PlayerBehavior] = []
+        # 数据存储：序列视图与历史视图共享同一批记录
+        self._events = PlayerEventStore(
+            max_sequence_length, max_history_length, max_player_history_length
+        )
         self._negative_counts: Dict[str, int] = {}
 
     @property
@@ -54,45 +58,21 @@ class BehaviorMonitorV2:
 
         保持与旧版接口兼容
         """
-        # 初始化序列
-        if player_id not in self._player_sequences:
-            self._player_sequences[player_id] = []
-
-        action_data = {
-            'action': action_name,
-            'params': params or {},
-            'timestamp': datetime.now(),
-            'player_id': player_id
-        }
-
-        self._player_sequences[player_id].append(action_data)
-
-        # 限制长度
-        if len(self._player_sequences[player_id]) > self._max_sequence_length:
-            self._player_sequences[player_id] = self._player_sequences[player_id][-self._max_sequence_length:]
-
-        # 同时添加到旧版兼容的behavior_history
-        self._behavior_history.append(
-            PlayerBehavior(
-                player_id=player_id,
-                timestamp=datetime.now(),
-                action=action_name,
-                result="success",
-                metadata=params or {}
-            )
+        # 序列已满时，本次写入会挤出最旧的动作，增量规则需要同步移除
+        sequence = self._events.sequence(player_id)
+        evicted = sequence[0] if len(sequence) >= self._max_sequence_length else None
+
+        # 同一条记录同时进入动作序列和旧版兼容的行为历史
+        action_data = self._events.record(player_id, action_name, params)
+
+        # 规则分析：增量规则只以 O(1) 更新玩家状态，不重扫窗口
+        results = self._engine.process_action(
+            player_id,
+            action_data,
+            self._events.sequence(player_id),
+            window_size=self._recent_window,
+            evicted=evicted
         )
-
-        # 规则分析
-        actions = self._player_sequences[player_id]
-        recent = actions[-self._recent_window:] if len(actions) >= self._recent_window else actions
-
-        context = type('context', (), {
-            'player_id': player_id,
-            'actions': actions,
-            'recent_actions': recent
-        })
-
-        results = self._engine.registry.execute_all(context)
         return [r.to_dict() for r in results if r.triggered]
 
     # 旧版兼容方法
@@ -100,18 +80,27 @@ class BehaviorMonitorV2:
         """旧版接口 - 直接返回False，逻辑重用add_atomic_action"""
         return False
 
-    def get_player_history(self, player_id: str) -> List[PlayerBehavior]:
-        """获取玩家行为历史"""
-        return [b for b in self._behavior_history if b.player_id == player_id]
+    @property
+    def behavior_history(self) -> BehaviorHistoryStore:
+        """全局行为历史视图（按写入顺序）"""
+        return self._events.history
+
+    def get_player_history(self, player_id: str, limit: Optional[int] = None) -> List[HistoryRecord]:
+        """获取玩家行为历史（limit 仅返回最近若干条）"""
+        return self._events.player_history(player_id, limit)
 
     def get_player_action_sequence(self, player_id: str) -> List[Dict]:
-        """获取动作序列"""
-        return self._player_sequences.get(player_id, [])
+        """获取动作序列（列表快照）"""
+        return list(self._events.sequence(player_id))
+
+    def get_recent_actions_for_analysis(self, player_id: str) -> List[Dict]:
+        """获取用于分析的最近动作窗口（列表快照）"""
+        return list(self._events.window(player_id, self._recent_window))
 
     def clear_player_sequence(self, player_id: str) -> None:
         """清空序列"""
-        if player_id in self._player_sequences:
-            self._player_sequences[player_id] = []
+        self._events.reset_sequence(player_id)
+        self._engine.reset_player(player_id)
 
     # 新增方法（V2）
     def get_negative_count(self, player_id: str) -> int:
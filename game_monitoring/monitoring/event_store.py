@@ -0,0 +1,93 @@
+"""
+玩家事件存储
+
+每个动作只创建一条 ActionRecord，两种视图共享同一条记录:
+- 序列视图：每个玩家一个固定容量的环形缓冲区，供规则窗口分析
+- 历史视图：按玩家索引、带保留上限的 BehaviorHistoryStore
+
+两种视图只持有记录引用，不再各自复制一份字典/PlayerBehavior，
+时间戳也只取一次，不会在两份副本之间漂移。
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from .action_buffer import ActionRingBuffer
+from .action_record import ActionRecord
+from .behavior_history import BehaviorHistoryStore, HistoryRecord
+
+
+class PlayerEventStore:
+    """动作记录的唯一存储，提供序列视图和历史视图。"""
+
+    def __init__(
+        self,
+        max_sequence_length: int = 50,
+        max_history_length: int = 100_000,
+        max_player_history_length: int = 1_000,
+    ):
+        """
+        Args:
+            max_sequence_length: 每个玩家序列视图的容量
+            max_history_length: 全局历史保留上限
+            max_player_history_length: 单个玩家历史保留上限
+        """
+        self._max_sequence_length = max_sequence_length
+        self._sequences: Dict[str, ActionRingBuffer] = {}
+        self._history = BehaviorHistoryStore(max_history_length, max_player_history_length)
+
+    @property
+    def sequences(self) -> Dict[str, ActionRingBuffer]:
+        """玩家ID -> 序列环形缓冲区"""
+        return self._sequences
+
+    @property
+    def history(self) -> BehaviorHistoryStore:
+        """历史视图（全局按写入顺序，按玩家索引）"""
+        return self._history
+
+    def record(
+        self,
+        player_id: str,
+        action_name: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> ActionRecord:
+        """记录一个动作，同一条记录同时进入序列视图和历史视图"""
+        record = ActionRecord.create(player_id, action_name, params)
+        buffer = self._sequences.get(player_id)
+        if buffer is None:
+            buffer = ActionRingBuffer(self._max_sequence_length)
+            self._sequences[player_id] = buffer
+        buffer.append(record)
+        self._history.append(record)
+        return record
+
+    def append_history(self, record: HistoryRecord) -> None:
+        """只写入历史视图（旧版 add_behavior 的高层行为不进入动作序列）"""
+        self._history.append(record)
+
+    def sequence(self, player_id: str) -> Sequence[ActionRecord]:
+        """玩家当前序列的只读视图"""
+        buffer = self._sequences.get(player_id)
+        if buffer is None:
+            return []
+        return buffer.view()
+
+    def window(self, player_id: str, size: int) -> Sequence[ActionRecord]:
+        """玩家最近 size 条动作的只读视图"""
+        buffer = self._sequences.get(player_id)
+        if buffer is None:
+            return []
+        return buffer.window(size)
+
+    def player_history(self, player_id: str, limit: Optional[int] = None) -> List[HistoryRecord]:
+        """玩家历史（按时间顺序），limit 只取最近若干条"""
+        return self._history.for_player(player_id, limit)
+
+    def reset_sequence(self, player_id: str) -> None:
+        """清空玩家序列视图，历史视图保持不变"""
+        if player_id in self._sequences:
+            # 替换为新缓冲区，已发出的视图仍指向旧数据
+            self._sequences[player_id] = ActionRingBuffer(self._max_sequence_length)
+
@@ -0,0 +1,216 @@
+"""
+分片加锁的行为监控器
+
+BehaviorMonitor 内部是普通的 dict/deque，没有任何同步；
+仪表盘后台线程和多路采集线程同时写入时会破坏动作序列。
+
+ShardedBehaviorMonitor 按玩家ID把数据分到 N 个分片，
+每个分片是一个独立的 BehaviorMonitor 并持有自己的锁:
+- 不同分片的玩家可以并行写入，同一玩家的动作严格串行
+- 公开接口与 BehaviorMonitor 保持一致
+- 读取接口在锁内生成快照，调用方拿到的数据不会被并发写入改动
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+import zlib
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .behavior_history import HistoryRecord
+from .behavior_monitor import BehaviorMonitor
+from ..simulator.player_behavior import PlayerBehavior
+
+
+def shard_index(player_id: str, shard_count: int) -> int:
+    """稳定的玩家分片映射（跨进程一致，不受 PYTHONHASHSEED 影响）"""
+    return zlib.crc32(player_id.encode('utf-8')) % shard_count
+
+
+class _MonitorShard:
+    __slots__ = ('monitor', 'lock')
+
+    def __init__(self, monitor: BehaviorMonitor):
+        self.monitor = monitor
+        self.lock = threading.RLock()
+
+
+class ShardedHistoryView:
+    """
+    跨分片的只读历史视图
+
+    遍历和下标按时间戳合并各分片（时间戳相同时保持分片内写入顺序），
+    与未分片监控器的 behavior_history 一样支持 history[-1] 和切片。
+    """
+
+    def __init__(self, shards: Tuple[_MonitorShard, ...]):
+        self._shards = shards
+
+    def __len__(self) -> int:
+        total = 0
+        for shard in self._shards:
+            with shard.lock:
+                total += len(shard.monitor.behavior_history)
+        return total
+
+    def __iter__(self) -> Iterator[HistoryRecord]:
+        snapshots = []
+        for shard in self._shards:
+            with shard.lock:
+                snapshots.append(list(shard.monitor.behavior_history))
+        return heapq.merge(*snapshots, key=attrgetter('timestamp'))
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[HistoryRecord, List[HistoryRecord]]:
+        return list(self)[index]
+
+    def player_ids(self) -> List[str]:
+        player_ids: List[str] = []
+        for shard in self._shards:
+            with shard.lock:
+                player_ids.extend(shard.monitor.behavior_history.player_ids())
+        return player_ids
+
+
+class ShardedBehaviorMonitor:
+    """
+    线程安全的分片行为监控器
+
+    使用示例:
+    ```python
+    monitor = ShardedBehaviorMonitor(shard_count=16)
+
+    # 多个采集线程可并发调用
+    monitor.add_atomic_action("player_1", "login")
+    ```
+    """
+
+    def __init__(
+        self,
+        shard_count: int = 16,
+        threshold: int = 3,
+        max_sequence_length: int = 50,
+        recent_actions_window: int = 3,
+        max_history_length: int = 100_000,
+        max_player_history_length: int = 1_000,
+    ):
+        """
+        Args:
+            shard_count: 分片数量
+            threshold: 触发干预的负面行为阈值
+            max_sequence_length: 最大序列长度
+            recent_actions_window: 最近行为窗口大小（用于情景识别）
+            max_history_length: 全局行为历史保留上限（平均分配到各分片）
+            max_player_history_length: 单个玩家行为历史保留上限
+        """
+        if shard_count <= 0:
+            raise ValueError("shard_count must be positive")
+        per_shard_history = max(max_history_length // shard_count, 1)
+        self._shards = tuple(
+            _MonitorShard(
+                BehaviorMonitor(
+                    threshold=threshold,
+                    max_sequence_length=max_sequence_length,
+                    recent_actions_window=recent_actions_window,
+                    max_history_length=per_shard_history,
+                    max_player_history_length=max_player_history_length,
+                )
+            )
+            for _ in range(shard_count)
+        )
+        self._history_view = ShardedHistoryView(self._shards)
+        self.threshold = threshold
+        self.max_sequence_length = max_sequence_length
+        self.recent_actions_window = recent_actions_window
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    @property
+    def rule_engine(self):
+        """规则引擎（无状态，各分片行为一致）"""
+        return self._shards[0].monitor.rule_engine
+
+    @property
+    def behavior_history(self) -> ShardedHistoryView:
+        return self._history_view
+
+    def _shard(self, player_id: str) -> _MonitorShard:
+        return self._shards[shard_index(player_id, len(self._shards))]
+
+    # ---- 写入 ----
+
+    def add_behavior(self, behavior: PlayerBehavior) -> bool:
+        """添加行为数据（保持向后兼容）"""
+        shard = self._shard(behavior.player_id)
+        with shard.lock:
+            return shard.monitor.add_behavior(behavior)
+
+    def add_atomic_action(
+        self,
+        player_id: str,
+        action_name: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict]:
+        """添加原子动作并分析，同一玩家的动作在分片锁内串行处理"""
+        shard = self._shard(player_id)
+        with shard.lock:
+            return shard.monitor.add_atomic_action(player_id, action_name, params)
+
+    def analyze_current_sequence(self, player_id: str) -> List[Dict]:
+        shard = self._shard(player_id)
+        with shard.lock:
+            return shard.monitor.analyze_current_sequence(player_id)
+
+    def clear_player_sequence(self, player_id: str) -> None:
+        shard = self._shard(player_id)
+        with shard.lock:
+            shard.monitor.clear_player_sequence(player_id)
+
+    # ---- 负面计数 ----
+
+    def get_negative_count(self, player_id: str) -> int:
+        shard = self._shard(player_id)
+        with shard.lock:
+            return shard.monitor.get_negative_count(player_id)
+
+    def increment_negative_count(self, player_id: str) -> int:
+        shard = self._shard(player_id)
+        with shard.lock:
+            return shard.monitor.increment_negative_count(player_id)
+
+    def reset_negative_count(self, player_id: str) -> None:
+        shard = self._shard(player_id)
+        with shard.lock:
+            shard.monitor.reset_negative_count(player_id)
+
+    # ---- 读取（锁内快照） ----
+
+    def get_triggered_scenarios(self, player_id: Optional[str] = None) -> List[Dict]:
+        if player_id is not None:
+            shard = self._shard(player_id)
+            with shard.lock:
+                return shard.monitor.get_triggered_scenarios(player_id)
+
+        scenarios: List[Dict] = []
+        for shard in self._shards:
+            with shard.lock:
+                scenarios.extend(shard.monitor.get_triggered_scenarios())
+        return scenarios
+
+    def get_recent_actions_for_analysis(self, player_id: str) -> List[Dict[str, Any]]:
+        shard = self._shard(player_id)
+        with shard.lock:
+            return shard.monitor.get_recent_actions_for_analysis(player_id)
+
+    def get_player_action_sequence(self, player_id: str) -> List[Dict[str, Any]]:
+        shard = self._shard(player_id)
+        with shard.lock:
+            return shard.monitor.get_player_action_sequence(player_id)
+
+    def get_player_history(self, player_id: str, limit: Optional[int] = None) -> List[HistoryRecord]:
+        shard = self._shard(player_id)
+        with shard.lock:
+            return shard.monitor.get_player_history(player_id, limit)
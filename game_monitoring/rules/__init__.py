@@ -17,6 +17,7 @@ result = engine.analyze("player_1", actions)
 """
 
 from .engine import (
+    IncrementalRule,
     Rule,
     RuleEngine,
     RuleExecutionContext,
@@ -27,6 +28,7 @@ from .engine import (
 )
 
 __all__ = [
+    'IncrementalRule',
     'Rule',
     'RuleEngine',
     'RuleExecutionContext',
@@ -0,0 +1,313 @@
+"""
+批量规则评估（列式、向量化）
+
+用于历史回放和数据回填：把大量动作组织成列式表，
+以 NumPy 窗口运算一次性评估内置的情绪、流失和战斗规则，
+不再逐玩家、逐动作调用 RuleEngine.analyze。
+
+语义与流式引擎一致：
+- 连续类规则（连续失败、连续被攻击）按玩家完整历史计算连续长度
+- 窗口类规则（流失风险、社交退出）只看每个位置最近 window_size 条动作
+- 累计类规则（体力耗尽）只统计每个位置最近 max_sequence_length 条动作，
+  与流式监控保留的动作序列一致
+
+使用示例:
+```python
+from game_monitoring.rules.batch import ActionTable, BatchRuleEvaluator
+
+table = ActionTable.from_arrow(arrow_table)
+result = BatchRuleEvaluator(window_size=3).evaluate(table)
+for record in result.to_records():
+    ...
+```
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .definitions.churn_rules import ChurnRiskRule
+from .definitions.combat_rules import StaminaExhaustionRule
+from .definitions.emotion_rules import ConsecutiveFailuresRule, SocialWithdrawalRule
+from .definitions.legacy_rules import ConsecutiveAttacksRule
+
+
+@dataclass(frozen=True)
+class ActionTable:
+    """
+    列式动作表
+
+    Attributes:
+        player_ids: 每行的玩家ID
+        actions: 动作编码（action_vocab 的下标）
+        action_vocab: 动作编码对应的动作名
+        statuses: 状态编码（status_vocab 的下标）
+        status_vocab: 状态编码对应的状态值，空字符串表示无状态
+        timestamps: 每行的时间戳，只用于排序
+    """
+    player_ids: np.ndarray
+    actions: np.ndarray
+    action_vocab: Tuple[str, ...]
+    statuses: np.ndarray
+    status_vocab: Tuple[str, ...]
+    timestamps: np.ndarray
+
+    def __post_init__(self):
+        size = len(self.player_ids)
+        if not (len(self.actions) == len(self.statuses) == len(self.timestamps) == size):
+            raise ValueError("all columns of an ActionTable must have the same length")
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    @classmethod
+    def from_columns(
+        cls,
+        player_ids: Sequence[Any],
+        actions: Sequence[str],
+        statuses: Sequence[str],
+        timestamps: Sequence[Any],
+    ) -> 'ActionTable':
+        """从未编码的列构建，动作名和状态会被字典编码"""
+        action_vocab, action_codes = np.unique(np.asarray(actions, dtype=str), return_inverse=True)
+        status_vocab, status_codes = np.unique(np.asarray(statuses, dtype=str), return_inverse=True)
+        return cls(
+            player_ids=np.asarray(player_ids),
+            actions=action_codes.astype(np.int32),
+            action_vocab=tuple(action_vocab.tolist()),
+            statuses=status_codes.astype(np.int32),
+            status_vocab=tuple(status_vocab.tolist()),
+            timestamps=np.asarray(timestamps),
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]]) -> 'ActionTable':
+        """从动作字典构建，字段与 BehaviorMonitor 的动作记录一致"""
+        player_ids, actions, statuses, timestamps = [], [], [], []
+        for index, record in enumerate(records):
+            params = record.get('params') or {}
+            player_ids.append(record['player_id'])
+            actions.append(record.get('action', ''))
+            statuses.append(record.get('status', params.get('status', '')) or '')
+            timestamps.append(record.get('timestamp', index))
+        return cls.from_columns(player_ids, actions, statuses, timestamps)
+
+    @classmethod
+    def from_arrow(cls, table: Any) -> 'ActionTable':
+        """
+        从 pyarrow.Table 构建
+
+        需要 player_id、action、status、timestamp 四列；
+        action/status 可以是字符串列或字典编码列。
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        def encode(column: Any) -> Tuple[np.ndarray, Tuple[str, ...]]:
+            column = pc.fill_null(column.cast(pa.string()), "")
+            encoded = column.combine_chunks().dictionary_encode()
+            return (
+                encoded.indices.to_numpy(zero_copy_only=False).astype(np.int32),
+                tuple(encoded.dictionary.to_pylist()),
+            )
+
+        actions, action_vocab = encode(table.column('action'))
+        statuses, status_vocab = encode(table.column('status'))
+        return cls(
+            player_ids=table.column('player_id').to_numpy(),
+            actions=actions,
+            action_vocab=action_vocab,
+            statuses=statuses,
+            status_vocab=status_vocab,
+            timestamps=table.column('timestamp').to_numpy(),
+        )
+
+    def action_mask(self, predicate: Any) -> np.ndarray:
+        """按动作名谓词生成行掩码：先在词表上求值，再按编码查表"""
+        lookup = np.array([bool(predicate(name)) for name in self.action_vocab], dtype=bool)
+        return lookup[self.actions] if len(lookup) else np.zeros(len(self), dtype=bool)
+
+    def status_mask(self, status: str) -> np.ndarray:
+        if status not in self.status_vocab:
+            return np.zeros(len(self), dtype=bool)
+        return self.statuses == self.status_vocab.index(status)
+
+
+@dataclass(frozen=True)
+class BatchRuleResult:
+    """
+    批量评估结果，每个元素对应一次 (玩家, 位置, 规则) 触发
+
+    Attributes:
+        rows: 触发动作在输入表中的行号
+        player_ids: 玩家ID
+        positions: 触发动作在该玩家序列中的位置（从 0 开始，按时间排序）
+        rule_ids: 触发的规则ID
+    """
+    rows: np.ndarray
+    player_ids: np.ndarray
+    positions: np.ndarray
+    rule_ids: np.ndarray
+    scenario_names: Dict[str, str]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def counts(self) -> Dict[str, int]:
+        """各规则的触发次数"""
+        names, counts = np.unique(self.rule_ids, return_counts=True)
+        return {str(name): int(count) for name, count in zip(names, counts)}
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                'row': int(row),
+                'player_id': player_id.item() if isinstance(player_id, np.generic) else player_id,
+                'position': int(position),
+                'rule_id': str(rule_id),
+                'scenario_name': self.scenario_names[str(rule_id)],
+            }
+            for row, player_id, position, rule_id in zip(
+                self.rows, self.player_ids, self.positions, self.rule_ids
+            )
+        ]
+
+
+class BatchRuleEvaluator:
+    """内置规则的向量化批量评估器"""
+
+    def __init__(self, window_size: int = 3, max_sequence_length: int = 50):
+        """
+        Args:
+            window_size: 最近动作窗口大小
+            max_sequence_length: 流式监控保留的动作序列长度，累计类规则只在该范围内计数
+        """
+        if window_size <= 0:
+            raise ValueError("window_size must be positive")
+        if max_sequence_length <= 0:
+            raise ValueError("max_sequence_length must be positive")
+        self._window_size = window_size
+        self._max_sequence_length = max_sequence_length
+        self._failures = ConsecutiveFailuresRule()
+        self._withdrawal = SocialWithdrawalRule()
+        self._churn = ChurnRiskRule()
+        self._stamina = StaminaExhaustionRule()
+        self._attacks = ConsecutiveAttacksRule()
+
+    @property
+    def rules(self) -> Tuple[Any, ...]:
+        return (self._stamina, self._failures, self._withdrawal, self._attacks, self._churn)
+
+    def evaluate(self, table: ActionTable) -> BatchRuleResult:
+        """评估整张表，返回按输入行号排序的触发结果"""
+        size = len(table)
+        scenario_names = {rule.rule_id: rule.scenario_name for rule in self.rules}
+        if size == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return BatchRuleResult(empty, table.player_ids[:0], empty, np.empty(0, dtype=object), scenario_names)
+
+        # 按 (玩家, 时间) 稳定排序，使每个玩家的动作连续且有序
+        _, player_codes = np.unique(table.player_ids, return_inverse=True)
+        order = np.lexsort((table.timestamps, player_codes))
+        sorted_players = player_codes[order]
+        actions = table.actions[order]
+        statuses = table.statuses[order]
+        sorted_table = ActionTable(
+            player_ids=table.player_ids[order],
+            actions=actions,
+            action_vocab=table.action_vocab,
+            statuses=statuses,
+            status_vocab=table.status_vocab,
+            timestamps=table.timestamps[order],
+        )
+
+        index = np.arange(size)
+        group_start = np.ones(size, dtype=bool)
+        group_start[1:] = sorted_players[1:] != sorted_players[:-1]
+        first_row = np.maximum.accumulate(np.where(group_start, index, 0))
+        positions = index - first_row
+
+        triggered = {
+            self._stamina.rule_id: self._stamina_mask(sorted_table, first_row),
+            self._failures.rule_id: self._failures_mask(sorted_table, group_start, index),
+            self._withdrawal.rule_id: self._withdrawal_mask(sorted_table, first_row),
+            self._attacks.rule_id: self._attacks_mask(sorted_table, group_start, index),
+            self._churn.rule_id: self._churn_mask(sorted_table, first_row),
+        }
+
+        rows, player_ids, result_positions, rule_ids = [], [], [], []
+        for rule_id, mask in triggered.items():
+            hits = np.flatnonzero(mask)
+            rows.append(order[hits])
+            player_ids.append(sorted_table.player_ids[hits])
+            result_positions.append(positions[hits])
+            rule_ids.append(np.full(len(hits), rule_id, dtype=object))
+
+        rows_array = np.concatenate(rows)
+        result_order = np.argsort(rows_array, kind='stable')
+        return BatchRuleResult(
+            rows=rows_array[result_order],
+            player_ids=np.concatenate(player_ids)[result_order],
+            positions=np.concatenate(result_positions)[result_order],
+            rule_ids=np.concatenate(rule_ids)[result_order],
+            scenario_names=scenario_names,
+        )
+
+    # ---- 向量化窗口原语 ----
+
+    @staticmethod
+    def _run_lengths(flags: np.ndarray, group_start: np.ndarray, index: np.ndarray) -> np.ndarray:
+        """每个位置以该位置结尾、且不跨玩家的连续 True 长度"""
+        # 最近一次中断位置：非命中行本身，或玩家首行的前一行
+        breaks = np.where(~flags, index, -1)
+        breaks = np.maximum(breaks, np.where(group_start, index - 1, -1))
+        last_break = np.maximum.accumulate(breaks)
+        return np.where(flags, index - last_break, 0)
+
+    def _window_counts(
+        self, flags: np.ndarray, first_row: np.ndarray, size: Optional[int] = None
+    ) -> np.ndarray:
+        """每个位置最近 size 条动作（不跨玩家，默认 window_size）中命中的次数"""
+        size = size or self._window_size
+        cumulative = np.concatenate(([0], np.cumsum(flags, dtype=np.int64)))
+        index = np.arange(len(flags))
+        window_start = np.maximum(index - size + 1, first_row)
+        return cumulative[index + 1] - cumulative[window_start]
+
+    # ---- 内置规则 ----
+
+    def _failures_mask(self, table: ActionTable, group_start: np.ndarray, index: np.ndarray) -> np.ndarray:
+        rule = self._failures
+        failure_actions = set(rule.FAILURE_ACTIONS)
+        is_failure = table.action_mask(lambda name: name == 'lose_pvp') | (
+            table.action_mask(lambda name: name in failure_actions) & table.status_mask('fail')
+        )
+        return self._run_lengths(is_failure, group_start, index) >= rule.THRESHOLD
+
+    def _attacks_mask(self, table: ActionTable, group_start: np.ndarray, index: np.ndarray) -> np.ndarray:
+        rule = self._attacks
+        is_attack = table.action_mask(lambda name: name == rule.ATTACK_ACTION)
+        return self._run_lengths(is_attack, group_start, index) >= rule.THRESHOLD
+
+    def _withdrawal_mask(self, table: ActionTable, first_row: np.ndarray) -> np.ndarray:
+        rule = self._withdrawal
+        distinct = np.zeros(len(table), dtype=np.int64)
+        for action_name in rule.WITHDRAWAL_ACTIONS:
+            flags = table.action_mask(lambda name, target=action_name: name == target)
+            distinct += self._window_counts(flags, first_row) > 0
+        return distinct >= rule.THRESHOLD
+
+    def _churn_mask(self, table: ActionTable, first_row: np.ndarray) -> np.ndarray:
+        rule = self._churn
+        flags = table.action_mask(lambda name: name in rule.CHURN_ACTIONS)
+        return self._window_counts(flags, first_row) > 0
+
+    def _stamina_mask(self, table: ActionTable, first_row: np.ndarray) -> np.ndarray:
+        rule = self._stamina
+        flags = table.action_mask(
+            lambda name: any(keyword in name.lower() for keyword in rule.STAMINA_KEYWORDS)
+        )
+        return self._window_counts(flags, first_row, self._max_sequence_length) >= rule.THRESHOLD
@@ -7,10 +7,14 @@
 from .emotion_rules import *
 from .churn_rules import *
 from .combat_rules import *
+from .legacy_rules import ConsecutiveAttacksRule, LegacyRuleAdapter, build_legacy_rules
 
 __all__ = [
     'ConsecutiveFailuresRule',
     'SocialWithdrawalRule',
     'ChurnRiskRule',
     'StaminaExhaustionRule',
+    'ConsecutiveAttacksRule',
+    'LegacyRuleAdapter',
+    'build_legacy_rules',
 ]
@@ -2,11 +2,13 @@
 战斗相关规则
 """
 
-from ..engine import Rule, RuleResult, RuleExecutionContext, RuleCategory, RulePriority
+from typing import Any, Dict, Sequence
 
+from ..engine import IncrementalRule, RuleResult, RuleExecutionContext, RuleCategory, RulePriority
 
-class StaminaExhaustionRule(Rule):
-    """体力耗尽引导触发"""
+
+class StaminaExhaustionRule(IncrementalRule):
+    """体力耗尽引导触发（保留序列内的累计计数，动作移出序列时同步减计数）"""
 
     STAMINA_KEYWORDS = ['stamina_exhausted', 'attempt_enter_dungeon_no_stamina']
     THRESHOLD = 3
@@ -27,12 +29,21 @@ class StaminaExhaustionRule(Rule):
     def priority(self) -> RulePriority:
         return RulePriority.CRITICAL
 
-    def evaluate(self, context: RuleExecutionContext) -> RuleResult:
-        count = sum(
-            1 for action in context.actions
-            if any(kw in action.get('action', '').lower() for kw in self.STAMINA_KEYWORDS)
-        )
+    def initial_state(self) -> int:
+        return 0
+
+    def update(self, state: int, action: Dict[str, Any]) -> int:
+        return state + 1 if self._is_stamina_action(action) else state
+
+    def evict(self, state: int, action: Dict[str, Any], actions: Sequence[Dict[str, Any]]) -> int:
+        return state - 1 if self._is_stamina_action(action) else state
+
+    def _is_stamina_action(self, action: Dict[str, Any]) -> bool:
+        name = action.get('action', '').lower()
+        return any(kw in name for kw in self.STAMINA_KEYWORDS)
 
+    def evaluate_state(self, state: int, context: RuleExecutionContext) -> RuleResult:
+        count = state
         triggered = count >= self.THRESHOLD
 
         return RuleResult(
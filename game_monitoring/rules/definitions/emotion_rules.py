@@ -4,14 +4,25 @@
 从原有的 PlayerBehaviorRuleEngine 迁移
 """
 
-from ..engine import Rule, RuleResult, RuleExecutionContext, RuleCategory, RulePriority
+from typing import Any, Dict, FrozenSet, Sequence, Tuple
 
+from ..engine import (
+    IncrementalRule,
+    Rule,
+    RuleResult,
+    RuleExecutionContext,
+    RuleCategory,
+    RulePriority,
+)
 
-class ConsecutiveFailuresRule(Rule):
+
+class ConsecutiveFailuresRule(IncrementalRule):
     """连续失败触发消极情绪"""
 
     FAILURE_ACTIONS = ['complete_dungeon', 'recruit_hero', 'lose_pvp']
     THRESHOLD = 2
+    # 状态中最多保留的失败动作名，避免长串失败时状态无限增长
+    MAX_TRACKED_FAILURES = 3
 
     @property
     def rule_id(self) -> str:
@@ -29,23 +40,44 @@ class ConsecutiveFailuresRule(Rule):
     def priority(self) -> RulePriority:
         return RulePriority.HIGH
 
-    def evaluate(self, context: RuleExecutionContext) -> RuleResult:
-        failures = []
-        count = 0
-
-        for action in reversed(context.recent_actions):
-            name = action.get('action', '')
-            params = action.get('params', {})
-
-            if name == 'lose_pvp':
-                count += 1
-                failures.insert(0, name)
-            elif name in self.FAILURE_ACTIONS and params.get('status') == 'fail':
-                count += 1
-                failures.insert(0, name)
-            else:
-                break
-
+    @property
+    def action_names(self) -> FrozenSet[str]:
+        # 从最新动作开始向前计数，最新动作不是失败类动作时必然不触发
+        return frozenset(self.FAILURE_ACTIONS)
+
+    def initial_state(self) -> Tuple[int, Tuple[str, ...]]:
+        return 0, ()
+
+    def update(
+        self, state: Tuple[int, Tuple[str, ...]], action: Dict[str, Any]
+    ) -> Tuple[int, Tuple[str, ...]]:
+        name = action.get('action', '')
+        params = action.get('params', {})
+
+        if name == 'lose_pvp' or (
+            name in self.FAILURE_ACTIONS and params.get('status') == 'fail'
+        ):
+            count, failures = state
+            return count + 1, (failures + (name,))[-self.MAX_TRACKED_FAILURES:]
+        return 0, ()
+
+    def evict(
+        self,
+        state: Tuple[int, Tuple[str, ...]],
+        action: Dict[str, Any],
+        actions: Sequence[Dict[str, Any]],
+    ) -> Tuple[int, Tuple[str, ...]]:
+        # 连续段不会超过保留序列长度
+        count, failures = state
+        if count <= len(actions):
+            return state
+        count = len(actions)
+        return count, failures[len(failures) - min(count, len(failures)):]
+
+    def evaluate_state(
+        self, state: Tuple[int, Tuple[str, ...]], context: RuleExecutionContext
+    ) -> RuleResult:
+        count, failures = state
         triggered = count >= self.THRESHOLD
 
         return RuleResult(
@@ -56,7 +88,7 @@ class ConsecutiveFailuresRule(Rule):
             category=self.category,
             confidence=min(count / 3.0, 1.0),
             priority=self.priority,
-            triggered_actions=failures
+            triggered_actions=list(failures)
         )
 
 
@@ -0,0 +1,165 @@
+"""
+旧版规则适配
+
+把 PlayerBehaviorRuleEngine 的 _check_* 方法接入新规则引擎，
+其中需要重扫窗口的连续被攻击检测改为增量规则实现。
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..engine import (
+    IncrementalRule,
+    Rule,
+    RuleResult,
+    RuleExecutionContext,
+    RuleCategory,
+    RulePriority,
+)
+from ...simulator.behavior_simulator import PlayerBehaviorRuleEngine
+
+
+LegacyCheck = Callable[[List[Dict[str, Any]]], str]
+
+
+class LegacyRuleAdapter(Rule):
+    """把旧版 _check_* 方法包装为无状态规则"""
+
+    def __init__(
+        self,
+        rule_id: str,
+        scenario_name: str,
+        check: LegacyCheck,
+        category: RuleCategory = RuleCategory.META,
+        priority: RulePriority = RulePriority.MEDIUM,
+        use_full_sequence: bool = False
+    ):
+        """
+        Args:
+            rule_id: 规则ID
+            scenario_name: 旧版场景名称
+            check: 旧版检查函数，返回非空字符串表示触发
+            category: 规则分类
+            priority: 规则优先级
+            use_full_sequence: 是否对完整动作序列而不是最近窗口执行检查
+        """
+        self._rule_id = rule_id
+        self._scenario_name = scenario_name
+        self._check = check
+        self._category = category
+        self._priority = priority
+        self._use_full_sequence = use_full_sequence
+
+    @property
+    def rule_id(self) -> str:
+        return self._rule_id
+
+    @property
+    def scenario_name(self) -> str:
+        return self._scenario_name
+
+    @property
+    def category(self) -> RuleCategory:
+        return self._category
+
+    @property
+    def priority(self) -> RulePriority:
+        return self._priority
+
+    def evaluate(self, context: RuleExecutionContext) -> RuleResult:
+        actions = list(context.actions if self._use_full_sequence else context.recent_actions)
+        reason = self._check(actions)
+        if not reason:
+            return RuleResult.not_triggered(self.rule_id, self.scenario_name)
+
+        return RuleResult(
+            rule_id=self.rule_id,
+            triggered=True,
+            scenario_name=self.scenario_name,
+            description=reason,
+            category=self.category,
+            priority=self.priority,
+            triggered_actions=[a.get('action', '') for a in actions]
+        )
+
+
+class ConsecutiveAttacksRule(IncrementalRule):
+    """连续被攻击消极行为（增量计数，替代 _check_consecutive_attacks 的窗口重扫）"""
+
+    ATTACK_ACTION = 'be_attacked'
+    THRESHOLD = 3
+
+    @property
+    def rule_id(self) -> str:
+        return "consecutive_attacks"
+
+    @property
+    def scenario_name(self) -> str:
+        return "连续被攻击消极行为"
+
+    @property
+    def category(self) -> RuleCategory:
+        return RuleCategory.EMOTION
+
+    @property
+    def priority(self) -> RulePriority:
+        return RulePriority.HIGH
+
+    @property
+    def action_names(self) -> frozenset:
+        return frozenset({self.ATTACK_ACTION})
+
+    def initial_state(self) -> int:
+        return 0
+
+    def update(self, state: int, action: Dict[str, Any]) -> int:
+        return state + 1 if action.get('action') == self.ATTACK_ACTION else 0
+
+    def evict(self, state: int, action: Dict[str, Any], actions: Sequence[Dict[str, Any]]) -> int:
+        # 连续段不会超过保留序列长度
+        return min(state, len(actions))
+
+    def evaluate_state(self, state: int, context: RuleExecutionContext) -> RuleResult:
+        if state < self.THRESHOLD:
+            return RuleResult.not_triggered(self.rule_id, self.scenario_name)
+
+        return RuleResult(
+            rule_id=self.rule_id,
+            triggered=True,
+            scenario_name=self.scenario_name,
+            description=f"连续被攻击{state}次",
+            category=self.category,
+            priority=self.priority,
+            triggered_actions=[self.ATTACK_ACTION] * min(state, self.THRESHOLD)
+        )
+
+
+def build_legacy_rules(engine: Optional[PlayerBehaviorRuleEngine] = None) -> List[Rule]:
+    """按旧版 analyze_action_sequence 的顺序构建规则列表"""
+    engine = engine or PlayerBehaviorRuleEngine()
+    negative = RuleCategory.EMOTION
+    high, low = RulePriority.HIGH, RulePriority.LOW
+
+    return [
+        LegacyRuleAdapter('legacy_consecutive_failures', '连续失败触发消极情绪',
+                          engine._check_consecutive_failures, negative, high),
+        LegacyRuleAdapter('legacy_social_withdrawal', '社交退出行为风险',
+                          engine._check_social_withdrawal_risk, negative, high),
+        ConsecutiveAttacksRule(),
+        LegacyRuleAdapter('legacy_support_contact', '客服求助流失风险',
+                          engine._check_support_contact_risk, RuleCategory.CHURN_RISK, high),
+        LegacyRuleAdapter('legacy_uninstall', '游戏卸载流失风险',
+                          engine._check_uninstall_risk, RuleCategory.CHURN_RISK, high),
+        LegacyRuleAdapter('legacy_payment', '充值行为积极表现',
+                          engine._check_payment_behavior, RuleCategory.ECONOMIC, low),
+        LegacyRuleAdapter('legacy_social_activity', '社交活跃表现',
+                          engine._check_social_activity, RuleCategory.SOCIAL, low),
+        LegacyRuleAdapter('legacy_achievement', '游戏成就积极表现',
+                          engine._check_achievement_behavior, RuleCategory.META, low),
+        LegacyRuleAdapter('legacy_abnormal_frequency', '异常高频操作',
+                          engine._check_abnormal_frequency, RuleCategory.BOT_DETECTION),
+        LegacyRuleAdapter('legacy_asset_disposal', '资产处理风险',
+                          engine._check_asset_disposal_risk, RuleCategory.CHURN_RISK, high),
+        LegacyRuleAdapter('legacy_stamina_exhaustion', '体力耗尽引导触发',
+                          engine._check_stamina_exhaustion_trigger, RuleCategory.COMBAT,
+                          RulePriority.CRITICAL, use_full_sequence=True),
+    ]
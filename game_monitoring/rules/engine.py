@@ -3,6 +3,7 @@
 
 包含:
 - Rule: 规则基类
+- IncrementalRule: 增量规则基类（按玩家维护状态）
 - RuleExecutionContext: 执行上下文
 - RuleResult: 执行结果
 - RuleRegistry: 规则注册中心
@@ -10,7 +11,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Callable, Set
+from typing import List, Dict, Any, Optional, Callable, Sequence, Set, FrozenSet, Tuple
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from datetime import datetime
@@ -128,6 +129,16 @@ class Rule(ABC):
     def description(self) -> str:
         return f"检测场景: {self.scenario_name}"
 
+    @property
+    def action_names(self) -> Optional[FrozenSet[str]]:
+        """
+        规则关心的动作名集合
+
+        声明后表示只有最新动作属于该集合时规则才可能触发，
+        执行计划会据此跳过无关事件；返回 None 表示对所有动作都要评估。
+        """
+        return None
+
     @abstractmethod
     def evaluate(self, context: RuleExecutionContext) -> RuleResult:
         pass
@@ -136,43 +147,168 @@ class Rule(ABC):
         return False
 
 
+class IncrementalRule(Rule):
+    """
+    增量规则基类
+
+    为每个玩家维护一份小状态（计数器、最近标记等），
+    新动作到来时通过 update 以 O(1) 更新，评估时只读状态而不重扫窗口。
+    没有状态可用时（例如无状态调用 evaluate），回退为对完整动作序列折叠一遍。
+    """
+
+    @abstractmethod
+    def initial_state(self) -> Any:
+        """返回玩家的初始状态"""
+        pass
+
+    @abstractmethod
+    def update(self, state: Any, action: Dict[str, Any]) -> Any:
+        """根据新动作返回更新后的状态"""
+        pass
+
+    @abstractmethod
+    def evaluate_state(self, state: Any, context: RuleExecutionContext) -> RuleResult:
+        """基于当前状态给出评估结果"""
+        pass
+
+    def evict(self, state: Any, action: Dict[str, Any], actions: Sequence[Dict[str, Any]]) -> Any:
+        """
+        最旧的动作移出保留序列时更新状态
+
+        actions 为移出后（已包含新动作）的保留序列。默认对保留序列重新折叠，
+        能以 O(1) 撤销的规则应覆盖此方法。
+        """
+        return self.fold(actions)
+
+    def fold(self, actions: List[Dict[str, Any]]) -> Any:
+        state = self.initial_state()
+        for action in actions:
+            state = self.update(state, action)
+        return state
+
+    def evaluate(self, context: RuleExecutionContext) -> RuleResult:
+        return self.evaluate_state(self.fold(context.actions), context)
+
+
+
+@dataclass(frozen=True)
+class _ExecutionPlan:
+    """编译后的执行计划：已按优先级排好序的启用规则及按动作名的索引"""
+    ordered: Tuple[Rule, ...]
+    wildcard: Tuple[Rule, ...]
+    by_action: Dict[str, Tuple[Rule, ...]]
+    incremental: Tuple[IncrementalRule, ...] = ()
+
+    def rules_for(self, action_name: Optional[str]) -> Tuple[Rule, ...]:
+        if action_name is None:
+            return self.ordered
+        return self.by_action.get(action_name, self.wildcard)
+
+
 class RuleRegistry:
     """规则注册中心"""
 
     def __init__(self):
         self._rules: Dict[str, Rule] = {}
         self._disabled: Set[str] = set()
+        self._plan: Optional[_ExecutionPlan] = None
 
     def register(self, rule: Rule) -> 'RuleRegistry':
         self._rules[rule.rule_id] = rule
+        self._plan = None
         return self
 
+    def unregister(self, rule_id: str) -> Optional[Rule]:
+        rule = self._rules.pop(rule_id, None)
+        self._disabled.discard(rule_id)
+        self._plan = None
+        return rule
+
+    def disable(self, rule_id: str) -> None:
+        self._disabled.add(rule_id)
+        self._plan = None
+
+    def enable(self, rule_id: str) -> None:
+        self._disabled.discard(rule_id)
+        self._plan = None
+
+    def is_enabled(self, rule_id: str) -> bool:
+        return rule_id in self._rules and rule_id not in self._disabled
+
     def get(self, rule_id: str) -> Optional[Rule]:
         return self._rules.get(rule_id)
 
     def get_all(self) -> List[Rule]:
         return list(self._rules.values())
 
+    @property
+    def plan(self) -> _ExecutionPlan:
+        """当前执行计划，仅在注册、注销或启停规则后重新编译"""
+        if self._plan is None:
+            self._plan = self._compile()
+        return self._plan
+
     def get_applicable(self, context: RuleExecutionContext) -> List[Rule]:
-        applicable = []
-        for rule in self._rules.values():
-            if rule.rule_id in self._disabled:
-                continue
-            if not rule.should_skip(context):
-                applicable.append(rule)
-        return sorted(applicable, key=lambda r: r.priority.value)
-
-    def execute_all(self, context: RuleExecutionContext) -> List[RuleResult]:
+        candidates = self.plan.rules_for(self._latest_action_name(context))
+        return [rule for rule in candidates if not rule.should_skip(context)]
+
+    def execute_all(
+        self,
+        context: RuleExecutionContext,
+        states: Optional[Dict[str, Any]] = None
+    ) -> List[RuleResult]:
+        """
+        执行适用规则
+
+        Args:
+            context: 执行上下文
+            states: 增量规则的玩家状态（rule_id -> state），提供时增量规则直接基于状态评估
+        """
         results = []
         for rule in self.get_applicable(context):
             try:
-                result = rule.evaluate(context)
+                if states is not None and rule.rule_id in states:
+                    result = rule.evaluate_state(states[rule.rule_id], context)
+                else:
+                    result = rule.evaluate(context)
                 if result.triggered:
                     results.append(result)
             except Exception as e:
                 logger.error(f"规则 {rule.rule_id} 执行失败: {e}")
         return results
 
+    def _compile(self) -> _ExecutionPlan:
+        ordered = tuple(sorted(
+            (rule for rule in self._rules.values() if rule.rule_id not in self._disabled),
+            key=lambda r: r.priority.value
+        ))
+        declared = [(rule, rule.action_names) for rule in ordered]
+
+        wildcard = tuple(rule for rule, names in declared if names is None)
+        indexed_names = set()
+        for _, names in declared:
+            if names is not None:
+                indexed_names.update(names)
+
+        # 每个动作名的桶都保持全局优先级顺序，通配规则出现在所有桶中
+        by_action = {
+            name: tuple(rule for rule, names in declared if names is None or name in names)
+            for name in indexed_names
+        }
+        incremental = tuple(rule for rule in ordered if isinstance(rule, IncrementalRule))
+        return _ExecutionPlan(
+            ordered=ordered,
+            wildcard=wildcard,
+            by_action=by_action,
+            incremental=incremental
+        )
+
+    @staticmethod
+    def _latest_action_name(context: RuleExecutionContext) -> Optional[str]:
+        if not context.recent_actions:
+            return None
+        return context.recent_actions[-1].get('action', '')
+
 
 class RuleEngine:
     """规则引擎"""
@@ -180,6 +316,8 @@ class RuleEngine:
     def __init__(self, registry: RuleRegistry = None, window_size: int = 3):
         self._registry = registry or RuleRegistry()
         self._window_size = window_size
+        # 玩家ID -> (建立状态时的执行计划, rule_id -> 增量规则状态)
+        self._player_states: Dict[str, Tuple[_ExecutionPlan, Dict[str, Any]]] = {}
 
     @property
     def registry(self) -> RuleRegistry:
@@ -202,6 +340,74 @@ class RuleEngine:
 
         return self._registry.execute_all(context)
 
+    def process_action(
+        self,
+        player_id: str,
+        action: Dict[str, Any],
+        actions: List[Dict[str, Any]],
+        player_state: Dict = None,
+        window_size: Optional[int] = None,
+        evicted: Optional[Dict[str, Any]] = None
+    ) -> List[RuleResult]:
+        """
+        流式处理一条新动作
+
+        先以 O(1) 更新所有启用的增量规则状态（即使本次执行计划不评估该规则），
+        再按执行计划评估规则；增量规则直接读取状态，其余规则按窗口完整评估。
+        保留序列已满时，被挤出的动作通过 evicted 传入，增量规则据此撤销，
+        保证状态始终只反映保留序列（与完整重新评估一致）。
+
+        Args:
+            player_id: 玩家ID
+            action: 新到达的动作
+            actions: 追加该动作后的玩家动作序列，用于首次建立状态和无状态规则
+            player_state: 玩家状态
+            window_size: 最近动作窗口大小，默认使用引擎配置
+            evicted: 因本次追加而移出保留序列的最旧动作
+        """
+        states = self._states_for(player_id, self._registry.plan)
+        for rule in self._registry.plan.incremental:
+            if rule.rule_id in states:
+                state = rule.update(states[rule.rule_id], action)
+                if evicted is not None:
+                    state = rule.evict(state, evicted, actions)
+                states[rule.rule_id] = state
+            else:
+                # 新玩家或新启用、重新启用的规则：从已保留的序列重建状态（已包含本次动作）
+                states[rule.rule_id] = rule.fold(actions)
+
+        size = window_size or self._window_size
+        context = RuleExecutionContext(
+            player_id=player_id,
+            actions=actions,
+            recent_actions=actions[-size:],
+            player_state=player_state
+        )
+        return self._registry.execute_all(context, states)
+
+    def _states_for(self, player_id: str, plan: _ExecutionPlan) -> Dict[str, Any]:
+        """
+        玩家在当前执行计划下的增量状态
+
+        计划变化（注册、注销、启停规则）后只保留两份计划中同一规则实例的状态；
+        停用期间没有更新的状态随之丢弃，规则重新启用时从序列重建。
+        """
+        entry = self._player_states.get(player_id)
+        if entry is not None and entry[0] is plan:
+            return entry[1]
+        states: Dict[str, Any] = {}
+        if entry is not None:
+            previous_plan, previous = entry
+            for rule in plan.incremental:
+                if rule.rule_id in previous and any(rule is old for old in previous_plan.incremental):
+                    states[rule.rule_id] = previous[rule.rule_id]
+        self._player_states[player_id] = (plan, states)
+        return states
+
+    def reset_player(self, player_id: str) -> None:
+        """丢弃玩家的增量规则状态（例如清空动作序列后）"""
+        self._player_states.pop(player_id, None)
+
     def get_emotion_from_results(self, results: List[RuleResult]) -> str:
         """从规则结果判断情绪"""
         for result in results:
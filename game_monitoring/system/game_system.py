@@ -7,8 +7,10 @@ try:
 except ModuleNotFoundError:
     custom_model_client = None
 
+from ..application.services.intervention_scheduler import InterventionScheduler
 from ..core.bootstrap import bootstrap_application
 from ..core.context import GameContext
+from ..infrastructure.monitoring.tracer import subscribe_console
 from ..simulator import PlayerBehaviorSimulator
 from ..team import GameMonitoringTeamV2
 from ..ui import GameMonitoringConsole
@@ -18,6 +20,8 @@ class GamePlayerMonitoringSystem:
     """游戏玩家监控系统主协调器"""
     
     def __init__(self, model_client=None):
+        # 命令行模式把追踪事件输出到终端（TRACE_LEVEL 环境变量控制级别）
+        subscribe_console()
         self.model_client = model_client or custom_model_client
         self.simulator = PlayerBehaviorSimulator()
         self.container = bootstrap_application(custom_model_client=self.model_client)
@@ -25,6 +29,9 @@ class GamePlayerMonitoringSystem:
         self.monitor = self.context.monitor
         self.player_state_manager = self.context.player_state_manager
         self.team = self.container.resolve(GameMonitoringTeamV2)
+
+        # 干预调度器：检测循环只提交任务，不等待分析完成
+        self.scheduler = InterventionScheduler(self.trigger_analysis_and_intervention)
         
         # 创建UI控制台
         self.ui = GameMonitoringConsole()
@@ -43,6 +50,14 @@ class GamePlayerMonitoringSystem:
         return result
         # 计数器重置现在在streamlit_dashboard.py中处理
 
+    async def schedule_intervention(self, player_id: str):
+        """把干预交给调度器按优先级执行，背压时等待队列回落"""
+        if self.scheduler.saturated:
+            await self.scheduler.wait_for_capacity()
+        return self.scheduler.submit(
+            player_id, self.monitor.get_triggered_scenarios(player_id)
+        )
+
     async def simulate_monitoring_session(self, duration_seconds: int = 60, mode: str = "random", dataset_type: str = "mixed"):
         """
         模拟监控会话
@@ -66,7 +81,7 @@ class GamePlayerMonitoringSystem:
                 
                 # 将生成的行为数据保存到monitor中
                 if self.monitor.add_behavior(behavior):
-                    await self.trigger_analysis_and_intervention(player_id)
+                    await self.schedule_intervention(player_id)
                     if hasattr(self.monitor, "reset_negative_count"):
                         self.monitor.reset_negative_count(player_id)
                     # 计数器重置现在在streamlit_dashboard.py中处理
@@ -91,7 +106,7 @@ class GamePlayerMonitoringSystem:
                     
                     # 将行为数据保存到monitor中
                     if self.monitor.add_behavior(behavior):
-                        await self.trigger_analysis_and_intervention(player_id)
+                        await self.schedule_intervention(player_id)
                         if hasattr(self.monitor, "reset_negative_count"):
                             self.monitor.reset_negative_count(player_id)
                         # 计数器重置现在在streamlit_dashboard.py中处理
@@ -115,4 +130,5 @@ class GamePlayerMonitoringSystem:
             print(f"❌ 不支持的模式: {mode}，请使用: {', '.join(supported_modes)}")
             return
         
+        await self.scheduler.drain()
         self.ui.print_session_end()
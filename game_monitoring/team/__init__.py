@@ -1,6 +1,13 @@
 # Team module for game monitoring system
+from .event_coalescer import CoalescerStats, PlayerEventCoalescer
 from .team_manager import GameMonitoringTeamV2
+from .worker_hosting import RemoteWorkerProxy, WorkerDeployment, WorkerHostError
 
 __all__ = [
-    'GameMonitoringTeamV2'
+    'CoalescerStats',
+    'GameMonitoringTeamV2',
+    'PlayerEventCoalescer',
+    'RemoteWorkerProxy',
+    'WorkerDeployment',
+    'WorkerHostError',
 ]
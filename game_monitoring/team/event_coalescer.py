@@ -0,0 +1,165 @@
+"""
+玩家事件合并与防抖
+
+玩家在几秒内多次越过阈值时，每次触发都会构造一个新会话的 PlayerEvent，
+导致同一玩家被重复完整分析。PlayerEventCoalescer 位于 Orchestrator 之前:
+- 每个玩家一个防抖窗口，窗口内的触发合并为一个事件，情景取并集，行为历史取最新
+- 与正在处理中的事件内容完全相同的触发直接复用其结果，不再重复派发
+- 同一窗口内的所有调用方拿到同一个分析结果
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..domain.messages import PlayerEvent
+from ..infrastructure.cache import fingerprint
+
+Dispatch = Callable[[PlayerEvent], Awaitable[Any]]
+
+
+@dataclass
+class CoalescerStats:
+    """合并统计"""
+    submitted: int = 0
+    dispatched: int = 0
+    merged: int = 0
+    deduplicated: int = 0
+
+
+@dataclass
+class _PendingEvent:
+    event: PlayerEvent
+    future: asyncio.Future
+    handle: Optional[asyncio.TimerHandle] = None
+
+
+def _scenario_key(scenario: Dict[str, Any]) -> str:
+    name = scenario.get("scenario") or scenario.get("scenario_name")
+    return str(name) if name else fingerprint(scenario)
+
+
+def merge_scenarios(
+    current: List[Dict[str, Any]], incoming: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """情景并集：按情景名去重，保留首次出现的顺序，同名情景使用较新的内容"""
+    merged = {_scenario_key(scenario): scenario for scenario in current}
+    for scenario in incoming:
+        merged[_scenario_key(scenario)] = scenario
+    return list(merged.values())
+
+
+def event_fingerprint(event: PlayerEvent) -> str:
+    """事件内容指纹，不包含会话ID"""
+    return fingerprint(
+        {
+            "player_id": event.player_id,
+            "triggered_scenarios": event.triggered_scenarios,
+            "behavior_history": event.behavior_history,
+        }
+    )
+
+
+class PlayerEventCoalescer:
+    """
+    按玩家合并、防抖 PlayerEvent
+
+    使用示例:
+    ```python
+    coalescer = PlayerEventCoalescer(
+        lambda event: runtime.send_message(event, orchestrator_id),
+        debounce_seconds=0.5,
+    )
+    result = await coalescer.submit(event)
+    ```
+    """
+
+    def __init__(self, dispatch: Dispatch, debounce_seconds: float = 0.5):
+        """
+        Args:
+            dispatch: 实际派发合并后事件的协程函数
+            debounce_seconds: 防抖窗口（秒），从玩家第一次待处理触发开始计时
+        """
+        if debounce_seconds < 0:
+            raise ValueError("debounce_seconds must not be negative")
+        self._dispatch = dispatch
+        self._debounce = debounce_seconds
+        self._pending: Dict[str, _PendingEvent] = {}
+        self._in_flight: Dict[str, Tuple[str, asyncio.Future]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.stats = CoalescerStats()
+
+    @property
+    def debounce_seconds(self) -> float:
+        return self._debounce
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def submit(self, event: PlayerEvent) -> Any:
+        """提交事件，返回合并后事件的分析结果"""
+        self.stats.submitted += 1
+        future = self._enqueue(event)
+        # 单个调用方取消不影响共享同一结果的其他调用方
+        return await asyncio.shield(future)
+
+    async def flush(self) -> None:
+        """立即派发所有待处理事件，并等待处理中的事件完成"""
+        for player_id in list(self._pending):
+            self._flush_player(player_id)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _enqueue(self, event: PlayerEvent) -> asyncio.Future:
+        player_id = event.player_id
+        pending = self._pending.get(player_id)
+        if pending is not None:
+            pending.event = replace(
+                pending.event,
+                triggered_scenarios=merge_scenarios(
+                    pending.event.triggered_scenarios, event.triggered_scenarios
+                ),
+                behavior_history=event.behavior_history,
+            )
+            self.stats.merged += 1
+            return pending.future
+
+        in_flight = self._in_flight.get(player_id)
+        if in_flight is not None and in_flight[0] == event_fingerprint(event):
+            self.stats.deduplicated += 1
+            return in_flight[1]
+
+        loop = asyncio.get_running_loop()
+        pending = _PendingEvent(event=event, future=loop.create_future())
+        pending.handle = loop.call_later(self._debounce, self._flush_player, player_id)
+        self._pending[player_id] = pending
+        return pending.future
+
+    def _flush_player(self, player_id: str) -> None:
+        pending = self._pending.pop(player_id, None)
+        if pending is None:
+            return
+        if pending.handle is not None:
+            pending.handle.cancel()
+
+        self._in_flight[player_id] = (event_fingerprint(pending.event), pending.future)
+        task = asyncio.get_running_loop().create_task(self._run(player_id, pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, player_id: str, pending: _PendingEvent) -> None:
+        self.stats.dispatched += 1
+        try:
+            result = await self._dispatch(pending.event)
+        except Exception as e:
+            if not pending.future.done():
+                pending.future.set_exception(e)
+        else:
+            if not pending.future.done():
+                pending.future.set_result(result)
+        finally:
+            in_flight = self._in_flight.get(player_id)
+            if in_flight is not None and in_flight[1] is pending.future:
+                del self._in_flight[player_id]
@@ -6,28 +6,53 @@ from typing import Any
 
 from autogen_core import AgentId, SingleThreadedAgentRuntime
 
-from ..agents.behavior_worker import BehaviorWorker
-from ..agents.churn_worker import ChurnWorker
-from ..agents.emotion_worker import EmotionWorker
-from ..agents.orchestrator import OrchestratorAgent
-from ..domain.messages import PlayerEvent
+from ..agents.orchestrator import OrchestratorAgent, WorkerCallPolicy
+from ..domain.messages import PlayerEvent, PlayerEventBatch
+from .event_coalescer import PlayerEventCoalescer
+from .worker_hosting import WORKER_CLASSES, WorkerDeployment
 
 
 class GameMonitoringTeamV2:
     """新版团队管理器，使用 Orchestrator-Worker 架构。"""
 
-    def __init__(self, model_client: Any, runtime: Any):
+    def __init__(
+        self,
+        model_client: Any,
+        runtime: Any,
+        debounce_seconds: float = 0.0,
+        worker_deployment: WorkerDeployment | None = None,
+        worker_policies: dict[str, WorkerCallPolicy] | None = None,
+        default_worker_policy: WorkerCallPolicy | None = None,
+    ):
+        """
+        Args:
+            model_client: 模型客户端
+            runtime: AutoGen Core runtime
+            debounce_seconds: 单玩家事件防抖窗口（秒），大于 0 时合并窗口内的重复触发
+            worker_deployment: 分布式部署配置，其中的 Worker 类型运行在独立进程中，
+                其余 Worker 仍注册在本地 runtime
+            worker_policies: 按 worker 类型设置的超时/对冲策略
+            default_worker_policy: 其余 worker 的调用策略
+        """
         self.model_client = model_client
         self.runtime = runtime
         self.orchestrator_id = AgentId("orchestrator", "default")
         self._worker_types = ["emotion_worker", "churn_worker", "behavior_worker"]
         self._runtime_initialized = False
         self._runtime_lock = asyncio.Lock()
+        self.worker_deployment = worker_deployment
+        self.worker_policies = worker_policies
+        self.default_worker_policy = default_worker_policy
+        self.coalescer: PlayerEventCoalescer | None = (
+            PlayerEventCoalescer(self._dispatch_event, debounce_seconds)
+            if debounce_seconds > 0
+            else None
+        )
 
     async def trigger_analysis_and_intervention(
         self, player_id: str, monitor: Any
     ) -> Any:
-        """构造 PlayerEvent 并发送到 Orchestrator。"""
+        """构造 PlayerEvent 并发送到 Orchestrator，开启防抖时先经过合并层。"""
         await self._ensure_runtime_ready()
         event = PlayerEvent(
             player_id=player_id,
@@ -36,16 +61,46 @@ class GameMonitoringTeamV2:
             session_id=self._generate_session_id(player_id),
         )
 
+        if self.coalescer is not None:
+            return await self.coalescer.submit(event)
+        return await self._dispatch_event(event)
+
+    async def _dispatch_event(self, event: PlayerEvent) -> Any:
         return await self.runtime.send_message(event, self.orchestrator_id)
 
+    async def trigger_batch_analysis_and_intervention(
+        self, player_ids: list[str], monitor: Any
+    ) -> list[Any]:
+        """把多个玩家打包成一个 PlayerEventBatch，一次发送到 Orchestrator。"""
+        await self._ensure_runtime_ready()
+        batch = PlayerEventBatch(
+            batch_id=uuid.uuid4().hex,
+            events=[
+                PlayerEvent(
+                    player_id=player_id,
+                    triggered_scenarios=self._get_triggered_scenarios(monitor, player_id),
+                    behavior_history=self._get_behavior_history(monitor, player_id),
+                    session_id=self._generate_session_id(player_id),
+                )
+                for player_id in player_ids
+            ],
+        )
+
+        return await self.runtime.send_message(batch, self.orchestrator_id)
+
     async def close(self) -> None:
-        """关闭 runtime。"""
+        """派发剩余的待合并事件并关闭 runtime。"""
+        if self.coalescer is not None:
+            await self.coalescer.flush()
         if (
             isinstance(self.runtime, SingleThreadedAgentRuntime)
             and self._runtime_initialized
         ):
             await self.runtime.stop()
             self._runtime_initialized = False
+        if self.worker_deployment is not None:
+            # 关闭时逐个 join Worker 进程（每个最多等待数秒），放到线程中避免阻塞事件循环
+            await asyncio.to_thread(self.worker_deployment.close)
 
     def _generate_session_id(self, player_id: str) -> str:
         """生成 session ID。"""
@@ -69,23 +124,26 @@ class GameMonitoringTeamV2:
                 lambda: OrchestratorAgent(
                     model_client=self.model_client,
                     worker_types=self._worker_types,
+                    worker_policies=self.worker_policies,
+                    default_policy=self.default_worker_policy,
                 ),
             )
-            await EmotionWorker.register(
-                self.runtime,
-                "emotion_worker",
-                lambda: EmotionWorker(model_client=self.model_client, tools=[]),
-            )
-            await ChurnWorker.register(
-                self.runtime,
-                "churn_worker",
-                lambda: ChurnWorker(model_client=self.model_client, tools=[]),
-            )
-            await BehaviorWorker.register(
-                self.runtime,
-                "behavior_worker",
-                lambda: BehaviorWorker(model_client=self.model_client, tools=[]),
-            )
+            remote_types: set[str] = set()
+            if self.worker_deployment is not None:
+                await self.worker_deployment.register_proxies(self.runtime)
+                remote_types = set(self.worker_deployment.instances)
+
+            for worker_type in self._worker_types:
+                if worker_type in remote_types:
+                    continue
+                worker_class = WORKER_CLASSES[worker_type]
+                await worker_class.register(
+                    self.runtime,
+                    worker_type,
+                    lambda worker_class=worker_class: worker_class(
+                        model_client=self.model_client, tools=[]
+                    ),
+                )
             self.runtime.start()
             self._runtime_initialized = True
 
@@ -98,7 +156,7 @@ class GameMonitoringTeamV2:
             except TypeError:
                 return getter()
         if hasattr(monitor, "get_recent_actions_for_analysis"):
-            return monitor.get_recent_actions_for_analysis(player_id)
+            return [dict(action) for action in monitor.get_recent_actions_for_analysis(player_id)]
         return []
 
     @staticmethod
@@ -106,7 +164,8 @@ class GameMonitoringTeamV2:
         if hasattr(monitor, "get_behavior_history"):
             return monitor.get_behavior_history(player_id)
         if hasattr(monitor, "get_player_action_sequence"):
-            return monitor.get_player_action_sequence(player_id)
+            # 动作序列是环形缓冲区上的紧凑记录视图，事件需要持有字典快照
+            return [dict(action) for action in monitor.get_player_action_sequence(player_id)]
         if hasattr(monitor, "get_player_history"):
             return monitor.get_player_history(player_id)
         return []
@@ -0,0 +1,309 @@
+"""
+多进程 Worker 托管
+
+默认部署把 Orchestrator 和三个 Worker 注册在同一个 SingleThreadedAgentRuntime 上，
+全部分析共享一个事件循环。分布式部署模式下:
+- 每个 Worker 实例运行在独立进程中，进程内有自己的 SingleThreadedAgentRuntime
+- 主进程与 Worker 进程之间通过本地管道（multiprocessing.Pipe）传递消息
+- 主进程为每种 Worker 注册一个 RemoteWorkerProxy，按未完成请求数在该类型的实例间负载均衡
+- Orchestrator 无需改动，仍按 AgentId(f"{task_type}_worker") 发送任务
+
+使用示例:
+```python
+deployment = WorkerDeployment({"emotion_worker": 2, "churn_worker": 1, "behavior_worker": 1})
+team = GameMonitoringTeamV2(model_client, SingleThreadedAgentRuntime(), worker_deployment=deployment)
+...
+await team.close()  # 同时停止 Worker 进程
+```
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import multiprocessing
+import threading
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from autogen_core import AgentId, MessageContext, RoutedAgent, SingleThreadedAgentRuntime, rpc
+
+from ..agents.behavior_worker import BehaviorWorker
+from ..agents.churn_worker import ChurnWorker
+from ..agents.emotion_worker import EmotionWorker
+from ..domain.messages import (
+    InterventionTask,
+    InterventionTaskBatch,
+    WorkerResponse,
+    WorkerResponseBatch,
+)
+
+ModelClientFactory = Callable[[], Any]
+
+WORKER_CLASSES: Dict[str, type] = {
+    "emotion_worker": EmotionWorker,
+    "churn_worker": ChurnWorker,
+    "behavior_worker": BehaviorWorker,
+}
+
+_STOP = ("stop", None, None)
+
+
+# ---- Worker 进程侧 ----
+
+def _host_main(
+    conn: Any,
+    worker_type: str,
+    model_client_factory: Optional[ModelClientFactory],
+) -> None:
+    asyncio.run(_serve(conn, worker_type, model_client_factory))
+
+
+async def _serve(
+    conn: Any,
+    worker_type: str,
+    model_client_factory: Optional[ModelClientFactory],
+) -> None:
+    worker_class = WORKER_CLASSES[worker_type]
+    model_client = model_client_factory() if model_client_factory else None
+    runtime = SingleThreadedAgentRuntime()
+    await worker_class.register(
+        runtime,
+        worker_type,
+        lambda: worker_class(model_client=model_client, tools=[]),
+    )
+    runtime.start()
+    recipient = AgentId(worker_type, "default")
+    loop = asyncio.get_running_loop()
+    in_flight: set[asyncio.Task] = set()
+
+    async def handle(request_id: int, message: Any) -> None:
+        try:
+            result = await runtime.send_message(message, recipient)
+        except Exception as e:
+            conn.send(("error", request_id, f"{type(e).__name__}: {e}"))
+        else:
+            conn.send(("ok", request_id, result))
+
+    try:
+        while True:
+            try:
+                kind, request_id, message = await loop.run_in_executor(None, conn.recv)
+            except (EOFError, OSError):
+                break
+            if kind == "stop":
+                break
+            task = loop.create_task(handle(request_id, message))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+    finally:
+        await runtime.stop()
+        conn.close()
+
+
+# ---- 主进程侧 ----
+
+class WorkerHostError(RuntimeError):
+    """远程 Worker 处理失败或进程不可用"""
+
+
+class WorkerHostClient:
+    """单个 Worker 进程的客户端，支持多个并发请求"""
+
+    def __init__(
+        self,
+        worker_type: str,
+        model_client_factory: Optional[ModelClientFactory] = None,
+        mp_context: Any = None,
+    ):
+        if worker_type not in WORKER_CLASSES:
+            raise ValueError(f"unknown worker type: {worker_type}")
+        self.worker_type = worker_type
+        context = mp_context or multiprocessing.get_context()
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_host_main,
+            args=(child_conn, worker_type, model_client_factory),
+            daemon=True,
+        )
+        self._process.start()
+        # 子进程持有另一端，主进程关闭副本后才能在子进程退出时收到 EOF
+        child_conn.close()
+
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._pending_lock = threading.Lock()
+        self._request_ids = itertools.count()
+        self.requests = 0
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    @property
+    def outstanding(self) -> int:
+        return len(self._pending)
+
+    @property
+    def alive(self) -> bool:
+        return self._process.is_alive()
+
+    async def call(self, message: Any) -> Any:
+        """把消息发送到 Worker 进程并等待响应"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        request_id = next(self._request_ids)
+        with self._pending_lock:
+            self._pending[request_id] = (loop, future)
+        try:
+            with self._send_lock:
+                self._conn.send(("call", request_id, message))
+        except (OSError, ValueError) as e:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            raise WorkerHostError(f"{self.worker_type} host is unavailable") from e
+        self.requests += 1
+        return await future
+
+    def close(self, timeout: float = 5.0) -> None:
+        """通知 Worker 进程退出，超时后强制终止"""
+        try:
+            with self._send_lock:
+                self._conn.send(_STOP)
+        except (OSError, ValueError):
+            pass
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._conn.close()
+        self._reader.join(timeout)
+
+    def _read_loop(self) -> None:
+        while True:
+            try:
+                status, request_id, payload = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._pending_lock:
+                entry = self._pending.pop(request_id, None)
+            if entry is None:
+                continue
+            loop, future = entry
+            if status == "ok":
+                loop.call_soon_threadsafe(_resolve, future, payload, None)
+            else:
+                loop.call_soon_threadsafe(_resolve, future, None, WorkerHostError(payload))
+
+        # 进程退出：未完成的请求全部失败
+        with self._pending_lock:
+            pending, self._pending = list(self._pending.values()), {}
+        for loop, future in pending:
+            error = WorkerHostError(f"{self.worker_type} host exited")
+            loop.call_soon_threadsafe(_resolve, future, None, error)
+
+
+def _resolve(future: asyncio.Future, result: Any, error: Optional[BaseException]) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class WorkerPool:
+    """同一类型的多个 Worker 进程，选择未完成请求最少的实例，持平时轮询"""
+
+    def __init__(self, clients: List[WorkerHostClient]):
+        if not clients:
+            raise ValueError("a worker pool needs at least one host")
+        self.clients = clients
+        self._rotation = itertools.count()
+
+    def pick(self) -> WorkerHostClient:
+        offset = next(self._rotation)
+        size = len(self.clients)
+        candidates = [self.clients[(offset + i) % size] for i in range(size)]
+        alive = [client for client in candidates if client.alive] or candidates
+        return min(alive, key=lambda client: client.outstanding)
+
+    async def call(self, message: Any) -> Any:
+        return await self.pick().call(message)
+
+    def close(self) -> None:
+        for client in self.clients:
+            client.close()
+
+
+class RemoteWorkerProxy(RoutedAgent):
+    """注册在主 runtime 中的 Worker 代理，把任务转发到 Worker 进程"""
+
+    def __init__(self, pool: WorkerPool) -> None:
+        super().__init__(f"Remote {pool.clients[0].worker_type} pool")
+        self._pool = pool
+
+    @rpc
+    async def handle_intervention_task(
+        self, message: InterventionTask, ctx: MessageContext
+    ) -> WorkerResponse:
+        return await self._pool.call(message)
+
+    @rpc
+    async def handle_intervention_task_batch(
+        self, message: InterventionTaskBatch, ctx: MessageContext
+    ) -> WorkerResponseBatch:
+        return await self._pool.call(message)
+
+
+class WorkerDeployment:
+    """分布式部署配置：每种 Worker 的进程数"""
+
+    def __init__(
+        self,
+        instances: Mapping[str, int],
+        model_client_factory: Optional[ModelClientFactory] = None,
+        mp_context: Any = None,
+    ):
+        """
+        Args:
+            instances: Worker 类型 -> 进程数，例如 {"emotion_worker": 2}
+            model_client_factory: Worker 进程内创建模型客户端的可序列化工厂
+            mp_context: multiprocessing 上下文，默认使用平台默认启动方式
+        """
+        for worker_type, count in instances.items():
+            if worker_type not in WORKER_CLASSES:
+                raise ValueError(f"unknown worker type: {worker_type}")
+            if count <= 0:
+                raise ValueError(f"{worker_type} needs at least one instance")
+        self.instances = dict(instances)
+        self._model_client_factory = model_client_factory
+        self._mp_context = mp_context
+        self.pools: Dict[str, WorkerPool] = {}
+
+    def start(self) -> Dict[str, WorkerPool]:
+        """启动所有 Worker 进程"""
+        if not self.pools:
+            self.pools = {
+                worker_type: WorkerPool(
+                    [
+                        WorkerHostClient(worker_type, self._model_client_factory, self._mp_context)
+                        for _ in range(count)
+                    ]
+                )
+                for worker_type, count in self.instances.items()
+            }
+        return self.pools
+
+    async def register_proxies(self, runtime: Any) -> None:
+        """启动进程并在主 runtime 中注册代理"""
+        for worker_type, pool in self.start().items():
+            await RemoteWorkerProxy.register(
+                runtime,
+                worker_type,
+                lambda pool=pool: RemoteWorkerProxy(pool),
+            )
+
+    def close(self) -> None:
+        for pool in self.pools.values():
+            pool.close()
+        self.pools = {}
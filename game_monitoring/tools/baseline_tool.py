@@ -1,6 +1,8 @@
 from typing import Dict, Any, List
 import json # 确保导入json，以便处理可能的序列化
 
+from ..infrastructure.monitoring.tracer import get_tracer
+
 def get_historical_baseline_with_deps(player_id: str) -> Dict[str, Any]:
     """
     获取指定玩家的综合状态信息（从context.py获取真实实例）
@@ -19,7 +21,7 @@ def get_historical_baseline_with_deps(player_id: str) -> Dict[str, Any]:
 
     # 使用卫语句模式，在函数入口处检查依赖，确保代码健壮性
     if not is_context_initialized():
-        print("⚠️ 全局上下文未初始化，无法获取玩家基线数据。")
+        get_tracer().warning("tool.baseline.no_context", "⚠️ 全局上下文未初始化，无法获取玩家基线数据。")
         return {"error": "Context not initialized", "player_id": player_id}
 
     # 从context获取真实实例
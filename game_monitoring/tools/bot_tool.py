@@ -2,6 +2,8 @@ import json
 from typing import List
 from datetime import datetime
 
+from ..infrastructure.monitoring.tracer import get_tracer
+
 def detect_bot_with_deps(player_id: str) -> str:
     """检测玩家机器人行为（带依赖版本）"""
     from .runtime_access import (
@@ -10,23 +12,24 @@ def detect_bot_with_deps(player_id: str) -> str:
         is_context_initialized,
     )
     
-    print(f"🤖 正在检测玩家 {player_id} 的机器人行为...")
+    tracer = get_tracer()
+    tracer.info("tool.bot.start", "🤖 正在检测玩家 {player_id} 的机器人行为...", player_id=player_id)
     
     monitor = get_monitor()
     player_state_manager = get_player_state_manager()
     
     if not is_context_initialized():
-        print("⚠️ 全局上下文未初始化，使用模拟数据")
+        tracer.warning("tool.bot.no_context", "⚠️ 全局上下文未初始化，使用模拟数据")
         behaviors = [
             {"action": "精确重复操作", "timestamp": "14:30:15"},
             {"action": "异常高频点击", "timestamp": "14:30:16"},
             {"action": "完美时间间隔", "timestamp": "14:30:17"}
         ]
     else:
-        behavior_history = monitor.get_player_history(player_id)
+        behavior_history = monitor.get_player_history(player_id, limit=20)
         behaviors = [
             {"action": b.action, "timestamp": b.timestamp.strftime("%H:%M:%S")}
-            for b in behavior_history[-20:]
+            for b in behavior_history
         ]
         
     is_bot, confidence, patterns = False, 0.0, []
@@ -51,9 +54,17 @@ def detect_bot_with_deps(player_id: str) -> str:
                                                     round(final_confidence, 2),
                                                     patterns,
                                                     datetime.now()) 
-        print(f"✅ 已更新玩家 {player_id} 的机器人检测状态: {'是机器人' if is_bot else '非机器人'}")
+        tracer.info(
+            "tool.bot.updated",
+            "✅ 已更新玩家 {player_id} 的机器人检测状态: {verdict}",
+            player_id=player_id, verdict='是机器人' if is_bot else '非机器人',
+        )
     else:
-        print(f"📝 模拟更新玩家 {player_id} 的机器人检测状态: {'是机器人' if is_bot else '非机器人'}")
+        tracer.info(
+            "tool.bot.simulated",
+            "📝 模拟更新玩家 {player_id} 的机器人检测状态: {verdict}",
+            player_id=player_id, verdict='是机器人' if is_bot else '非机器人',
+        )
     
     return json.dumps({
         "player_id": player_id,
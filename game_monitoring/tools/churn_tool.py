@@ -1,6 +1,8 @@
 import json
 from datetime import datetime
 
+from ..infrastructure.monitoring.tracer import get_tracer
+
 def assess_churn_risk_with_deps(player_id: str) -> str:
     """评估指定玩家的流失风险，并实时更新到玩家状态中。"""
     from .runtime_access import (
@@ -12,7 +14,7 @@ def assess_churn_risk_with_deps(player_id: str) -> str:
     # --- 修正点 1: 使用“卫语句”模式 ---
     # 在函数入口处立即检查依赖。如果未初始化，直接返回模拟/错误结果。
     if not is_context_initialized():
-        print("⚠️ 全局上下文未初始化，使用模拟数据进行评估")
+        get_tracer().warning("tool.churn.no_context", "⚠️ 全局上下文未初始化，使用模拟数据进行评估")
         # 这里的模拟逻辑应该完整并直接返回，不与后续真实逻辑混合
         risk_level = "无法评估"
         risk_score = 0.0
@@ -68,7 +70,11 @@ def assess_churn_risk_with_deps(player_id: str) -> str:
         risk_factors=risk_factors,
         update_time=datetime.now()
     )
-    print(f"✅ 已更新玩家 {player_id} 的流失风险为: {risk_level}")
+    get_tracer().info(
+        "tool.churn.updated",
+        "✅ 已更新玩家 {player_id} 的流失风险为: {risk_level}",
+        player_id=player_id, risk_level=risk_level,
+    )
     
     return json.dumps({
         "player_id": player_id, 
@@ -2,6 +2,8 @@ import json
 from typing import List
 from datetime import datetime
 
+from ..infrastructure.monitoring.tracer import get_tracer
+
 
 def analyze_emotion_with_deps(player_id: str) -> str:
     """分析玩家情绪状态（带依赖版本）"""
@@ -11,14 +13,15 @@ def analyze_emotion_with_deps(player_id: str) -> str:
         is_context_initialized,
     )
     
-    print(f"🔍 正在分析玩家 {player_id} 的情绪状态...")
+    tracer = get_tracer()
+    tracer.info("tool.emotion.start", "🔍 正在分析玩家 {player_id} 的情绪状态...", player_id=player_id)
     
     # 获取全局实例
     monitor = get_monitor()
     player_state_manager = get_player_state_manager()
     
     if not is_context_initialized():
-        print("⚠️ 全局上下文未初始化，使用模拟数据")
+        tracer.warning("tool.emotion.no_context", "⚠️ 全局上下文未初始化，使用模拟数据")
         # 模拟玩家行为数据
         behaviors = [
             type('Behavior', (), {"action": "连续死亡3次", "timestamp": "14:30:15"}),
@@ -137,9 +140,17 @@ def analyze_emotion_with_deps(player_id: str) -> str:
                                             confidence,
                                             keywords,
                                             datetime.now())
-        print(f"✅ 已更新玩家 {player_id} 的情绪状态: {emotion} (置信度: {confidence:.2f})")
+        tracer.info(
+            "tool.emotion.updated",
+            "✅ 已更新玩家 {player_id} 的情绪状态: {emotion} (置信度: {confidence:.2f})",
+            player_id=player_id, emotion=emotion, confidence=confidence,
+        )
     else:
-        print(f"📝 模拟更新玩家 {player_id} 的情绪状态: {emotion} (置信度: {confidence:.2f})")
+        tracer.info(
+            "tool.emotion.simulated",
+            "📝 模拟更新玩家 {player_id} 的情绪状态: {emotion} (置信度: {confidence:.2f})",
+            player_id=player_id, emotion=emotion, confidence=confidence,
+        )
     
     return json.dumps({
         "player_id": player_id, 
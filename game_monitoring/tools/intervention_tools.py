@@ -2,6 +2,8 @@ import json
 import random
 from typing import Dict, Any
 
+from ..infrastructure.monitoring.tracer import get_tracer
+
 def execute_engagement_action(
     player_id: str, 
     action_type: str, 
@@ -18,12 +20,14 @@ def execute_engagement_action(
         reason (str): 执行此操作的原因总结。
         personalized_email_content (str): 由EngagementAgent预先生成好的、完整的个性化邮件正文。
     """
-    print(f"--- TOOL EXECUTION: execute_engagement_action ---")
-    print(f"  - Player ID: {player_id}")
-    print(f"  - Action Type: {action_type}")
-    print(f"  - Reason: {reason}")
-    # 可选：只打印前100字符
-    print(f"  - Email Content (truncated): {personalized_email_content}...")
+    get_tracer().info(
+        "tool.engagement.execute",
+        "执行激励操作: 玩家 {player_id}, 类型 {action_type}, 原因 {reason}, 邮件 {email}...",
+        player_id=player_id,
+        action_type=action_type,
+        reason=reason,
+        email=personalized_email_content[:100],
+    )
 
     # 模拟操作成功
     success = True  # 可以加入随机失败来测试鲁棒性
@@ -43,7 +47,12 @@ def execute_engagement_action(
 
 def execute_guidance_action(player_id: str, action_type: str, reason: str) -> str:
     """对指定玩家执行引导操作（如弹窗）。"""
-    print(f"执行游戏内引导: 对玩家 {player_id} 进行 '{action_type}' 因为 '{reason}'")
+    tracer = get_tracer()
+    tracer.info(
+        "tool.guidance.execute",
+        "执行游戏内引导: 对玩家 {player_id} 进行 '{action_type}' 因为 '{reason}'",
+        player_id=player_id, action_type=action_type, reason=reason,
+    )
     
     # 首先构造Python字典
     if random.choice([True, True]):
@@ -61,5 +70,5 @@ def execute_guidance_action(player_id: str, action_type: str, reason: str) -> st
         }
         
     # 在最后返回时，统一使用 ensure_ascii=False 进行转换
-    print("result_dict:", result_dict)
+    tracer.debug("tool.guidance.result", "result_dict: {result}", result=result_dict)
     return json.dumps(result_dict, ensure_ascii=False)
\ No newline at end of file
@@ -1,17 +1,62 @@
+import asyncio
 import json
-from typing import Dict, Any, List
+import os
+from typing import Dict, Any, List, Optional
 from datetime import datetime
-from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.messages import TextMessage
-from config import doubao_client, qwen_client
+from config import doubao_client
+import functools
+import threading
 import traceback
 
-def generate_batch_military_orders(commander_order: str = None) -> str:
+from ..infrastructure.cache import PersistentResultCache, fingerprint
+from ..infrastructure.llm import LLMGateway, get_llm_gateway
+from ..infrastructure.monitoring.tracer import TraceLevel, get_tracer
+from .order_batch import stream_military_orders
+from .order_templates import CohortOrderGenerator
+
+MILITARY_ORDER_SYSTEM_MESSAGE = (
+    "你是一名资深的军事策略专家和军令撰写大师。你的任务是根据指挥官总军令和玩家的具体情况，"
+    "为每个玩家生成个性化的作战军令。\n\n"
+    "**你的角色定位：**\n"
+    "- 你是游戏中的军事顾问，负责将总体战略转化为具体的个人作战指令\n"
+    "- 你需要根据玩家的队伍实力、装备情况和资源状况，制定最适合的作战方案\n"
+    "- 你的军令应该既体现总体战略意图，又充分考虑玩家的个人能力\n\n"
+    "**军令生成要求：**\n"
+    "1. 军令格式要正式、有仪式感，体现军事文书的严肃性\n"
+    "2. 内容要具体明确，包含具体的坐标、时间、任务分工\n"
+    "3. 要根据玩家队伍等级合理分配任务（50级以上主攻，45级以上支援，40级以上拆迁）\n"
+    "4. 要提及玩家的资源情况（预备兵、道具等）并给出使用建议\n"
+    "5. 语言要有激励性和荣誉感，激发玩家的参战热情\n"
+    "6. 军令长度控制在300-500字之间\n\n"
+    "**输出格式：**\n"
+    "请直接输出完整的军令内容，不需要额外的解释或格式标记。"
+)
+
+# 提示词或生成方式变化时递增，使已缓存的军令失效
+ORDER_PROMPT_VERSION = 1
+DEFAULT_ORDER_CACHE_PATH = ".cache/military_orders.sqlite3"
+
+_content_gateway: LLMGateway = None
+_content_gateway_lock = threading.Lock()
+_order_cache: Optional[PersistentResultCache] = None
+_order_cache_configured = False
+
+def generate_batch_military_orders(
+    commander_order: str = None,
+    max_concurrency: int = 8,
+    use_templates: bool = True
+) -> str:
     """
     批量生成多个玩家的个性化军令
     
+    各玩家的生成并发进行（最多 max_concurrency 个同时调用LLM），
+    结果按玩家顺序汇总。默认按战力梯队共享军令骨架，
+    每个梯队只调用一次LLM，玩家差量由模板填充。
+    
     Args:
         commander_order: 指挥官总军令（可选，如果不提供则使用默认）
+        max_concurrency: 最大并发生成数
+        use_templates: 是否使用梯队骨架 + 玩家差量的两阶段生成
     
     Returns:
         批量生成结果的JSON字符串
@@ -24,36 +69,39 @@ def generate_batch_military_orders(commander_order: str = None) -> str:
     
     # 获取所有玩家信息
     players_info = get_players_info()
+    requests = {
+        player_name: build_order_request(player_name, player_info, commander_order)
+        for player_name, player_info in players_info.items()
+    }
     
-    batch_results = []
+    generate = agenerate_military_order_with_llm
+    if use_templates:
+        generate = functools.partial(generate, template_generator=create_template_generator())
     
-    for player_name, player_info in players_info.items():
-        try:
-            # 为每个玩家生成个性化军令
-            result = generate_military_order_with_llm(
-                player_name=player_info["player_name"],
-                player_id=player_name.lower().replace(" ", "_"),
-                team_stamina=player_info["team_stamina"],
-                backpack_items=player_info["backpack_items"],
-                team_levels=player_info["team_levels"],
-                skill_levels=player_info["skill_levels"],
-                reserve_troops=player_info["reserve_troops"],
-                commander_order=commander_order
-            )
-            
-            result_data = json.loads(result)
+    async def collect():
+        return [
+            outcome
+            async for outcome in stream_military_orders(requests, generate, max_concurrency)
+        ]
+    
+    outcomes = {outcome.player_name: outcome for outcome in get_content_gateway().run_sync(collect())}
+    
+    batch_results = []
+    for player_name in players_info:
+        outcome = outcomes[player_name]
+        if outcome.ok:
             batch_results.append({
                 "player_name": player_name,
                 "status": "success",
-                "military_order": result_data["military_order"],
-                "team_analysis": result_data["team_analysis"]
+                "military_order": outcome.result["military_order"],
+                "team_analysis": outcome.result["team_analysis"],
+                "cached": outcome.result.get("cached", False)
             })
-            
-        except Exception as e:
+        else:
             batch_results.append({
                 "player_name": player_name,
                 "status": "error",
-                "error": str(e)
+                "error": outcome.error
             })
     
     final_result = {
@@ -61,18 +109,39 @@ def generate_batch_military_orders(commander_order: str = None) -> str:
         "total_players": len(players_info),
         "successful_orders": len([r for r in batch_results if r["status"] == "success"]),
         "failed_orders": len([r for r in batch_results if r["status"] == "error"]),
+        "cache_hits": len([r for r in batch_results if r.get("cached")]),
         "commander_order": commander_order,
         "generated_at": datetime.now().isoformat(),
         "results": batch_results
     }
     
-    print(f"--- 批量军令生成完成 ---")
-    print(f"  - 总玩家数: {final_result['total_players']}")
-    print(f"  - 成功生成: {final_result['successful_orders']}")
-    print(f"  - 生成失败: {final_result['failed_orders']}")
+    get_tracer().info(
+        "military_order.batch_completed",
+        "批量军令生成完成 - 总玩家数: {total}, 成功生成: {succeeded}, 生成失败: {failed}",
+        total=final_result['total_players'],
+        succeeded=final_result['successful_orders'],
+        failed=final_result['failed_orders'],
+    )
     
     return json.dumps(final_result, ensure_ascii=False, indent=2)
 
+def build_order_request(
+    player_name: str,
+    player_info: Dict[str, Any],
+    commander_order: str = None
+) -> Dict[str, Any]:
+    """将玩家信息转换为 generate_military_order_with_llm 的参数"""
+    return {
+        "player_name": player_info.get("player_name") or player_name,
+        "player_id": player_name.lower().replace(" ", "_"),
+        "team_stamina": player_info.get("team_stamina"),
+        "backpack_items": player_info.get("backpack_items"),
+        "team_levels": player_info.get("team_levels"),
+        "skill_levels": player_info.get("skill_levels"),
+        "reserve_troops": player_info.get("reserve_troops", 0),
+        "commander_order": commander_order,
+    }
+
 def generate_personalized_military_order(
     player_id: str,
     player_name: str,
@@ -129,31 +198,66 @@ def get_team_assignment(level: int, team_number: int) -> str:
     else:
         return f"第{team_number}队建议继续提升等级，暂时待命"
 
-def create_llm_content_generator() -> AssistantAgent:
-    """创建纯粹的LLM内容生成引擎"""
-    return AssistantAgent(
-        name="MilitaryOrderContentGenerator",
-        system_message=(
-            "你是一名资深的军事策略专家和军令撰写大师。你的任务是根据指挥官总军令和玩家的具体情况，"
-            "为每个玩家生成个性化的作战军令。\n\n"
-            "**你的角色定位：**\n"
-            "- 你是游戏中的军事顾问，负责将总体战略转化为具体的个人作战指令\n"
-            "- 你需要根据玩家的队伍实力、装备情况和资源状况，制定最适合的作战方案\n"
-            "- 你的军令应该既体现总体战略意图，又充分考虑玩家的个人能力\n\n"
-            "**军令生成要求：**\n"
-            "1. 军令格式要正式、有仪式感，体现军事文书的严肃性\n"
-            "2. 内容要具体明确，包含具体的坐标、时间、任务分工\n"
-            "3. 要根据玩家队伍等级合理分配任务（50级以上主攻，45级以上支援，40级以上拆迁）\n"
-            "4. 要提及玩家的资源情况（预备兵、道具等）并给出使用建议\n"
-            "5. 语言要有激励性和荣誉感，激发玩家的参战热情\n"
-            "6. 军令长度控制在300-500字之间\n\n"
-            "**输出格式：**\n"
-            "请直接输出完整的军令内容，不需要额外的解释或格式标记。"
-        ),
-        description="专门生成个性化军令内容的LLM引擎",
-        model_client=doubao_client,
-        tools=[],
-        reflect_on_tool_use=False,
+def get_content_gateway() -> LLMGateway:
+    """军令生成使用的LLM网关：优先使用共享网关，否则包装 doubao_client"""
+    global _content_gateway
+    gateway = get_llm_gateway()
+    if gateway is not None:
+        return gateway
+    with _content_gateway_lock:
+        if _content_gateway is None:
+            _content_gateway = LLMGateway.from_model_client(doubao_client)
+        return _content_gateway
+
+def configure_order_cache(cache: Optional[PersistentResultCache]) -> None:
+    """设置军令缓存（None 表示关闭缓存）"""
+    global _order_cache, _order_cache_configured
+    with _content_gateway_lock:
+        _order_cache = cache
+        _order_cache_configured = True
+
+def get_order_cache() -> Optional[PersistentResultCache]:
+    """军令缓存，未配置时按 MILITARY_ORDER_CACHE_PATH 环境变量（默认 .cache/）创建"""
+    global _order_cache, _order_cache_configured
+    with _content_gateway_lock:
+        if not _order_cache_configured:
+            path = os.environ.get("MILITARY_ORDER_CACHE_PATH", DEFAULT_ORDER_CACHE_PATH)
+            _order_cache = PersistentResultCache(path, max_entries=5000, ttl_seconds=24 * 3600)
+            _order_cache_configured = True
+        return _order_cache
+
+def order_cache_key(
+    player_name: str,
+    commander_order: str,
+    team_levels: list,
+    team_stamina: list,
+    backpack_items: list,
+    skill_levels: list,
+    reserve_troops: int,
+    event_info: Dict[str, Any],
+    mode: str = "full"
+) -> str:
+    """军令缓存键：生成军令用到的全部输入的内容哈希"""
+    return fingerprint({
+        "player_name": player_name,
+        "commander_order": commander_order,
+        "team_levels": team_levels,
+        "team_stamina": team_stamina,
+        "backpack_items": backpack_items,
+        "skill_levels": skill_levels,
+        "reserve_troops": reserve_troops,
+        "event_info": event_info,
+        "mode": mode,
+        "prompt_version": ORDER_PROMPT_VERSION,
+        "system_message": MILITARY_ORDER_SYSTEM_MESSAGE,
+    })
+
+def create_template_generator() -> CohortOrderGenerator:
+    """创建批量生成共用的梯队骨架生成器（每个批次一个，骨架在批次内共享）"""
+    return CohortOrderGenerator(
+        lambda prompt, **kwargs: get_content_gateway().complete(prompt, **kwargs),
+        MILITARY_ORDER_SYSTEM_MESSAGE,
+        generate_fallback_military_order,
     )
 
 def generate_military_order_with_llm(
@@ -186,6 +290,35 @@ def generate_military_order_with_llm(
     Returns:
         生成的军令内容JSON字符串
     """
+    return get_content_gateway().run_sync(agenerate_military_order_with_llm(
+        player_name=player_name,
+        player_id=player_id,
+        team_stamina=team_stamina,
+        backpack_items=backpack_items,
+        team_levels=team_levels,
+        skill_levels=skill_levels,
+        reserve_troops=reserve_troops,
+        event_info=event_info,
+        commander_order=commander_order
+    ))
+
+async def agenerate_military_order_with_llm(
+    player_name: str,
+    player_id: str = None,
+    team_stamina: list = None,
+    backpack_items: list = None,
+    team_levels: list = None,
+    skill_levels: list = None,
+    reserve_troops: int = 0,
+    event_info: Dict[str, Any] = None,
+    commander_order: str = None,
+    template_generator: CohortOrderGenerator = None
+) -> str:
+    """
+    generate_military_order_with_llm 的异步版本，供批量流水线并发调用
+    
+    传入 template_generator 时使用梯队骨架 + 玩家差量生成军令内容。
+    """
     from .runtime_access import get_commander_order
     
     # 获取指挥官总军令
@@ -224,10 +357,36 @@ def generate_military_order_with_llm(
                 "assignment": get_team_assignment(level, i + 1)
             })
     
-    # 调用LLM生成军令内容
-    military_order_content = _call_llm_for_content_generation(
-        player_name, team_assignments, backpack_items, reserve_troops, event_info, commander_order
+    # 玩家数据、总军令和提示词都未变化时直接复用之前生成的军令
+    order_cache = get_order_cache()
+    cache_key = order_cache_key(
+        player_name, commander_order, team_levels, team_stamina, backpack_items,
+        skill_levels, reserve_troops, event_info,
+        mode="template" if template_generator is not None else "full"
+    )
+    # SQLite 读写（含 commit）放到线程中执行，不阻塞并发生成其他军令的事件循环
+    military_order_content = (
+        await asyncio.to_thread(order_cache.get, cache_key) if order_cache is not None else None
     )
+    cached = military_order_content is not None
+    
+    # 调用LLM生成军令内容
+    if not cached:
+        if template_generator is not None:
+            military_order_content = await template_generator.render(
+                player_name, team_assignments, backpack_items, reserve_troops, event_info, commander_order
+            )
+        else:
+            military_order_content = await _agenerate_order_content(
+                player_name, team_assignments, backpack_items, reserve_troops, event_info, commander_order
+            )
+        if military_order_content is None:
+            # 备用方案的结果不缓存，LLM恢复后重新生成
+            military_order_content = generate_fallback_military_order(
+                player_name, team_assignments, backpack_items, reserve_troops, event_info
+            )
+        elif order_cache is not None:
+            await asyncio.to_thread(order_cache.put, cache_key, military_order_content)
     
     # 构建返回结果
     result = {
@@ -237,12 +396,17 @@ def generate_military_order_with_llm(
         "military_order": military_order_content,
         "commander_order": commander_order,
         "generated_at": datetime.now().isoformat(),
-        "team_analysis": team_assignments
+        "team_analysis": team_assignments,
+        "cached": cached
     }
     
-    print(f"--- 工具：军令生成完成 ---")
-    print(f"  - 玩家: {player_name}")
-    print(f"  - 军令长度: {len(military_order_content)}字符")
+    get_tracer().info(
+        "military_order.generated",
+        "军令生成完成 - 玩家: {player_name}, 军令长度: {length}字符, 缓存命中: {cached}",
+        player_name=player_name,
+        length=len(military_order_content),
+        cached=cached,
+    )
     
     return json.dumps(result, ensure_ascii=False, indent=2)
 
@@ -268,9 +432,22 @@ def _call_llm_for_content_generation(
     commander_order: str = None
 ) -> str:
     """内部函数：调用LLM生成军令内容"""
-    
-    # 创建LLM内容生成引擎
-    llm_generator = create_llm_content_generator()
+    military_order = get_content_gateway().run_sync(_agenerate_order_content(
+        player_name, team_assignments, backpack_items, reserve_troops, event_info, commander_order
+    ))
+    return military_order or generate_fallback_military_order(
+        player_name, team_assignments, backpack_items, reserve_troops, event_info
+    )
+
+async def _agenerate_order_content(
+    player_name: str, 
+    team_assignments: list, 
+    backpack_items: list, 
+    reserve_troops: int, 
+    event_info: Dict[str, Any],
+    commander_order: str = None
+) -> Optional[str]:
+    """内部函数：调用LLM生成军令内容（异步），失败时返回 None 由调用方使用备用方案"""
     
     # 构建玩家数据的自然语言描述
     player_data_desc = build_player_data_description(
@@ -302,37 +479,39 @@ def _call_llm_for_content_generation(
 
 请生成一份适合该玩家的个性化作战军令。"""
     
-    # 直接调用LLM生成军令
+    # 通过共享网关调用LLM（连接复用、限流和重试由网关负责）
     try:
-        import asyncio
-        
-        # 创建用户消息
-        user_message = TextMessage(content=prompt, source="user")
-        
-        # 异步调用LLM生成回复
-        async def call_llm():
-            response = await llm_generator.on_messages([user_message], cancellation_token=None)
-            return response
-        
-        # 运行异步调用
-        response = asyncio.run(call_llm())
+        military_order = await get_content_gateway().complete(
+            prompt, system_message=MILITARY_ORDER_SYSTEM_MESSAGE
+        )
         
         # 提取生成的军令内容
-        if response and response.chat_message:
-            military_order = response.chat_message.content
-            print(f"--- LLM生成军令成功 ---")
-            print(f"  - 玩家: {player_name}")
-            print(f"  - 军令内容: {military_order}")
-            print(f"  - 军令长度: {len(military_order)}字符")
+        if military_order:
+            get_tracer().debug(
+                "military_order.llm_succeeded",
+                "LLM生成军令成功 - 玩家: {player_name}, 军令内容: {content}",
+                player_name=player_name,
+                content=military_order,
+            )
             return military_order
         else:
-            print(f"--- LLM生成军令失败，使用备用方案 ---")
-            return generate_fallback_military_order(player_name, team_assignments, backpack_items, reserve_troops, event_info)
+            get_tracer().warning(
+                "military_order.llm_empty",
+                "LLM生成军令失败，使用备用方案 - 玩家: {player_name}",
+                player_name=player_name,
+            )
+            return None
             
     except Exception as e:
-        print(f"--- LLM调用异常: {str(e)}，使用备用方案 ---")
-        traceback.print_exc()
-        return generate_fallback_military_order(player_name, team_assignments, backpack_items, reserve_troops, event_info)
+        tracer = get_tracer()
+        if tracer.enabled(TraceLevel.ERROR):
+            tracer.error(
+                "military_order.llm_failed",
+                "LLM调用异常: {error}，使用备用方案",
+                error=str(e),
+                traceback=traceback.format_exc(),
+            )
+        return None
 
 def build_player_data_description(
     player_name: str,
@@ -443,10 +622,13 @@ def send_military_order(
     Returns:
         发送结果的JSON字符串
     """
-    print(f"--- 军令推送执行 ---")
-    print(f"  - 目标玩家: {player_id}")
-    print(f"  - 军令类型: {order_type}")
-    print(f"  - 内容长度: {len(military_order_content)}字符")
+    get_tracer().info(
+        "military_order.send",
+        "军令推送执行 - 目标玩家: {player_id}, 军令类型: {order_type}, 内容长度: {length}字符",
+        player_id=player_id,
+        order_type=order_type,
+        length=len(military_order_content),
+    )
     
     # 模拟发送过程
     import random
@@ -0,0 +1,109 @@
+"""
+批量军令生成流水线
+
+按有界并发为多个玩家生成军令，每完成一个玩家立即产出结果:
+- 同时进行的生成不超过 max_concurrency，其余玩家排队
+- 结果按完成顺序流式返回，调用方可以边生成边展示
+- cancel_event 置位后不再启动新的玩家，进行中的生成被取消
+
+生成函数可以是协程函数，也可以是同步函数（放到线程池执行）。
+
+使用示例:
+```python
+async for outcome in stream_military_orders(requests, agenerate_military_order_with_llm, max_concurrency=8):
+    print(outcome.player_name, outcome.ok)
+```
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Mapping, Optional
+
+OrderGenerator = Callable[..., Any]
+
+
+@dataclass
+class BatchOrderOutcome:
+    """单个玩家的生成结果"""
+    player_name: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def _generate_one(
+    player_name: str,
+    kwargs: Mapping[str, Any],
+    generate: OrderGenerator,
+) -> BatchOrderOutcome:
+    try:
+        if inspect.iscoroutinefunction(generate):
+            result_str = await generate(**kwargs)
+        else:
+            result_str = await asyncio.to_thread(generate, **kwargs)
+        return BatchOrderOutcome(player_name, result=json.loads(result_str))
+    except Exception as e:
+        return BatchOrderOutcome(player_name, error=str(e))
+
+
+async def stream_military_orders(
+    requests: Mapping[str, Mapping[str, Any]],
+    generate: OrderGenerator,
+    max_concurrency: int = 8,
+    cancel_event: Optional[threading.Event] = None,
+    poll_interval: float = 0.1,
+) -> AsyncIterator[BatchOrderOutcome]:
+    """
+    并发生成军令并按完成顺序产出结果
+
+    Args:
+        requests: 玩家名 -> 生成函数的关键字参数
+        generate: 生成单个玩家军令的函数，返回军令结果 JSON 字符串
+        max_concurrency: 最大并发生成数
+        cancel_event: 取消信号（可跨线程设置）
+        poll_interval: 检查取消信号的间隔（秒）
+    """
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be positive")
+
+    queue = iter(requests.items())
+    pending: set[asyncio.Task] = set()
+
+    def cancelled() -> bool:
+        return cancel_event is not None and cancel_event.is_set()
+
+    def launch() -> None:
+        while len(pending) < max_concurrency and not cancelled():
+            item = next(queue, None)
+            if item is None:
+                return
+            player_name, kwargs = item
+            pending.add(asyncio.ensure_future(_generate_one(player_name, kwargs, generate)))
+
+    try:
+        launch()
+        while pending:
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=poll_interval if cancel_event is not None else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            pending.difference_update(done)
+            for task in done:
+                yield task.result()
+            if cancelled():
+                break
+            launch()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
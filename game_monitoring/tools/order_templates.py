@@ -0,0 +1,211 @@
+"""
+军令模板生成（梯队骨架 + 玩家差量）
+
+批量生成时同一战力梯队的玩家军令大同小异，逐个玩家发送完整提示词浪费 token 和时延。
+两阶段生成:
+1. 每个梯队（主力队伍能打的地块等级）只调用一次 LLM，生成带占位符的军令骨架
+2. 玩家差量（姓名、各队任务、资源建议）由确定性的模板填充完成，不再调用 LLM
+
+骨架生成失败时回退到备用军令方案，与逐个生成的行为一致。
+
+使用示例:
+```python
+generator = CohortOrderGenerator(gateway.complete, MILITARY_ORDER_SYSTEM_MESSAGE, fallback)
+content = await generator.generate(player_name, team_assignments, backpack_items, reserve_troops, event_info, commander_order)
+```
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..infrastructure.cache import fingerprint
+from ..infrastructure.monitoring.tracer import get_tracer
+
+PLAYER_NAME = "{player_name}"
+TEAM_DETAILS = "{team_details}"
+RESOURCE_ADVICE = "{resource_advice}"
+
+NO_TEAM_COHORT = "无可用队伍"
+
+_COHORT_ROLES = {
+    "12级地": "主力攻坚部队",
+    "11级地": "精锐支援部队",
+    "8级地": "攻城拆迁部队",
+}
+
+Complete = Callable[..., Awaitable[str]]
+Fallback = Callable[[str, list, list, int, Dict[str, Any]], str]
+
+
+def cohort_of(team_assignments: List[Dict[str, Any]]) -> str:
+    """玩家所属梯队：最强可用队伍能打的地块等级"""
+    if not team_assignments:
+        return NO_TEAM_COHORT
+    strongest = max(team_assignments, key=lambda team: team["level"])
+    return strongest["capability"]
+
+
+def build_skeleton_prompt(cohort: str, commander_order: str, event_info: Dict[str, Any]) -> str:
+    """梯队骨架提示词，不包含任何玩家个人信息"""
+    role = _COHORT_ROLES.get(cohort, "后备部队")
+    strength = "暂无可用队伍，以待命和发育为主" if cohort == NO_TEAM_COHORT else f"主力队伍可打{cohort}，适合作为{role}"
+    return f"""请为同一战力梯队的所有玩家撰写一份通用的作战军令模板：
+
+**指挥官总军令：**
+{commander_order or '按默认作战目标执行'}
+
+**梯队战力：** {strength}
+
+**作战环境：**
+- 作战时间：{event_info.get('event_date', '9月15号')} {event_info.get('event_time', '早上10点')}
+- 作战类型：{event_info.get('event_type', '攻城战')}
+- 目标坐标：{event_info.get('target_coordinates', '(752, 613)')}
+- 集结地点：{event_info.get('rally_point', '(732, 767)')}
+
+模板中必须原样保留以下占位符，系统会替换为每位玩家的具体信息：
+- {PLAYER_NAME}：玩家姓名
+- {TEAM_DETAILS}：玩家各队伍的任务分工
+- {RESOURCE_ADVICE}：预备兵与道具使用建议
+
+请直接输出军令模板。"""
+
+
+def describe_teams(team_assignments: List[Dict[str, Any]]) -> str:
+    if not team_assignments:
+        return "暂无可用队伍，请抓紧提升队伍等级、恢复体力，暂时待命。"
+    return "\n".join(
+        f"- 第{team['team_number']}队（{team['level']}级，体力{team['stamina']}%）：{team['assignment']}"
+        for team in team_assignments
+    )
+
+
+def describe_resources(backpack_items: List[str], reserve_troops: int) -> str:
+    items_text = "、".join(backpack_items[:3]) if backpack_items else "无"
+    return f"预备兵{reserve_troops}，请在开战前补满兵力；携带道具：{items_text}，关键时刻果断使用。"
+
+
+def fill_order_template(
+    skeleton: str,
+    player_name: str,
+    team_assignments: List[Dict[str, Any]],
+    backpack_items: List[str],
+    reserve_troops: int,
+) -> str:
+    """用玩家差量填充骨架；LLM 漏掉的占位符以固定格式补在开头或结尾"""
+    team_details = describe_teams(team_assignments)
+    resource_advice = describe_resources(backpack_items, reserve_troops)
+
+    order = skeleton
+    if PLAYER_NAME not in order:
+        order = f"{PLAYER_NAME}将军：\n\n{order}"
+    if TEAM_DETAILS not in order:
+        order = f"{order}\n\n**各队任务：**\n{TEAM_DETAILS}"
+    if RESOURCE_ADVICE not in order:
+        order = f"{order}\n\n**资源建议：** {RESOURCE_ADVICE}"
+
+    return (
+        order.replace(PLAYER_NAME, player_name)
+        .replace(TEAM_DETAILS, team_details)
+        .replace(RESOURCE_ADVICE, resource_advice)
+    )
+
+
+@dataclass
+class TemplateStats:
+    """模板生成统计"""
+    skeletons: int = 0
+    filled: int = 0
+    fallbacks: int = 0
+
+
+class CohortOrderGenerator:
+    """按梯队共享骨架的军令生成器，同一梯队的并发请求只生成一次骨架"""
+
+    def __init__(
+        self,
+        complete: Complete,
+        system_message: str,
+        fallback: Fallback,
+    ):
+        """
+        Args:
+            complete: 单轮 LLM 调用 complete(prompt, system_message=...) -> str
+            system_message: 军令撰写的系统提示词
+            fallback: 骨架不可用时的备用军令生成函数
+        """
+        self._complete = complete
+        self._system_message = system_message
+        self._fallback = fallback
+        self._skeletons: Dict[Tuple[str, str, str], asyncio.Future] = {}
+        self.stats = TemplateStats()
+
+    async def skeleton(
+        self,
+        cohort: str,
+        commander_order: Optional[str],
+        event_info: Dict[str, Any],
+    ) -> Optional[str]:
+        """获取梯队骨架，生成失败返回 None"""
+        key = (cohort, commander_order or "", fingerprint(event_info))
+        future = self._skeletons.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._generate_skeleton(cohort, commander_order, event_info))
+            self._skeletons[key] = future
+        return await asyncio.shield(future)
+
+    async def generate(
+        self,
+        player_name: str,
+        team_assignments: List[Dict[str, Any]],
+        backpack_items: List[str],
+        reserve_troops: int,
+        event_info: Dict[str, Any],
+        commander_order: Optional[str] = None,
+    ) -> str:
+        """生成单个玩家的军令内容，骨架不可用时使用备用方案"""
+        order = await self.render(
+            player_name, team_assignments, backpack_items, reserve_troops, event_info, commander_order
+        )
+        if order is None:
+            self.stats.fallbacks += 1
+            return self._fallback(player_name, team_assignments, backpack_items, reserve_troops, event_info)
+        return order
+
+    async def render(
+        self,
+        player_name: str,
+        team_assignments: List[Dict[str, Any]],
+        backpack_items: List[str],
+        reserve_troops: int,
+        event_info: Dict[str, Any],
+        commander_order: Optional[str] = None,
+    ) -> Optional[str]:
+        """用梯队骨架填充军令，骨架不可用时返回 None"""
+        skeleton = await self.skeleton(cohort_of(team_assignments), commander_order, event_info)
+        if not skeleton:
+            return None
+        self.stats.filled += 1
+        return fill_order_template(skeleton, player_name, team_assignments, backpack_items, reserve_troops)
+
+    async def _generate_skeleton(
+        self,
+        cohort: str,
+        commander_order: Optional[str],
+        event_info: Dict[str, Any],
+    ) -> Optional[str]:
+        prompt = build_skeleton_prompt(cohort, commander_order, event_info)
+        try:
+            skeleton = await self._complete(prompt, system_message=self._system_message)
+        except Exception as e:
+            get_tracer().warning(
+                "military_order.skeleton_failed",
+                "梯队军令骨架生成失败，使用备用方案 - 梯队: {cohort}, 错误: {error}",
+                cohort=cohort,
+                error=str(e),
+            )
+            return None
+        self.stats.skeletons += 1
+        return skeleton
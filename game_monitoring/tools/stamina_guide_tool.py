@@ -3,6 +3,7 @@ import random
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 from .runtime_access import get_player_info
+from ..infrastructure.monitoring.tracer import get_tracer
 
 
 
@@ -16,8 +17,8 @@ def get_player_inventory_status(player_id: str) -> str:
     Returns:
         玩家背包状态的JSON字符串
     """
-    print(f"")
-    print(f"  - 玩家ID: {player_id}")
+    tracer = get_tracer()
+    tracer.info("tool.stamina.inventory", "查询体力道具 - 玩家ID: {player_id}", player_id=player_id)
     
     # 从context.py获取玩家数据
     player_info = get_player_info(player_id)
@@ -29,7 +30,11 @@ def get_player_inventory_status(player_id: str) -> str:
             "max_stamina": 100,
             "vip_level": 0
         }
-        print(f"  - 警告: 未找到玩家 {player_id} 的信息，使用默认数据")
+        tracer.warning(
+            "tool.stamina.player_missing",
+            "  - 警告: 未找到玩家 {player_id} 的信息，使用默认数据",
+            player_id=player_id,
+        )
     else:
         player_data = {
             "stamina_items": player_info.get("stamina_items", []),
@@ -61,10 +66,15 @@ def get_player_inventory_status(player_id: str) -> str:
         "status": "success"
     }
     
-    print(f"  - 当前体力: {player_data['current_stamina']}/{player_data['max_stamina']}")
-    print(f"  - 体力道具数量: {len(player_data['stamina_items'])}")
-    print(f"  - 总恢复潜力: {total_recovery_potential}")
-    print(f"  - 即将过期道具: {len(expiring_soon_items)}")
+    tracer.info(
+        "tool.stamina.summary",
+        "  - 当前体力: {current}/{maximum}, 体力道具数量: {items}, 总恢复潜力: {recovery}, 即将过期道具: {expiring}",
+        current=player_data['current_stamina'],
+        maximum=player_data['max_stamina'],
+        items=len(player_data['stamina_items']),
+        recovery=total_recovery_potential,
+        expiring=len(expiring_soon_items),
+    )
     
     return json.dumps(result, ensure_ascii=False)
 
@@ -78,6 +88,5 @@ def execute_personalized_guidance_popup(suggestion: str) -> str:
     Returns:
         执行成功返回 'success'
     """
-    print(f"--- 个性化体力引导弹窗执行 -------")
-    print(f"弹窗引导：{suggestion}")
+    get_tracer().info("tool.stamina.popup", "弹窗引导：{suggestion}", suggestion=suggestion)
     return "success"
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import sys
 from datetime import datetime
 from typing import Any, Callable, Mapping, MutableMapping
 
@@ -42,13 +41,10 @@ async def trigger_intervention(
     team_capture = session_state.get("team_analysis_capture")
     monitor = runtime["monitor"]
     agent_service = runtime["agent_service"]
-    original_stdout = sys.stdout
 
     try:
         if hasattr(team_capture, "start_capture"):
             team_capture.start_capture()
-        if hasattr(team_capture, "write"):
-            sys.stdout = team_capture
 
         intervention = await agent_service.trigger_intervention(player_id)
         payload = getattr(intervention, "payload", None)
@@ -64,7 +60,6 @@ async def trigger_intervention(
         add_agent_log(f"❌ 触发干预时出错: {exc}")
         return None
     finally:
-        sys.stdout = original_stdout
         if hasattr(team_capture, "stop_capture"):
             team_capture.stop_capture()
 
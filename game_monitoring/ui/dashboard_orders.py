@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import threading
 from datetime import datetime
-from typing import Any, Callable, Mapping, MutableMapping
+from typing import Any, Callable, Coroutine, Mapping, MutableMapping, Optional
+
+from ..tools.order_batch import stream_military_orders
 
 
 def _build_missing_player_result(player_name: str, captured_at: datetime) -> dict[str, Any]:
@@ -40,64 +43,91 @@ def _build_success_result(result: dict[str, Any], player_name: str, captured_at:
         "player_id": result.get("player_id", player_name.lower().replace(" ", "_")),
         "military_order": result.get("military_order", ""),
         "teams_info": result.get("team_analysis", []),
+        "cached": result.get("cached", False),
         "timestamp": captured_at,
     }
 
 
+def _build_order_request(entity: Any, player_name: str, commander_order: str) -> dict[str, Any]:
+    return {
+        "player_name": entity.player_name or player_name,
+        "player_id": entity.player_id or player_name.lower().replace(" ", "_"),
+        "team_stamina": entity.team_stamina,
+        "backpack_items": entity.backpack_items,
+        "team_levels": entity.team_levels,
+        "skill_levels": entity.skill_levels,
+        "reserve_troops": entity.reserve_troops,
+        "commander_order": commander_order,
+    }
+
+
 def run_batch_generation(
     session_state: MutableMapping[str, Any],
     runtime: Mapping[str, Any],
     selected_players: list[str],
     commander_order: str,
-    generate_military_order_with_llm: Callable[..., str],
+    generate_military_order_with_llm: Callable[..., Any],
     *,
+    max_concurrency: int = 8,
+    cancel_event: Optional[threading.Event] = None,
     now_factory: Callable[[], datetime] = datetime.now,
+    runner: Callable[[Coroutine[Any, Any, None]], Any] = asyncio.run,
 ) -> None:
-    """Generate personalized military orders for a set of players and track progress."""
+    """Generate personalized military orders concurrently and append each result as it completes.
+
+    The generator may be a coroutine function or a plain function. Setting
+    ``cancel_event`` stops the batch: no new players are started and
+    in-flight generations are cancelled. ``runner`` drives the batch coroutine
+    to completion; the dashboard passes the LLM gateway's ``run_sync`` so the
+    batch shares the gateway's event loop and concurrency limit with other
+    LLM calls.
+    """
     repo = runtime["player_repository"]
     session_state.setdefault("batch_generated_orders", [])
     session_state.setdefault("batch_generation_processed", 0)
     session_state.setdefault("batch_generation_error", None)
+    session_state["batch_generation_cancelled"] = False
 
     try:
+        requests: dict[str, dict[str, Any]] = {}
         for player_name in selected_players:
             entity = repo.get_by_name(player_name)
-            captured_at = now_factory()
-
             if entity is None:
                 session_state["batch_generated_orders"].append(
-                    _build_missing_player_result(player_name, captured_at)
+                    _build_missing_player_result(player_name, now_factory())
                 )
                 session_state["batch_generation_processed"] += 1
                 continue
+            requests[player_name] = _build_order_request(entity, player_name, commander_order)
 
-            try:
-                result_str = generate_military_order_with_llm(
-                    player_name=entity.player_name or player_name,
-                    player_id=entity.player_id or player_name.lower().replace(" ", "_"),
-                    team_stamina=entity.team_stamina,
-                    backpack_items=entity.backpack_items,
-                    team_levels=entity.team_levels,
-                    skill_levels=entity.skill_levels,
-                    reserve_troops=entity.reserve_troops,
-                    commander_order=commander_order,
-                )
-                result = json.loads(result_str)
-                session_state["batch_generated_orders"].append(
-                    _build_success_result(result, player_name, captured_at)
-                )
-            except Exception as exc:
-                session_state["batch_generated_orders"].append(
-                    _build_error_result(
-                        player_name,
-                        entity.player_id or player_name.lower().replace(" ", "_"),
-                        str(exc),
-                        captured_at,
+        async def consume() -> None:
+            async for outcome in stream_military_orders(
+                requests,
+                generate_military_order_with_llm,
+                max_concurrency=max_concurrency,
+                cancel_event=cancel_event,
+            ):
+                captured_at = now_factory()
+                if outcome.ok:
+                    session_state["batch_generated_orders"].append(
+                        _build_success_result(outcome.result, outcome.player_name, captured_at)
                     )
-                )
-                session_state["batch_generation_error"] = str(exc)
-            finally:
+                else:
+                    session_state["batch_generated_orders"].append(
+                        _build_error_result(
+                            outcome.player_name,
+                            requests[outcome.player_name]["player_id"],
+                            outcome.error,
+                            captured_at,
+                        )
+                    )
+                    session_state["batch_generation_error"] = outcome.error
                 session_state["batch_generation_processed"] += 1
+
+        if requests:
+            runner(consume())
+        if cancel_event is not None and cancel_event.is_set():
+            session_state["batch_generation_cancelled"] = True
     except Exception as exc:
         session_state["batch_generation_error"] = f"批量生成线程异常: {exc}"
     finally:
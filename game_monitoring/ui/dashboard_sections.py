@@ -320,7 +320,7 @@ def render_left_panel(ctx: DashboardRenderContext) -> None:
 
     st.subheader("📊 最近行为历史")
     if ctx.monitor and hasattr(ctx.monitor, "get_player_history"):
-        recent_behaviors = ctx.monitor.get_player_history(ctx.current_player_id)[-5:]
+        recent_behaviors = ctx.monitor.get_player_history(ctx.current_player_id, limit=5)
         if recent_behaviors:
             for behavior in recent_behaviors:
                 st.markdown(
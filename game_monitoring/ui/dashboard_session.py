@@ -5,6 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Callable, MutableMapping
 
+from ..infrastructure.monitoring.tracer import TraceEvent, TraceLevel, Tracer, get_tracer
 from ..simulator.behavior_simulator import PlayerBehaviorRuleEngine
 from ..simulator.player_behavior import PlayerActionDefinitions
 
@@ -12,7 +13,7 @@ DEFAULT_PLAYER_ID = "孤独的凤凰战士"
 
 
 class TeamAnalysisLogCapture:
-    """Capture team-analysis stdout while keeping session state synchronized."""
+    """Capture team-analysis trace events while keeping session state synchronized."""
 
     def __init__(
         self,
@@ -21,22 +22,33 @@ class TeamAnalysisLogCapture:
         session_key: str = "team_analysis_logs",
         max_logs: int = 10000,
         timestamp_factory: Callable[[], str] | None = None,
+        tracer: Tracer | None = None,
+        level: TraceLevel = TraceLevel.INFO,
     ):
         self._session_state = session_state
         self._session_key = session_key
         self._max_logs = max_logs
         self._timestamp_factory = timestamp_factory or (lambda: "")
+        self._tracer = tracer or get_tracer()
+        self._level = level
         self._logs: list[str] = []
         self._is_capturing = False
 
     def start_capture(self) -> None:
+        if not self._is_capturing:
+            self._tracer.subscribe(self.handle_trace_event, self._level)
         self._is_capturing = True
         self._logs.clear()
         self._session_state[self._session_key] = []
 
     def stop_capture(self) -> None:
+        if self._is_capturing:
+            self._tracer.unsubscribe(self.handle_trace_event)
         self._is_capturing = False
 
+    def handle_trace_event(self, event: TraceEvent) -> None:
+        self.write(event.render())
+
     def write(self, text: str) -> None:
         if not self._is_capturing or not text.strip():
             return
@@ -48,9 +60,6 @@ class TeamAnalysisLogCapture:
             self._logs = self._logs[-self._max_logs :]
         self._session_state[self._session_key] = self._logs.copy()
 
-    def flush(self) -> None:
-        """Compatibility no-op for stdout-like usage."""
-
     def get_all_logs(self) -> list[str]:
         return self._logs.copy()
 
@@ -125,6 +134,8 @@ def ensure_dashboard_state(
         "batch_generation_total": 0,
         "batch_generation_processed": 0,
         "batch_generation_error": None,
+        "batch_generation_cancelled": False,
+        "batch_generation_cancel_event": None,
         "stamina_exhaustion_count": 0,
         "stamina_guide_logs": [],
     }
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import json
 from datetime import datetime
-from threading import Thread
+from functools import partial
+from threading import Event, Thread
 from typing import Any
 
 import streamlit as st
@@ -91,6 +92,12 @@ def render_team_analysis_tab(ctx: DashboardRenderContext) -> None:
             with st.expander(title, expanded=(index == 1)):
                 st.markdown(f"**会话ID:** `{result['session_id']}`")
                 st.markdown(f"**Worker 数量:** {result['worker_count']}")
+                missing_workers = result.get("missing_workers") or {}
+                if missing_workers:
+                    st.warning(
+                        "部分结果，缺失 Worker: "
+                        + ", ".join(f"{name} ({reason})" for name, reason in missing_workers.items())
+                    )
                 st.markdown(f"**综合置信度:** {result['overall_confidence']:.2f}")
                 if result["action_labels"]:
                     st.markdown(f"**动作类型:** {', '.join(result['action_labels'])}")
@@ -190,6 +197,26 @@ def render_stamina_tab(ctx: DashboardRenderContext) -> None:
         st.metric("日志条数", len(ctx.get("stamina_guide_logs", [])))
 
 
+def _render_batch_progress(ctx: DashboardRenderContext) -> None:
+    total = ctx.get("batch_generation_total", 0)
+    processed = ctx.get("batch_generation_processed", 0)
+    if ctx.get("batch_generation_in_progress", False):
+        st.progress(min(processed / total, 1.0) if total else 0.0, text=f"已完成 {processed}/{total}")
+        col_refresh, col_cancel = st.columns(2)
+        with col_refresh:
+            if st.button("🔄 刷新进度", key="refresh_batch_progress_tab4"):
+                st.rerun()
+        with col_cancel:
+            if st.button("⏹️ 取消批量生成", key="cancel_batch_generation_tab4"):
+                cancel_event = ctx.get("batch_generation_cancel_event")
+                if cancel_event is not None:
+                    cancel_event.set()
+                ctx.add_agent_log("⏹️ 已请求取消批量军令生成")
+                st.rerun()
+    elif ctx.get("batch_generation_cancelled", False):
+        st.warning(f"⚠️ 批量生成已取消，已完成 {processed}/{total} 名玩家")
+
+
 def render_orders_tab(ctx: DashboardRenderContext) -> None:
     """Render military-order generation, preview, and send actions."""
     st.markdown("**⚔️ 军令操作中心**")
@@ -223,9 +250,12 @@ def render_orders_tab(ctx: DashboardRenderContext) -> None:
                         set_commander_order(ctx.runtime, commander_order.strip())
 
                         from game_monitoring.tools.military_order_tool import (
-                            generate_military_order_with_llm,
+                            agenerate_military_order_with_llm,
+                            create_template_generator,
+                            get_content_gateway,
                         )
 
+                        cancel_event = Event()
                         _set_order_generation_state(
                             ctx,
                             batch_generated_orders=[],
@@ -233,6 +263,8 @@ def render_orders_tab(ctx: DashboardRenderContext) -> None:
                             batch_generation_total=len(selected_players),
                             batch_generation_processed=0,
                             batch_generation_error=None,
+                            batch_generation_cancelled=False,
+                            batch_generation_cancel_event=cancel_event,
                         )
 
                         thread = Thread(
@@ -242,8 +274,15 @@ def render_orders_tab(ctx: DashboardRenderContext) -> None:
                                 ctx.runtime,
                                 list(selected_players),
                                 commander_order.strip(),
-                                generate_military_order_with_llm,
+                                partial(
+                                    agenerate_military_order_with_llm,
+                                    template_generator=create_template_generator(),
+                                ),
                             ),
+                            kwargs={
+                                "cancel_event": cancel_event,
+                                "runner": get_content_gateway().run_sync,
+                            },
                             daemon=True,
                         )
                         _attach_script_ctx(ctx, thread)
@@ -266,12 +305,18 @@ def render_orders_tab(ctx: DashboardRenderContext) -> None:
     batch_generated_orders = ctx.get("batch_generated_orders")
     single_generated_order = ctx.get("single_generated_order")
 
+    _render_batch_progress(ctx)
+
     if batch_generated_orders:
         st.markdown("### 📋 批量生成的军令预览")
+        cache_hits = sum(1 for order in batch_generated_orders if order.get("cached"))
+        if cache_hits:
+            st.info(f"⚡ {cache_hits}/{len(batch_generated_orders)} 份军令来自缓存（玩家数据与总军令未变化）")
         for order in batch_generated_orders:
             player_name = order.get("player_name", "未知玩家")
             player_id = order.get("player_id", "unknown")
-            with st.expander(f"👤 {player_name} ({player_id})", expanded=False):
+            cache_badge = " ⚡ 缓存" if order.get("cached") else ""
+            with st.expander(f"👤 {player_name} ({player_id}){cache_badge}", expanded=False):
                 st.markdown("### 📜 军令内容")
                 military_order_content = order.get("military_order", "军令内容未找到")
                 st.markdown(f"```\n{military_order_content}\n```")
@@ -296,6 +341,8 @@ def render_orders_tab(ctx: DashboardRenderContext) -> None:
                 batch_generation_total=0,
                 batch_generation_processed=0,
                 batch_generation_error=None,
+                batch_generation_cancelled=False,
+                batch_generation_cancel_event=None,
             )
             st.rerun()
     elif single_generated_order:
@@ -17,6 +17,7 @@ def format_intervention_result(
         "player_id": result.get("player_id", "unknown"),
         "session_id": result.get("session_id", "unknown"),
         "worker_count": result.get("worker_count", 0),
+        "missing_workers": dict(result.get("missing_workers") or {}),
         "overall_confidence": round(float(result.get("overall_confidence", 0.0)), 3),
         "final_actions": actions,
         "action_labels": [action.get("action_type", "unknown") for action in actions],
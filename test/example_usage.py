@@ -12,7 +12,8 @@
 import asyncio
 from autogen_agentchat.messages import TextMessage
 from game_monitoring.tools.military_order_tool import (
-    create_llm_content_generator,
+    MILITARY_ORDER_SYSTEM_MESSAGE,
+    get_content_gateway,
     generate_military_order_with_llm,
     generate_batch_military_orders
 )
@@ -26,8 +27,8 @@ async def example_direct_llm_usage():
     """
     print("\n=== 示例1: 直接使用LLM生成引擎 ===")
     
-    # 创建LLM生成引擎
-    llm_generator = create_llm_content_generator()
+    # 获取LLM网关
+    gateway = get_content_gateway()
     
     # 构建详细的生成提示
     prompt = """
@@ -41,12 +42,11 @@ async def example_direct_llm_usage():
     """
     
     try:
-        user_message = TextMessage(content=prompt, source="user")
-        response = await llm_generator.on_messages([user_message], cancellation_token=None)
+        content = await gateway.complete(prompt, system_message=MILITARY_ORDER_SYSTEM_MESSAGE)
         
-        if response and response.chat_message:
+        if content:
             print("✅ LLM直接生成成功")
-            print(f"生成内容: {response.chat_message.content[:200]}...")
+            print(f"生成内容: {content[:200]}...")
         else:
             print("❌ LLM生成失败")
     except Exception as e:
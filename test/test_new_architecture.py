@@ -4,15 +4,16 @@
 测试新的军令生成架构
 
 新架构说明：
-1. LLM (create_llm_content_generator): 纯粹的内容生成引擎
+1. LLM (get_content_gateway): 共享LLM网关，纯粹的内容生成引擎
 2. Tool (generate_military_order_with_llm): Agent可调用的工具函数
 3. Agent (MilitaryOrderAgent): 任务执行智能体
 """
 
 import json
 from game_monitoring.tools.military_order_tool import (
+    MILITARY_ORDER_SYSTEM_MESSAGE,
     generate_military_order_with_llm,
-    create_llm_content_generator
+    get_content_gateway
 )
 from game_monitoring.agents.military_order_agent import create_military_order_agent
 from autogen_agentchat.messages import TextMessage
@@ -21,8 +22,8 @@ def test_llm_content_generator():
     """测试纯粹的LLM内容生成引擎"""
     print("=== 测试1: LLM内容生成引擎 ===")
     
-    # 创建LLM生成引擎
-    llm_generator = create_llm_content_generator()
+    # 获取LLM网关
+    gateway = get_content_gateway()
     
     # 直接给LLM一个生成军令的prompt
     prompt = """
@@ -43,19 +44,12 @@ def test_llm_content_generator():
 """
     
     try:
-        import asyncio
-        
-        async def call_llm():
-            user_message = TextMessage(content=prompt, source="user")
-            response = await llm_generator.on_messages([user_message], cancellation_token=None)
-            return response
+        content = gateway.complete_sync(prompt, system_message=MILITARY_ORDER_SYSTEM_MESSAGE)
         
-        response = asyncio.run(call_llm())
-        
-        if response and response.chat_message:
+        if content:
             print("✅ LLM生成成功")
-            print(f"生成内容长度: {len(response.chat_message.content)}字符")
-            print(f"内容预览: {response.chat_message.content[:100]}...")
+            print(f"生成内容长度: {len(content)}字符")
+            print(f"内容预览: {content[:100]}...")
         else:
             print("❌ LLM生成失败")
     except Exception as e:
@@ -0,0 +1,73 @@
+import asyncio
+
+from autogen_core import SingleThreadedAgentRuntime
+
+from game_monitoring.domain.messages import InterventionTask
+from game_monitoring.team.team_manager import GameMonitoringTeamV2
+from game_monitoring.team.worker_hosting import WorkerDeployment, WorkerPool
+
+
+class FakeMonitor:
+    def get_triggered_scenarios(self, player_id):
+        return [{"scenario": "negative_behavior"}]
+
+    def get_behavior_history(self, player_id):
+        return [{"action": "uninstall"}]
+
+
+def test_team_runs_workers_in_separate_processes():
+    """测试分布式部署：Worker 在独立进程中处理，结果与本地部署一致"""
+    deployment = WorkerDeployment(
+        {"emotion_worker": 2, "churn_worker": 1, "behavior_worker": 1}
+    )
+
+    async def run(team):
+        try:
+            single = await team.trigger_analysis_and_intervention("player_1", FakeMonitor())
+            batch = await team.trigger_batch_analysis_and_intervention(
+                ["player_2", "player_3"], FakeMonitor()
+            )
+            return single, batch
+        finally:
+            await team.close()
+
+    remote, remote_batch = asyncio.run(
+        run(GameMonitoringTeamV2(None, SingleThreadedAgentRuntime(), worker_deployment=deployment))
+    )
+    local, _ = asyncio.run(run(GameMonitoringTeamV2(None, SingleThreadedAgentRuntime())))
+
+    assert remote["worker_count"] == 3
+    assert remote["final_actions"] == local["final_actions"]
+    assert remote["overall_confidence"] == local["overall_confidence"]
+    assert [item["player_id"] for item in remote_batch] == ["player_2", "player_3"]
+    assert deployment.pools == {}
+
+
+def test_worker_pool_balances_across_processes():
+    """测试同类型的多个 Worker 进程分摊并发请求"""
+    deployment = WorkerDeployment({"churn_worker": 2})
+    pool: WorkerPool = deployment.start()["churn_worker"]
+
+    tasks = [
+        InterventionTask(
+            task_id=f"t{i}",
+            player_id=f"p{i}",
+            session_id="s",
+            task_type="churn",
+            context={"triggered_scenarios": [], "behavior_history": [{"action": "login"}]},
+            timestamp="2024-01-01T00:00:00",
+        )
+        for i in range(6)
+    ]
+
+    async def scenario():
+        return await asyncio.gather(*(pool.call(task) for task in tasks))
+
+    try:
+        responses = asyncio.run(scenario())
+    finally:
+        deployment.close()
+
+    assert [response.task_id for response in responses] == [task.task_id for task in tasks]
+    assert all(response.metadata["risk_level"] == "低风险" for response in responses)
+    assert sorted(client.requests for client in pool.clients) == [3, 3]
@@ -0,0 +1,111 @@
+import asyncio
+
+from autogen_core import AgentId, MessageContext, RoutedAgent, SingleThreadedAgentRuntime, rpc
+
+from game_monitoring.agents.orchestrator import OrchestratorAgent, WorkerCallPolicy
+from game_monitoring.domain.messages import InterventionTask, PlayerEvent, WorkerResponse
+from game_monitoring.infrastructure.monitoring.metrics import MetricsRegistry
+
+
+class ScriptedWorker(RoutedAgent):
+    """按调用次序返回的测试 Worker：delays[i] 为第 i 次调用的延迟，None 表示抛出异常"""
+
+    def __init__(self, worker_type, delays, calls):
+        super().__init__(f"scripted {worker_type}")
+        self.worker_type = worker_type
+        self.delays = delays
+        self.calls = calls
+
+    @rpc
+    async def handle_intervention_task(
+        self, message: InterventionTask, ctx: MessageContext
+    ) -> WorkerResponse:
+        index = len(self.calls)
+        self.calls.append(message.task_id)
+        delay = self.delays[min(index, len(self.delays) - 1)]
+        if delay is None:
+            raise RuntimeError("worker crashed")
+        await asyncio.sleep(delay)
+        return WorkerResponse(
+            task_id=message.task_id,
+            worker_type=self.worker_type,
+            intervention_actions=[{"action_type": f"{self.worker_type}_action"}],
+            confidence=0.9,
+            metadata={"priority": 1, "attempt": index},
+        )
+
+
+def _run(delays_by_worker, **orchestrator_kwargs):
+    calls = {worker: [] for worker in delays_by_worker}
+
+    async def scenario():
+        runtime = SingleThreadedAgentRuntime()
+        worker_types = [f"{worker}_worker" for worker in delays_by_worker]
+        await OrchestratorAgent.register(
+            runtime,
+            "orchestrator",
+            lambda: OrchestratorAgent(None, worker_types, **orchestrator_kwargs),
+        )
+        for worker, delays in delays_by_worker.items():
+            await ScriptedWorker.register(
+                runtime,
+                f"{worker}_worker",
+                lambda worker=worker, delays=delays: ScriptedWorker(worker, delays, calls[worker]),
+            )
+        runtime.start()
+        try:
+            return await runtime.send_message(
+                PlayerEvent("player_1", [], [], "session_1"),
+                AgentId("orchestrator", "default"),
+            )
+        finally:
+            await runtime.stop()
+
+    return asyncio.run(scenario()), calls
+
+
+def test_slow_and_failed_workers_yield_partial_result():
+    """测试超时和失败的 Worker 不阻塞干预，结果中标记缺失"""
+    result, _ = _run(
+        {"emotion": [0.0], "churn": [5.0], "behavior": [None]},
+        default_policy=WorkerCallPolicy(timeout=0.1),
+    )
+
+    assert result["worker_count"] == 1
+    assert result["partial"] is True
+    assert result["missing_workers"]["churn"] == "timeout"
+    assert "worker crashed" in result["missing_workers"]["behavior"]
+    assert result["final_actions"] == [{"action_type": "emotion_action"}]
+
+
+def test_hedged_request_wins_over_slow_first_attempt():
+    """测试首个请求过慢时，对冲请求先返回"""
+    result, calls = _run(
+        {"emotion": [0.0], "churn": [5.0, 0.0]},
+        worker_policies={"churn_worker": WorkerCallPolicy(timeout=1.0, hedge_after=0.05)},
+    )
+
+    assert result["partial"] is False
+    assert result["worker_count"] == 2
+    assert len(calls["churn"]) == 2
+    assert len(calls["emotion"]) == 1
+
+
+def test_worker_call_metrics_by_outcome():
+    """测试按 Worker 类型和结果记录调用耗时、对冲次数和错误率"""
+    registry = MetricsRegistry()
+    _run(
+        {"emotion": [0.0], "churn": [5.0], "behavior": [0.2, 0.0]},
+        default_policy=WorkerCallPolicy(timeout=0.1),
+        worker_policies={"behavior_worker": WorkerCallPolicy(timeout=1.0, hedge_after=0.05)},
+        metrics=registry,
+    )
+
+    latency = registry.get("worker_call_seconds")
+    assert latency.snapshot(worker_type="emotion_worker", outcome="ok").count == 1
+    assert latency.snapshot(worker_type="churn_worker", outcome="timeout").count == 1
+    assert latency.snapshot(worker_type="behavior_worker", outcome="ok").count == 1
+    assert registry.get("worker_hedged_requests_total").value(worker_type="behavior_worker") == 1
+    assert registry.get("worker_call_error_rate").rate(worker_type="churn_worker") == 1.0
+    assert registry.get("orchestrator_event_seconds").snapshot(mode="single").count == 1
+    assert 'worker_call_seconds_count{worker_type="churn_worker",outcome="timeout"} 1' in registry.render()
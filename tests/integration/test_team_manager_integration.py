@@ -103,3 +103,70 @@ def test_team_manager_v2_real_runtime_flow():
         assert result["final_actions"]
 
     asyncio.run(run_flow())
+
+
+def test_team_manager_v2_batch_flow_matches_single_events():
+    """批量事件在真实 runtime 上按玩家合并，结果与逐个发送一致。"""
+
+    class FakeMonitor:
+        def get_triggered_scenarios(self, player_id):
+            return [{"scenario": "negative_behavior"}]
+
+        def get_behavior_history(self, player_id):
+            action = "uninstall_game" if player_id == "player_2" else "quit_match"
+            return [{"action": action}]
+
+    async def run_flow():
+        runtime = SingleThreadedAgentRuntime()
+        team = GameMonitoringTeamV2(model_client=None, runtime=runtime)
+        monitor = FakeMonitor()
+
+        try:
+            batch = await team.trigger_batch_analysis_and_intervention(
+                ["player_1", "player_2"], monitor
+            )
+            singles = [
+                await team.trigger_analysis_and_intervention(player_id, monitor)
+                for player_id in ("player_1", "player_2")
+            ]
+        finally:
+            await team.close()
+
+        assert [result["player_id"] for result in batch] == ["player_1", "player_2"]
+        assert [result["final_actions"] for result in batch] == [
+            result["final_actions"] for result in singles
+        ]
+        assert all(result["worker_count"] == 3 for result in batch)
+
+    asyncio.run(run_flow())
+
+
+def test_team_manager_v2_debounces_repeated_triggers():
+    """测试开启防抖后，同一玩家的连续触发只发送一个合并事件"""
+
+    class FakeMonitor:
+        def __init__(self, scenario):
+            self.scenario = scenario
+
+        def get_triggered_scenarios(self, player_id):
+            return [{"scenario": self.scenario}]
+
+        def get_behavior_history(self, player_id):
+            return [{"action": "lose_pvp"}]
+
+    runtime = AsyncMock()
+    runtime.send_message = AsyncMock(return_value={"status": "ok"})
+    team = GameMonitoringTeamV2(model_client=None, runtime=runtime, debounce_seconds=0.05)
+
+    async def scenario():
+        return await asyncio.gather(
+            team.trigger_analysis_and_intervention("player_1", FakeMonitor("连续失败")),
+            team.trigger_analysis_and_intervention("player_1", FakeMonitor("流失风险")),
+        )
+
+    results = asyncio.run(scenario())
+
+    assert results == [{"status": "ok"}, {"status": "ok"}]
+    runtime.send_message.assert_awaited_once()
+    event, _ = runtime.send_message.await_args.args
+    assert [s["scenario"] for s in event.triggered_scenarios] == ["连续失败", "流失风险"]
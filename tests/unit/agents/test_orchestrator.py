@@ -1,7 +1,7 @@
 from unittest.mock import MagicMock
 
 from game_monitoring.agents.orchestrator import OrchestratorAgent
-from game_monitoring.domain.messages import PlayerEvent, WorkerResponse
+from game_monitoring.domain.messages import PlayerEvent, PlayerEventBatch, WorkerResponse
 
 
 def test_orchestrator_generate_tasks():
@@ -71,3 +71,28 @@ def test_merge_results_prioritization():
         {"action_type": "grant_reward", "amount": 100},
         {"action_type": "assign_support"},
     ]
+
+
+def test_orchestrator_generates_one_task_batch_per_worker():
+    """批量事件为每种 worker 生成一个批次，任务与事件顺序一致。"""
+    orchestrator = OrchestratorAgent(
+        model_client=MagicMock(),
+        worker_types=["emotion_worker", "churn_worker", "behavior_worker"],
+    )
+    events = [
+        PlayerEvent(
+            player_id=f"player_{index}",
+            triggered_scenarios=[],
+            behavior_history=[],
+            session_id=f"session_{index}",
+        )
+        for index in range(4)
+    ]
+
+    batches = orchestrator._generate_task_batches(PlayerEventBatch(batch_id="b1", events=events))
+
+    assert [batch.task_type for batch in batches] == ["emotion", "churn", "behavior"]
+    for batch in batches:
+        assert [task.player_id for task in batch.tasks] == [event.player_id for event in events]
+        assert len({task.task_id for task in batch.tasks}) == len(events)
+        assert len({task.timestamp for task in batch.tasks}) == 1
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from game_monitoring.agents.churn_worker import ChurnWorker
+from game_monitoring.agents.emotion_worker import EmotionWorker
+from game_monitoring.domain.messages import InterventionTask
+from game_monitoring.infrastructure.cache import ResultCache, fingerprint
+
+
+def _task(task_id, player_id, actions, task_type="emotion"):
+    now = datetime.now()
+    return InterventionTask(
+        task_id=task_id,
+        player_id=player_id,
+        session_id=f"session_{player_id}",
+        task_type=task_type,
+        context={
+            "triggered_scenarios": [{"scenario": "combat_loss", "player_id": player_id}],
+            "behavior_history": [
+                {"action": action, "timestamp": now + timedelta(seconds=i), "player_id": player_id}
+                for i, action in enumerate(actions)
+            ],
+        },
+        timestamp=now.isoformat(),
+    )
+
+
+def test_result_cache_lru_and_ttl():
+    """测试容量淘汰、过期和统计"""
+    now = [0.0]
+    cache = ResultCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # b 最久未使用，被淘汰
+
+    assert cache.get("b") is None
+    assert cache.stats.evictions == 1
+
+    now[0] = 11.0
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+    assert cache.stats.hit_rate == pytest.approx(1 / 3)
+
+
+def test_fingerprint_is_order_independent_for_keys():
+    """测试指纹与字典键顺序无关"""
+    assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_worker_reuses_response_for_identical_patterns():
+    """测试不同玩家的相同模式命中缓存，任务ID各自保留"""
+    worker = EmotionWorker(model_client=MagicMock(), tools=[])
+    worker._respond = MagicMock(wraps=worker._respond)
+
+    first = worker._respond_cached(_task("t1", "player_1", ["quit_match", "login"]))
+    second = worker._respond_cached(_task("t2", "player_2", ["quit_match", "login"]))
+
+    assert worker._respond.call_count == 1
+    assert (first.task_id, second.task_id) == ("t1", "t2")
+    assert second.intervention_actions == first.intervention_actions
+    assert second.metadata == first.metadata
+    assert (worker.cache_stats.hits, worker.cache_stats.misses) == (1, 1)
+
+    # 修改返回值不影响缓存
+    second.metadata["priority"] = 99
+    third = worker._respond_cached(_task("t3", "player_3", ["quit_match", "login"]))
+    assert third.metadata["priority"] == first.metadata["priority"]
+
+
+def test_worker_cache_distinguishes_contexts():
+    """测试上下文不同时不会误命中"""
+    worker = ChurnWorker(model_client=MagicMock(), tools=[])
+
+    high = worker._respond_cached(_task("t1", "player_1", ["uninstall"], "churn"))
+    low = worker._respond_cached(_task("t2", "player_2", ["login"], "churn"))
+
+    assert high.metadata["risk_level"] == "高风险"
+    assert low.metadata["risk_level"] == "低风险"
+    assert worker.cache_stats.hits == 0
+
+
+def test_worker_cache_can_be_disabled():
+    """测试关闭缓存后每次都重新计算"""
+    worker = EmotionWorker(
+        model_client=MagicMock(), tools=[], result_cache=ResultCache(max_entries=0)
+    )
+    worker._respond = MagicMock(wraps=worker._respond)
+
+    worker._respond_cached(_task("t1", "player_1", ["login"]))
+    worker._respond_cached(_task("t2", "player_2", ["login"]))
+
+    assert worker._respond.call_count == 2
+    assert len(worker.result_cache) == 0
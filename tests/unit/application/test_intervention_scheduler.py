@@ -0,0 +1,166 @@
+import asyncio
+import gc
+
+import pytest
+
+from game_monitoring.application.services.intervention_scheduler import (
+    InterventionScheduler,
+    intervention_priority,
+)
+from game_monitoring.rules.engine import RulePriority
+
+
+def test_intervention_priority_orders_risks_before_positive_scenarios():
+    """测试卸载、卖号风险排在积极场景之前，流失优先于同级情绪"""
+    uninstall = intervention_priority([{"scenario": "游戏卸载流失风险"}])
+    asset_sale = intervention_priority([{"scenario": "资产处理风险"}])
+    failures = intervention_priority([{"scenario": "连续失败触发消极情绪"}])
+    payment = intervention_priority([{"scenario": "充值行为积极表现"}])
+    engine_result = intervention_priority(
+        [{"scenario_name": "x", "priority": RulePriority.CRITICAL.value, "category": "emotion"}]
+    )
+
+    assert engine_result < uninstall == asset_sale < failures < payment
+    assert intervention_priority([]) > payment
+    assert intervention_priority([{"scenario": "充值行为积极表现"}, {"scenario": "资产处理风险"}]) == asset_sale
+
+
+def test_scheduler_runs_highest_priority_first_with_bounded_concurrency():
+    """测试并发上限内按优先级出队"""
+    started = []
+    active = 0
+    peak = 0
+
+    async def handler(player_id):
+        nonlocal active, peak
+        started.append(player_id)
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return player_id
+
+    async def scenario():
+        scheduler = InterventionScheduler(handler, max_concurrency=1)
+        futures = [
+            scheduler.submit("positive", [{"scenario": "充值行为积极表现"}]),
+            scheduler.submit("failures", [{"scenario": "连续失败触发消极情绪"}]),
+            scheduler.submit("uninstall", [{"scenario": "游戏卸载流失风险"}]),
+        ]
+        results = await asyncio.gather(*futures)
+        await scheduler.close()
+        return scheduler, results
+
+    scheduler, results = asyncio.run(scenario())
+
+    # 第一个任务提交时队列为空，其余按优先级排队
+    assert started == ["uninstall", "failures", "positive"]
+    assert results == ["positive", "failures", "uninstall"]
+    assert peak == 1
+    assert scheduler.stats.completed == 3
+
+
+def test_scheduler_merges_queued_duplicates_and_upgrades_priority():
+    """测试同一玩家排队中的重复触发合并，并采用更高优先级"""
+    started = []
+
+    async def handler(player_id):
+        started.append(player_id)
+        await asyncio.sleep(0)
+        return player_id
+
+    async def scenario():
+        scheduler = InterventionScheduler(handler, max_concurrency=1)
+        first = scheduler.submit("p1", [{"scenario": "社交活跃表现"}])
+        second = scheduler.submit("p2", [{"scenario": "连续失败触发消极情绪"}])
+        upgraded = scheduler.submit("p1", [{"scenario": "游戏卸载流失风险"}])
+        await asyncio.gather(first, second)
+        return scheduler, first, upgraded
+
+    scheduler, first, upgraded = asyncio.run(scenario())
+
+    assert first is upgraded
+    assert started == ["p1", "p2"]
+    assert scheduler.stats.merged == 1
+
+
+def test_scheduler_signals_backpressure_and_rejects_when_full():
+    """测试高水位背压通知、队列满拒绝和低水位恢复"""
+    signals = []
+    release = None
+
+    async def handler(player_id):
+        await release.wait()
+        return player_id
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        scheduler = InterventionScheduler(
+            handler,
+            max_concurrency=1,
+            max_queue_size=3,
+            high_watermark=2,
+            low_watermark=0,
+            on_backpressure=signals.append,
+        )
+        futures = [scheduler.submit(f"p{i}") for i in range(3)]
+        await asyncio.sleep(0)
+        saturated = scheduler.saturated
+        with pytest.raises(asyncio.QueueFull):
+            for i in range(3, 6):
+                futures.append(scheduler.submit(f"p{i}"))
+
+        release.set()
+        await asyncio.wait_for(scheduler.wait_for_capacity(), timeout=1)
+        await scheduler.drain()
+        return scheduler, saturated
+
+    scheduler, saturated = asyncio.run(scenario())
+
+    assert saturated is True
+    assert signals == [True, False]
+    assert scheduler.stats.rejected == 1
+    assert scheduler.stats.completed == 4
+
+
+def test_scheduler_propagates_handler_errors():
+    """测试干预失败时异常传给提交方，调度器继续工作"""
+
+    async def handler(player_id):
+        if player_id == "bad":
+            raise RuntimeError("team unavailable")
+        return player_id
+
+    async def scenario():
+        scheduler = InterventionScheduler(handler)
+        bad = scheduler.submit("bad")
+        good = scheduler.submit("good")
+        return scheduler, await asyncio.gather(bad, good, return_exceptions=True)
+
+    scheduler, (bad, good) = asyncio.run(scenario())
+
+    assert isinstance(bad, RuntimeError)
+    assert good == "good"
+    assert scheduler.stats.failed == 1
+
+
+def test_scheduler_wakeups_survive_garbage_collection_and_close_cleanly():
+    """测试提交时的唤醒任务被调度器持有，回收后仍执行，关闭后不留下未完成的任务"""
+    handled = []
+
+    async def handler(player_id):
+        handled.append(player_id)
+
+    async def scenario():
+        scheduler = InterventionScheduler(handler, max_concurrency=2)
+        futures = [scheduler.submit(f"player_{index}") for index in range(20)]
+        gc.collect()
+        await asyncio.gather(*futures)
+        await scheduler.close()
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    leftover = asyncio.run(scenario())
+
+    assert sorted(handled) == sorted(f"player_{index}" for index in range(20))
+    assert leftover == set()
@@ -0,0 +1,70 @@
+import asyncio
+
+from game_monitoring.application.services.action_service import ActionProcessingService, ActionResult
+from game_monitoring.application.services.parallel_ingestion import (
+    ParallelActionIngestion,
+    create_worker_monitor,
+)
+from game_monitoring.core.context import GameContext
+from game_monitoring.monitoring.player_state import PlayerStateManager
+
+
+def _actions():
+    actions = []
+    for index in range(6):
+        player_id = f"player_{index}"
+        actions.append((player_id, "login", {}))
+        actions.extend((player_id, "be_attacked", {}) for _ in range(3))
+        actions.append((player_id, "make_payment", {"amount": 6}))
+    return actions
+
+
+def test_parallel_ingestion_matches_single_process_service():
+    """多进程分区采集的结果与单进程 ActionProcessingService 一致，且保持输入顺序。"""
+    actions = _actions()
+    service = ActionProcessingService(
+        GameContext(monitor=create_worker_monitor(), player_state_manager=PlayerStateManager())
+    )
+    expected = [asyncio.run(service.process_action(*action)) for action in actions]
+
+    async def run():
+        with ParallelActionIngestion(workers=2) as ingestion:
+            return await ingestion.process_batch(actions)
+
+    results = asyncio.run(run())
+
+    assert [(r.player_id, r.action_name) for r in results] == [a[:2] for a in actions]
+    assert [r.result for r in results] == [r.result for r in expected]
+    assert [r.current_negative_count for r in results] == [r.current_negative_count for r in expected]
+    assert [r.action_sequence_length for r in results] == [r.action_sequence_length for r in expected]
+
+
+def test_parallel_ingestion_forwards_interventions_to_team():
+    """达到阈值的结果回到主进程后转发给团队，并附带工作进程的序列快照。"""
+    forwarded = []
+
+    class FakeTeam:
+        async def trigger_analysis_and_intervention(self, player_id, monitor):
+            forwarded.append((
+                player_id,
+                [item["action"] for item in monitor.get_player_action_sequence(player_id)],
+                [item["scenario_name"] for item in monitor.get_triggered_scenarios(player_id)],
+            ))
+            return {"player_id": player_id}
+
+    actions = [("p1", "lose_pvp", {}) for _ in range(5)]
+
+    async def run():
+        with ParallelActionIngestion(workers=2, team=FakeTeam()) as ingestion:
+            results = await ingestion.process_batch(actions)
+            await ingestion.reset_negative_count("p1")
+            after_reset = await ingestion.process_action("p1", "login")
+            return results, after_reset
+
+    results, after_reset = asyncio.run(run())
+
+    assert results[-1].result == ActionResult.INTERVENTION_TRIGGERED
+    assert results[-1].intervention_payload == {"player_id": "p1"}
+    assert forwarded == [("p1", ["lose_pvp"] * 5, ["连续失败触发消极情绪", "异常高频操作"])]
+    # 重置后的下一条负面动作从 0 重新计数
+    assert after_reset.current_negative_count == 1
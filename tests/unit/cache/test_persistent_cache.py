@@ -0,0 +1,68 @@
+from game_monitoring.infrastructure.cache import PersistentResultCache, fingerprint
+
+
+def test_entries_survive_reopen(tmp_path):
+    """测试条目写入磁盘，重新打开后仍可命中"""
+    path = str(tmp_path / "orders.sqlite3")
+    key = fingerprint({"player_name": "张三", "commander_order": "进攻"})
+
+    cache = PersistentResultCache(path)
+    cache.put(key, {"military_order": "张三将军出征"})
+    cache.close()
+
+    reopened = PersistentResultCache(path)
+    assert reopened.get(key) == {"military_order": "张三将军出征"}
+    assert reopened.stats.hits == 1
+
+
+def test_expired_entries_are_dropped():
+    """测试超过 TTL 的条目视为未命中并被删除"""
+    now = [1000.0]
+    cache = PersistentResultCache(":memory:", ttl_seconds=60, clock=lambda: now[0])
+    cache.put("order", "军令")
+
+    now[0] += 30
+    assert cache.get("order") == "军令"
+    now[0] += 31
+    assert cache.get("order") is None
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    """测试超过容量时淘汰最久未使用的条目"""
+    now = [0.0]
+
+    def clock():
+        now[0] += 1
+        return now[0]
+
+    cache = PersistentResultCache(":memory:", max_entries=2, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_get_or_compute_and_purge():
+    """测试 get_or_compute 只计算一次，purge_expired 清理过期条目"""
+    now = [0.0]
+    cache = PersistentResultCache(":memory:", ttl_seconds=10, clock=lambda: now[0])
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "军令"
+
+    assert cache.get_or_compute("key", compute) == "军令"
+    assert cache.get_or_compute("key", compute) == "军令"
+    assert len(calls) == 1
+
+    now[0] += 11
+    assert cache.purge_expired() == 1
+    assert len(cache) == 0
@@ -0,0 +1,323 @@
+import asyncio
+import json
+import time
+from email.utils import formatdate
+
+import pytest
+
+from game_monitoring.domain.schemas import EmotionWorkerOutput
+from game_monitoring.infrastructure.llm import (
+    FakeLLMServer,
+    LLMGateway,
+    LLMGatewayError,
+    TokenBucket,
+    configure_llm_gateway,
+    parse_retry_after,
+)
+from game_monitoring.infrastructure.monitoring.metrics import MetricsRegistry
+from game_monitoring.infrastructure.validation.output_validator import OutputValidator
+
+
+def test_connections_are_reused_across_requests():
+    """测试顺序请求复用同一条 keep-alive 连接"""
+    with FakeLLMServer() as server:
+        gateway = LLMGateway.from_url(server.base_url, model="fake")
+
+        async def run():
+            replies = [await gateway.complete(f"问题{i}") for i in range(5)]
+            await gateway.aclose()
+            return replies
+
+        replies = asyncio.run(run())
+
+    assert replies == [f"echo: 问题{i}" for i in range(5)]
+    assert len(server.requests) == 5
+    assert server.connections == 1
+
+
+def test_openai_compatible_response_and_usage():
+    """测试返回结构与 OpenAI chat.completions 兼容并累计用量"""
+    with FakeLLMServer(responder=lambda request: "x" * 40) as server:
+        gateway = LLMGateway.from_url(server.base_url, model="fake")
+
+        async def run():
+            return await gateway.create(
+                messages=[{"role": "user", "content": "y" * 80}], temperature=0.3
+            )
+
+        response = asyncio.run(run())
+
+    assert response.choices[0].message.content == "x" * 40
+    assert server.requests[0]["temperature"] == 0.3
+    assert server.requests[0]["model"] == "fake"
+    assert gateway.stats.prompt_tokens == 20
+    assert gateway.stats.completion_tokens == 10
+
+
+def test_rate_limited_requests_are_retried():
+    """测试 429 按退避重试后成功"""
+    with FakeLLMServer(fail_first=2) as server:
+        gateway = LLMGateway.from_url(server.base_url, backoff_base=0.01, jitter=lambda: 1.0)
+        reply = asyncio.run(gateway.complete("重试"))
+
+    assert reply == "echo: 重试"
+    assert len(server.requests) == 3
+    assert gateway.stats.retries == 2
+    assert gateway.stats.failures == 0
+
+
+def test_retry_after_accepts_http_dates():
+    """测试 Retry-After 为 HTTP 日期时按日期等待，无法解析时按正常退避"""
+    assert parse_retry_after("2.5") == 2.5
+    assert 25 < parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+    assert parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0.0
+    assert parse_retry_after("soon") is None
+
+    with FakeLLMServer(fail_first=1, retry_after=formatdate(time.time() - 1, usegmt=True)) as server:
+        gateway = LLMGateway.from_url(server.base_url, backoff_base=0.01)
+        reply = asyncio.run(gateway.complete("日期"))
+
+    assert reply == "echo: 日期"
+    assert len(server.requests) == 2
+
+
+def test_malformed_response_is_a_retryable_gateway_error():
+    """测试状态行不完整等协议错误包装为可重试的 LLMGatewayError"""
+    attempts = []
+
+    async def handle(reader, writer):
+        attempts.append(await reader.read(65536))
+        writer.write(b"HTTP/1.1 ab")
+        await writer.drain()
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        gateway = LLMGateway.from_url(f"http://127.0.0.1:{port}/v1", max_retries=1, backoff_base=0.0)
+        try:
+            with pytest.raises(LLMGatewayError) as exc_info:
+                await gateway.complete("问题")
+        finally:
+            await gateway.aclose()
+            server.close()
+            await server.wait_closed()
+        return exc_info.value
+
+    error = asyncio.run(run())
+
+    assert error.retryable is True
+    assert len(attempts) == 2
+
+
+def test_retries_are_bounded():
+    """测试超过最大重试次数后抛出 LLMGatewayError"""
+    with FakeLLMServer(fail_first=10) as server:
+        gateway = LLMGateway.from_url(server.base_url, max_retries=1, backoff_base=0.01)
+
+        with pytest.raises(LLMGatewayError) as exc_info:
+            asyncio.run(gateway.complete("失败"))
+
+    assert exc_info.value.status == 429
+    assert len(server.requests) == 2
+    assert gateway.stats.failures == 1
+
+
+def test_identical_concurrent_requests_are_coalesced():
+    """测试内容相同的并发请求只发送一次"""
+    with FakeLLMServer(delay=0.05) as server:
+        gateway = LLMGateway.from_url(server.base_url)
+
+        async def run():
+            return await asyncio.gather(*(gateway.complete("同一个问题") for _ in range(5)))
+
+        replies = asyncio.run(run())
+
+    assert replies == ["echo: 同一个问题"] * 5
+    assert len(server.requests) == 1
+    assert gateway.stats.coalesced == 4
+
+
+def test_concurrency_is_capped():
+    """测试同时在途的请求数不超过 max_concurrency"""
+    with FakeLLMServer(delay=0.05) as server:
+        gateway = LLMGateway.from_url(server.base_url, max_concurrency=2)
+
+        async def run():
+            return await asyncio.gather(*(gateway.complete(f"问题{i}") for i in range(6)))
+
+        asyncio.run(run())
+
+    assert len(server.requests) == 6
+    assert server.max_in_flight <= 2
+
+
+def test_token_bucket_waits_when_exhausted():
+    """测试令牌耗尽后按补充速率等待"""
+    now = [0.0]
+    bucket = TokenBucket(tokens_per_minute=60, capacity=10, clock=lambda: now[0])
+
+    async def run():
+        assert await bucket.acquire(10) == 0.0
+        bucket.debit(-4)
+        assert bucket.available == 4
+
+    asyncio.run(run())
+    now[0] += 6.0
+    assert bucket.available == 10
+
+
+def test_complete_sync_from_synchronous_code():
+    """测试同步代码通过后台事件循环调用网关"""
+    with FakeLLMServer() as server:
+        gateway = LLMGateway.from_url(server.base_url)
+        try:
+            first = gateway.complete_sync("一")
+            second = gateway.complete_sync("二", system_message="系统")
+        finally:
+            gateway.close()
+
+    assert (first, second) == ("echo: 一", "echo: 二")
+    assert server.requests[1]["messages"][0] == {"role": "system", "content": "系统"}
+    assert server.connections == 1
+
+
+def test_validator_falls_back_to_shared_gateway():
+    """测试未传入 model_client 时自我修正走共享网关"""
+    corrected = json.dumps(
+        {"emotion_type": "愤怒", "confidence": 0.9, "intervention_actions": [], "reason": "修正"}
+    )
+    with FakeLLMServer(responder=lambda request: corrected) as server:
+        configure_llm_gateway(LLMGateway.from_url(server.base_url))
+        try:
+            result = asyncio.run(OutputValidator(EmotionWorkerOutput).validate_output("无效输出"))
+        finally:
+            configure_llm_gateway(None)
+
+    assert result.emotion_type == "愤怒"
+    assert len(server.requests) == 1
+
+
+def test_gateway_records_call_latency_tokens_and_errors():
+    """测试网关按模型记录调用耗时、token 用量和错误率"""
+    registry = MetricsRegistry()
+    with FakeLLMServer(responder=lambda request: "x" * 40) as server:
+        gateway = LLMGateway.from_url(server.base_url, model="fake", max_retries=0, metrics=registry)
+        asyncio.run(gateway.complete("y" * 80))
+    with FakeLLMServer(fail_first=1) as server:
+        failing = LLMGateway.from_url(server.base_url, model="fake", max_retries=0, metrics=registry)
+        with pytest.raises(LLMGatewayError):
+            asyncio.run(failing.complete("失败"))
+
+    latency = registry.get("llm_call_seconds")
+    assert latency.snapshot(model="fake", outcome="ok").count == 1
+    assert latency.snapshot(model="fake", outcome="failed").count == 1
+    assert registry.get("llm_tokens_total").value(model="fake", kind="completion") == 10
+    assert registry.get("llm_call_error_rate").rate(model="fake") == 0.5
+
+
+class GatedBackend:
+    """等待放行后才返回的后端，用于控制请求在途时间"""
+
+    def __init__(self):
+        self.calls = 0
+        self.cancelled = 0
+        self.release = None
+
+    async def send(self, payload):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return {"choices": [{"message": {"content": "ok"}}]}
+
+    async def close(self):
+        pass
+
+
+def test_cancelling_first_caller_does_not_fail_coalesced_callers():
+    """测试发起请求的调用方被取消后，合并进来的调用方仍拿到后端结果"""
+    backend = GatedBackend()
+    gateway = LLMGateway(backend, model="fake")
+
+    async def run():
+        backend.release = asyncio.Event()
+        first = asyncio.create_task(gateway.complete("同一个问题"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(gateway.complete("同一个问题"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        backend.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "ok"
+    assert backend.calls == 1
+    assert backend.cancelled == 0
+    assert gateway.stats.coalesced == 1
+
+
+def test_request_is_cancelled_when_every_caller_leaves():
+    """测试所有调用方都取消后请求随之取消，之后的相同请求重新发送"""
+    backend = GatedBackend()
+    gateway = LLMGateway(backend, model="fake")
+
+    async def run():
+        backend.release = asyncio.Event()
+        callers = [asyncio.create_task(gateway.complete("问题")) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        backend.release.set()
+        return await gateway.complete("问题")
+
+    assert asyncio.run(run()) == "ok"
+    assert backend.cancelled == 1
+    assert backend.calls == 2
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class APIConnectionError(Exception):
+    pass
+
+
+@pytest.mark.parametrize(
+    ("error", "retryable"),
+    [
+        (StatusError(429), True),
+        (StatusError(503), True),
+        (StatusError(400), False),
+        (StatusError(401), False),
+        (APIConnectionError("connection reset"), True),
+        (asyncio.TimeoutError(), True),
+        (ValueError("bad request body"), False),
+    ],
+)
+def test_model_client_errors_are_classified_by_status(error, retryable):
+    """测试 model_client 异常按状态码判断是否重试，连接和超时错误可重试"""
+
+    class FailingClient:
+        calls = 0
+
+        async def create(self, messages, extra_create_args=None):
+            FailingClient.calls += 1
+            raise error
+
+    gateway = LLMGateway.from_model_client(FailingClient(), max_retries=1, backoff_base=0.0)
+
+    with pytest.raises(LLMGatewayError) as exc_info:
+        asyncio.run(gateway.complete("问题"))
+
+    assert exc_info.value.retryable is retryable
+    assert FailingClient.calls == (2 if retryable else 1)
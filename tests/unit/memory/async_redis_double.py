@@ -0,0 +1,50 @@
+import asyncio
+
+from tests.unit.memory.test_memory_service import FakeRedis
+
+
+class FakePipeline:
+    def __init__(self, client, transaction):
+        self.client = client
+        self.transaction = transaction
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        commands, self.commands = self.commands, []
+        return await self.client._round_trip(commands, self.transaction)
+
+
+class AsyncFakeRedis:
+    """redis.asyncio 风格的替身：命令是协程，管道在 execute 时一次往返执行"""
+
+    def __init__(self, latency=0.0):
+        self.store = FakeRedis()
+        self.latency = latency
+        self.round_trips = 0
+        self.transactions = []
+
+    @property
+    def ttl(self):
+        return self.store.ttl
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self, transaction)
+
+    def __getattr__(self, name):
+        async def command(*args, **kwargs):
+            return (await self._round_trip([(name, args, kwargs)], False))[0]
+
+        return command
+
+    async def _round_trip(self, commands, transaction):
+        self.round_trips += 1
+        self.transactions.append(transaction)
+        await asyncio.sleep(self.latency)
+        return [getattr(self.store, name)(*args, **kwargs) for name, args, kwargs in commands]
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from game_monitoring.infrastructure.memory.memory_service import MemoryService, ShortTermMemory
+from tests.unit.memory.async_redis_double import AsyncFakeRedis
+
+
+def _memory(session_id, index, base_time=datetime(2025, 1, 1)):
+    return ShortTermMemory(
+        session_id=session_id,
+        timestamp=base_time + timedelta(seconds=index),
+        role="user",
+        content=f"{session_id} message {index}",
+    )
+
+
+def test_append_short_term_uses_one_transaction():
+    """测试单条写入的三条命令在一个事务管道中一次往返完成"""
+    client = AsyncFakeRedis()
+    service = MemoryService(client=client, short_term_window=3)
+
+    async def run():
+        for index in range(5):
+            await service.append_short_term("s1", _memory("s1", index))
+        return await service.get_short_term("s1")
+
+    memories = asyncio.run(run())
+
+    assert [memory.content for memory in memories] == ["s1 message 2", "s1 message 3", "s1 message 4"]
+    assert client.round_trips == 6
+    assert client.transactions[:5] == [True] * 5
+    assert client.ttl["memory:session:s1:short"] == 7 * 24 * 3600
+
+
+def test_append_many_and_get_short_term_many_use_single_round_trip():
+    """测试多会话批量写入和批量读取各只有一次往返"""
+    client = AsyncFakeRedis()
+    service = MemoryService(client=client, short_term_window=2)
+    memories = [_memory(session_id, index) for index in range(3) for session_id in ("a", "b", "c")]
+
+    async def run():
+        await service.append_many(memories)
+        writes = client.round_trips
+        result = await service.get_short_term_many(["a", "b", "missing", "a"])
+        return writes, result
+
+    writes, result = asyncio.run(run())
+
+    assert writes == 1
+    assert client.round_trips == 2
+    assert client.transactions == [True, False]
+    assert list(result) == ["a", "b", "missing"]
+    assert [memory.content for memory in result["b"]] == ["b message 1", "b message 2"]
+    assert result["missing"] == []
+
+
+def test_concurrent_appends_do_not_block_event_loop():
+    """测试并发写入在等待往返时交出事件循环"""
+    client = AsyncFakeRedis(latency=0.05)
+    service = MemoryService(client=client)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*(service.append_short_term(f"s{index}", _memory(f"s{index}", 0)) for index in range(20)))
+        return loop.time() - start
+
+    elapsed = asyncio.run(run())
+
+    assert client.round_trips == 20
+    assert elapsed < 0.5
+
+
+def test_long_term_round_trip_through_pipeline():
+    """测试长期记忆写入与续期在一个事务中完成"""
+    client = AsyncFakeRedis()
+    service = MemoryService(client=client)
+
+    async def run():
+        await service.update_long_term("s1", "玩家已被安抚", [])
+        return await service.get_long_term("s1")
+
+    long_memory = asyncio.run(run())
+
+    assert long_memory.summary == "玩家已被安抚"
+    assert client.transactions == [True, False]
+    assert client.ttl["memory:session:s1:long:summary"] == 30 * 24 * 3600
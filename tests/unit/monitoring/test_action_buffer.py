@@ -0,0 +1,101 @@
+import pytest
+
+from game_monitoring.monitoring.action_buffer import ActionRingBuffer
+from game_monitoring.monitoring.behavior_monitor import BehaviorMonitor
+from game_monitoring.monitoring.behavior_monitor_v2 import BehaviorMonitorV2
+
+
+def _action(name):
+    return {"action": name, "params": {}}
+
+
+def test_ring_buffer_keeps_latest_actions_in_order():
+    """环形缓冲区超出容量后只保留最新的动作，且保持时间顺序。"""
+    buffer = ActionRingBuffer(3)
+
+    for name in ("a", "b", "c", "d", "e"):
+        buffer.append(_action(name))
+
+    assert len(buffer) == 3
+    assert [item["action"] for item in buffer.view()] == ["c", "d", "e"]
+    assert [item["action"] for item in reversed(buffer.view())] == ["e", "d", "c"]
+    assert buffer.latest()["action"] == "e"
+
+
+def test_ring_buffer_window_view_supports_slicing_and_equality():
+    """窗口视图支持负索引、切片和与列表比较。"""
+    buffer = ActionRingBuffer(5)
+    for name in ("a", "b", "c", "d"):
+        buffer.append(_action(name))
+
+    window = buffer.window(3)
+
+    assert window[-1]["action"] == "d"
+    assert [item["action"] for item in window[-2:]] == ["c", "d"]
+    assert window == [_action("b"), _action("c"), _action("d")]
+    assert buffer.window(10) == buffer.view()
+
+
+def test_ring_buffer_view_rejects_overwritten_records():
+    """视图指向的记录被覆盖后访问应报错，而不是静默返回新数据。"""
+    buffer = ActionRingBuffer(2)
+    buffer.append(_action("a"))
+    view = buffer.view()
+
+    buffer.append(_action("b"))
+    buffer.append(_action("c"))
+
+    with pytest.raises(IndexError):
+        view[0]
+
+
+def test_behavior_monitor_caps_sequence_with_ring_buffer():
+    """BehaviorMonitor 的序列长度受 max_sequence_length 限制。"""
+    monitor = BehaviorMonitor(max_sequence_length=4, recent_actions_window=2)
+
+    for index in range(10):
+        monitor.add_atomic_action("player_1", f"action_{index}")
+
+    sequence = monitor.get_player_action_sequence("player_1")
+    recent = monitor.get_recent_actions_for_analysis("player_1")
+
+    assert [item["action"] for item in sequence] == [
+        "action_6",
+        "action_7",
+        "action_8",
+        "action_9",
+    ]
+    assert [item["action"] for item in recent] == ["action_8", "action_9"]
+
+
+def test_behavior_monitor_v2_caps_sequence_with_ring_buffer():
+    """BehaviorMonitorV2 与旧版一样使用环形缓冲区限制序列长度。"""
+    monitor = BehaviorMonitorV2(max_sequence_length=3, recent_actions_window=2)
+
+    for index in range(5):
+        monitor.add_atomic_action("player_1", f"action_{index}")
+
+    assert [item["action"] for item in monitor.get_player_action_sequence("player_1")] == [
+        "action_2",
+        "action_3",
+        "action_4",
+    ]
+    assert len(monitor.get_recent_actions_for_analysis("player_1")) == 2
+
+    monitor.clear_player_sequence("player_1")
+
+    assert monitor.get_player_action_sequence("player_1") == []
+
+
+def test_public_getters_return_snapshots_that_survive_later_appends():
+    """公开的序列和窗口获取方法返回列表快照，缓冲区覆盖后仍可访问。"""
+    for monitor in (BehaviorMonitor(max_sequence_length=3), BehaviorMonitorV2(max_sequence_length=3)):
+        monitor.add_atomic_action("player_1", "action_0")
+        sequence = monitor.get_player_action_sequence("player_1")
+        recent = monitor.get_recent_actions_for_analysis("player_1")
+
+        for index in range(1, 6):
+            monitor.add_atomic_action("player_1", f"action_{index}")
+
+        assert [item["action"] for item in sequence] == ["action_0"]
+        assert recent[-1]["action"] == "action_0"
@@ -0,0 +1,51 @@
+import sys
+from datetime import datetime
+
+from game_monitoring.monitoring.action_record import ActionRecord, ActionVocabulary, get_action_vocabulary
+from game_monitoring.monitoring.behavior_monitor import BehaviorMonitor
+
+
+def test_vocabulary_interns_definitions_and_new_actions():
+    """编码表预置 PlayerActionDefinitions 中的动作，并为新动作追加编码。"""
+    vocabulary = ActionVocabulary.from_definitions()
+
+    assert vocabulary.code("login") == 0
+    assert "uninstall_game" in vocabulary
+    assert "custom_action" not in vocabulary
+
+    code = vocabulary.code("custom_action")
+    assert code == len(vocabulary) - 1
+    assert vocabulary.code("custom_action") == code
+    assert vocabulary.name(code) == "custom_action"
+
+
+def test_action_record_exposes_legacy_dict_shape():
+    """紧凑记录仍可按旧版动作字典的键读取，并可还原为字典。"""
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    record = ActionRecord.create("player_1", "lose_pvp", {"opponent_id": "p2"}, timestamp)
+
+    assert record.action_code == get_action_vocabulary().code("lose_pvp")
+    assert record["action"] == "lose_pvp"
+    assert record.get("params") == {"opponent_id": "p2"}
+    assert record.get("missing", "default") == "default"
+    assert dict(record) == {
+        "action": "lose_pvp",
+        "params": {"opponent_id": "p2"},
+        "timestamp": timestamp,
+        "player_id": "player_1",
+    }
+    assert record == record.to_dict()
+    assert not hasattr(record, "__dict__")
+    assert sys.getsizeof(record) < sys.getsizeof(record.to_dict())
+
+
+def test_behavior_monitor_stores_compact_records():
+    """BehaviorMonitor 的动作序列保存紧凑记录，规则引擎照常识别场景。"""
+    monitor = BehaviorMonitor()
+
+    triggered = monitor.add_atomic_action("player_1", "make_payment", {"amount": 6})
+    sequence = monitor.get_player_action_sequence("player_1")
+
+    assert isinstance(sequence[-1], ActionRecord)
+    assert sequence[-1]["params"] == {"amount": 6}
+    assert "充值行为积极表现" in {item["scenario"] for item in triggered}
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from game_monitoring.monitoring.behavior_history import BehaviorHistoryStore
+from game_monitoring.monitoring.behavior_monitor import BehaviorMonitor
+from game_monitoring.monitoring.behavior_monitor_v2 import BehaviorMonitorV2
+from game_monitoring.simulator.player_behavior import PlayerBehavior
+
+
+def _behavior(player_id, action):
+    return PlayerBehavior(player_id, datetime.now(), action)
+
+
+def test_history_store_indexes_records_per_player():
+    """历史存储按玩家索引，并保留全局写入顺序。"""
+    store = BehaviorHistoryStore()
+
+    store.append(_behavior("p1", "a"))
+    store.append(_behavior("p2", "b"))
+    store.append(_behavior("p1", "c"))
+
+    assert [b.action for b in store.for_player("p1")] == ["a", "c"]
+    assert [b.action for b in store.for_player("p1", limit=1)] == ["c"]
+    assert [b.action for b in store] == ["a", "b", "c"]
+    assert store.count("p2") == 1
+    assert store.for_player("missing") == []
+
+
+def test_history_store_global_retention_evicts_from_player_index():
+    """全局上限淘汰的记录同时从玩家索引中移除。"""
+    store = BehaviorHistoryStore(max_records=3, max_records_per_player=10)
+
+    for action in ("a", "b", "c"):
+        store.append(_behavior("p1", action))
+    store.append(_behavior("p2", "d"))
+
+    assert len(store) == 3
+    assert [b.action for b in store.for_player("p1")] == ["b", "c"]
+    assert [b.action for b in store] == ["b", "c", "d"]
+
+
+def test_history_store_player_retention_caps_single_player():
+    """单玩家上限只保留该玩家最近的记录。"""
+    store = BehaviorHistoryStore(max_records=100, max_records_per_player=2)
+
+    for action in ("a", "b", "c"):
+        store.append(_behavior("p1", action))
+
+    assert [b.action for b in store.for_player("p1")] == ["b", "c"]
+
+
+def test_monitors_use_bounded_player_history():
+    """两个版本的监控器都通过玩家索引返回有界历史。"""
+    for monitor in (
+        BehaviorMonitor(max_player_history_length=2),
+        BehaviorMonitorV2(max_player_history_length=2),
+    ):
+        for action in ("login", "sell_item", "logout"):
+            monitor.add_atomic_action("player_1", action)
+        monitor.add_atomic_action("player_2", "login")
+
+        history = monitor.get_player_history("player_1")
+
+        assert [b.action for b in history] == ["sell_item", "logout"]
+        assert len(monitor.behavior_history) == 4
@@ -0,0 +1,42 @@
+from game_monitoring.monitoring.behavior_monitor import BehaviorMonitor
+from game_monitoring.monitoring.behavior_monitor_v2 import BehaviorMonitorV2
+from game_monitoring.monitoring.event_store import PlayerEventStore
+
+
+def test_event_store_views_share_the_same_records():
+    """序列视图和历史视图读取同一条记录，时间戳只取一次。"""
+    store = PlayerEventStore(max_sequence_length=2)
+
+    first = store.record("p1", "login")
+    second = store.record("p1", "sell_item", {"item_id": "sword"})
+    store.record("p1", "logout")
+
+    assert [item["action"] for item in store.sequence("p1")] == ["sell_item", "logout"]
+    assert store.sequence("p1")[0] is second
+    assert store.player_history("p1")[0] is first
+    assert store.player_history("p1")[1].metadata == {"item_id": "sword"}
+    assert store.window("p1", 1)[0] is store.player_history("p1")[-1]
+
+
+def test_reset_sequence_keeps_history():
+    """清空序列视图不影响历史视图。"""
+    store = PlayerEventStore()
+    store.record("p1", "login")
+
+    store.reset_sequence("p1")
+
+    assert store.sequence("p1") == []
+    assert [item.action for item in store.player_history("p1")] == ["login"]
+
+
+def test_monitors_store_each_action_once():
+    """两个版本的监控器中，序列与历史持有同一个记录对象。"""
+    for monitor in (BehaviorMonitor(), BehaviorMonitorV2()):
+        monitor.add_atomic_action("player_1", "make_payment", {"amount": 6})
+
+        sequence_record = monitor.get_player_action_sequence("player_1")[-1]
+        history_record = monitor.get_player_history("player_1")[-1]
+
+        assert sequence_record is history_record
+        assert history_record.timestamp == sequence_record["timestamp"]
+        assert history_record.result == "success"
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import urllib.request
+from unittest.mock import AsyncMock
+
+import pytest
+
+from game_monitoring.domain.schemas import EmotionWorkerOutput
+from game_monitoring.infrastructure.monitoring.metrics import MetricsRegistry, serve_metrics
+from game_monitoring.infrastructure.monitoring.output_metrics import OutputMetrics
+from game_monitoring.infrastructure.validation.output_validator import (
+    OutputValidationError,
+    OutputValidator,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_histogram_memory_is_fixed_and_quantiles_are_estimated():
+    """测试直方图只保存桶计数，分位数按桶插值估算"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "耗时", ("worker_type",), buckets=(0.1, 0.5, 1.0))
+
+    for _ in range(10_000):
+        histogram.observe(0.05, worker_type="emotion")
+    histogram.observe(0.7, worker_type="emotion")
+    histogram.observe(3.0, worker_type="emotion")
+
+    snapshot = histogram.snapshot(worker_type="emotion")
+    assert snapshot.counts == (10_000, 0, 1, 1)
+    assert snapshot.count == 10_002
+    assert snapshot.quantile(0.5) < 0.1
+    assert snapshot.quantile(1.0) == 1.0
+    assert histogram.snapshot(worker_type="churn").count == 0
+
+
+def test_labels_must_match_declaration():
+    """测试标签与声明不一致时报错，同名指标重复注册返回同一实例"""
+    registry = MetricsRegistry()
+    counter = registry.counter("calls_total", "调用次数", ("schema",))
+
+    with pytest.raises(ValueError):
+        counter.inc(worker="emotion")
+    with pytest.raises(ValueError):
+        registry.histogram("calls_total", "调用次数", ("schema",))
+    assert registry.counter("calls_total", "调用次数", ("schema",)) is counter
+
+
+def test_rolling_rate_forgets_old_slots():
+    """测试滑动窗口错误率只统计窗口内的记录"""
+    clock = FakeClock()
+    registry = MetricsRegistry(clock=clock)
+    rate = registry.rolling_rate("error_rate", "错误率", ("schema",), window_seconds=60, slots=6)
+
+    for _ in range(3):
+        rate.record(True, schema="A")
+    rate.record(False, schema="A")
+    clock.now = 50
+    rate.record(False, schema="B")
+
+    assert rate.rate(schema="A") == 0.75
+    assert rate.totals() == (5, 3)
+
+    clock.now = 65
+    assert rate.rate(schema="A") == 0.0
+    assert rate.rate(schema="B") == 0.0
+    assert rate.totals() == (1, 0)
+
+
+def test_render_prometheus_text():
+    """测试 Prometheus 文本格式导出"""
+    registry = MetricsRegistry()
+    registry.counter("calls_total", "调用次数", ("schema",)).inc(2, schema='A"B')
+    registry.histogram("latency_seconds", "耗时", buckets=(0.1, 1.0)).observe(0.5)
+
+    text = registry.render()
+
+    assert "# TYPE calls_total counter" in text
+    assert 'calls_total{schema="A\\"B"} 2' in text
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{le="0.1"} 0' in text
+    assert 'latency_seconds_bucket{le="1"} 1' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 1' in text
+    assert "latency_seconds_sum 0.5" in text
+    assert "latency_seconds_count 1" in text
+
+
+def test_serve_metrics_endpoint():
+    """测试本地 /metrics 端点"""
+    registry = MetricsRegistry()
+    registry.counter("calls_total", "调用次数").inc()
+    server = serve_metrics(registry, port=0)
+    try:
+        host, port = server.server_address[:2]
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert "calls_total 1" in body
+
+
+def test_output_metrics_keeps_bounded_retry_history():
+    """测试重试明细只保留最近的记录，平均值仍按全部记录计算"""
+    metrics = OutputMetrics(registry=MetricsRegistry(), recent_size=3)
+
+    for retries in (0, 1, 2, 3, 4):
+        metrics.record_validation(success=retries < 4, retries=retries, schema="EmotionWorkerOutput")
+
+    assert metrics.retry_counts == [2, 3, 4]
+    assert metrics.get_avg_retries() == 2.0
+    assert metrics.get_recent_error_rate() == 0.2
+    assert metrics.validations.value(schema="EmotionWorkerOutput", outcome="retried") == 3
+    assert metrics.validations.value(schema="EmotionWorkerOutput", outcome="failed") == 1
+
+
+def test_validator_records_latency_and_outcome_by_schema():
+    """测试验证器按 Schema 记录耗时、重试次数和结果"""
+    registry = MetricsRegistry()
+    metrics = OutputMetrics(registry=registry)
+    valid = json.dumps({"emotion_type": "愤怒", "confidence": 0.9, "intervention_actions": [], "reason": "ok"})
+    client = AsyncMock()
+    client.create.return_value.choices = [type("Choice", (), {"message": type("Msg", (), {"content": valid})})()]
+    validator = OutputValidator(EmotionWorkerOutput, max_retries=2, local_repair=False, metrics=metrics)
+
+    asyncio.run(validator.validate_output(valid))
+    asyncio.run(validator.validate_output("无效", model_client=client))
+    client.create.return_value.choices[0].message.content = "仍然无效"
+    with pytest.raises(OutputValidationError):
+        asyncio.run(validator.validate_output("无效", model_client=client))
+
+    assert metrics.retry_counts == [0, 1, 1]
+    assert metrics.latency.snapshot(schema="EmotionWorkerOutput").count == 3
+    assert metrics.validations.value(schema="EmotionWorkerOutput", outcome="ok") == 1
+    assert metrics.validations.value(schema="EmotionWorkerOutput", outcome="retried") == 1
+    assert metrics.validations.value(schema="EmotionWorkerOutput", outcome="failed") == 1
+    assert 'output_validation_seconds_count{schema="EmotionWorkerOutput"} 3' in metrics.render()
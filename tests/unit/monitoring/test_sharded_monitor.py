@@ -0,0 +1,91 @@
+import itertools
+import threading
+from datetime import datetime, timedelta
+
+from game_monitoring.core.bootstrap import create_production_container
+from game_monitoring.core.context import SystemConfig
+from game_monitoring.monitoring import action_record
+from game_monitoring.monitoring.behavior_monitor import BehaviorMonitor
+from game_monitoring.monitoring.sharded_monitor import ShardedBehaviorMonitor, shard_index
+
+
+def test_sharded_monitor_keeps_per_player_order_under_concurrent_ingestion():
+    """多个采集线程并发写入时，每个玩家的动作序列保持完整有序。"""
+    monitor = ShardedBehaviorMonitor(shard_count=4, max_sequence_length=500)
+    players = [f"player_{index}" for index in range(8)]
+    per_player = 200
+    start = threading.Barrier(len(players))
+
+    def ingest(player_id):
+        start.wait()
+        for step in range(per_player):
+            monitor.add_atomic_action(player_id, "login", {"step": step})
+
+    threads = [threading.Thread(target=ingest, args=(player_id,)) for player_id in players]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for player_id in players:
+        steps = [item["params"]["step"] for item in monitor.get_player_action_sequence(player_id)]
+        assert steps == list(range(per_player))
+        assert len(monitor.get_player_history(player_id)) == per_player
+    assert len(monitor.behavior_history) == len(players) * per_player
+
+
+def test_sharded_monitor_matches_single_monitor_api():
+    """分片监控器与 BehaviorMonitor 的公开接口行为一致。"""
+    sharded = ShardedBehaviorMonitor(shard_count=3)
+    single = BehaviorMonitor()
+
+    for monitor in (sharded, single):
+        monitor.add_atomic_action("p1", "make_payment", {"amount": 6})
+        monitor.increment_negative_count("p1")
+
+    assert sharded.get_triggered_scenarios("p1") == single.get_triggered_scenarios("p1")
+    assert sharded.get_negative_count("p1") == single.get_negative_count("p1") == 1
+    assert [item["action"] for item in sharded.get_player_action_sequence("p1")] == ["make_payment"]
+    assert sharded.get_player_action_sequence("missing") == []
+
+    sharded.clear_player_sequence("p1")
+    assert sharded.get_player_action_sequence("p1") == []
+    assert 0 <= shard_index("p1", 3) < 3
+
+
+def test_bootstrap_uses_sharded_monitor_when_configured():
+    """配置 monitor_shards > 1 时容器注册分片监控器。"""
+    container = create_production_container(SystemConfig(monitor_shards=4))
+
+    monitor = container.resolve("BehaviorMonitorType")
+
+    assert isinstance(monitor, ShardedBehaviorMonitor)
+    assert monitor.shard_count == 4
+
+
+def test_sharded_history_supports_indexing_like_single_monitor(monkeypatch):
+    """分片后的 behavior_history 与未分片时一样支持负下标和切片，按时间顺序排列。"""
+    ticks = itertools.count()
+
+    class SteppingClock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2026, 1, 1) + timedelta(seconds=next(ticks))
+
+    monkeypatch.setattr(action_record, "datetime", SteppingClock)
+    sharded = ShardedBehaviorMonitor(shard_count=4)
+    single = BehaviorMonitor()
+    players = [f"player_{index}" for index in range(6)]
+
+    for step in range(3):
+        for player_id in players:
+            for monitor in (sharded, single):
+                monitor.add_atomic_action(player_id, f"action_{step}")
+
+    def keys(records):
+        return [(record.player_id, record.action) for record in records]
+
+    assert keys([sharded.behavior_history[-1]]) == [("player_5", "action_2")]
+    assert keys([sharded.behavior_history[0]]) == [("player_0", "action_0")]
+    assert keys(sharded.behavior_history[-4:]) == keys(list(single.behavior_history)[-4:])
+    assert keys(sharded.behavior_history) == keys(single.behavior_history)
@@ -0,0 +1,78 @@
+from game_monitoring.infrastructure.monitoring.tracer import TraceLevel, Tracer, subscribe_console
+from game_monitoring.monitoring import behavior_monitor
+from game_monitoring.monitoring.behavior_monitor import BehaviorMonitor
+
+
+def test_tracer_is_disabled_without_subscribers():
+    """没有订阅者时任何级别都不启用。"""
+    tracer = Tracer()
+
+    assert not tracer.enabled(TraceLevel.ERROR)
+
+
+def test_tracer_delivers_events_by_subscriber_level():
+    """事件只投递给级别满足要求的订阅者，模板在渲染时才格式化。"""
+    tracer = Tracer()
+    info_events, debug_events = [], []
+    tracer.subscribe(info_events.append, TraceLevel.INFO)
+    unsubscribe = tracer.subscribe(debug_events.append, TraceLevel.DEBUG)
+
+    tracer.debug("monitor.detail", "动作 {action}", action="login")
+    tracer.info("tool.start", "分析玩家 {player_id}", player_id="p1")
+
+    assert [event.name for event in debug_events] == ["monitor.detail", "tool.start"]
+    assert [event.render() for event in info_events] == ["分析玩家 p1"]
+
+    unsubscribe()
+
+    assert not tracer.enabled(TraceLevel.DEBUG)
+    assert tracer.enabled(TraceLevel.INFO)
+
+
+def test_tracer_samples_configured_events():
+    """按事件名配置的采样率会丢弃部分事件。"""
+    samples = iter([0.1, 0.9, 0.4])
+    tracer = Tracer(random_source=lambda: next(samples))
+    events = []
+    tracer.subscribe(events.append, TraceLevel.DEBUG)
+    tracer.set_sample_rate("hot.event", 0.5)
+
+    for _ in range(3):
+        tracer.debug("hot.event")
+    tracer.debug("cold.event")
+
+    assert [event.name for event in events] == ["hot.event", "hot.event", "cold.event"]
+
+
+def test_behavior_monitor_emits_trace_events_instead_of_printing(monkeypatch, capsys):
+    """BehaviorMonitor 热路径通过追踪器输出，不再直接写 stdout。"""
+    tracer = Tracer()
+    events = []
+    tracer.subscribe(events.append, TraceLevel.DEBUG)
+    monkeypatch.setattr(behavior_monitor, "get_tracer", lambda: tracer)
+
+    monitor = BehaviorMonitor()
+    monitor.add_atomic_action("player_1", "make_payment")
+
+    names = [event.name for event in events]
+    assert "monitor.action_window" in names
+    assert "monitor.scenario_triggered" in names
+    assert capsys.readouterr().out == ""
+
+
+def test_console_subscription_follows_trace_level_env(monkeypatch, capsys):
+    """命令行订阅默认输出全部级别，TRACE_LEVEL 可调高级别或关闭，重复订阅只保留一个。"""
+    tracer = Tracer()
+    subscribe_console(tracer=tracer)
+    subscribe_console(tracer=tracer)
+    tracer.debug("monitor.detail", "动作 {action}", action="login")
+    assert capsys.readouterr().out == "动作 login\n"
+
+    monkeypatch.setenv("TRACE_LEVEL", "warning")
+    subscribe_console(tracer=tracer)
+    assert not tracer.enabled(TraceLevel.INFO)
+    assert tracer.enabled(TraceLevel.WARNING)
+
+    monkeypatch.setenv("TRACE_LEVEL", "off")
+    subscribe_console(tracer=tracer)
+    assert not tracer.enabled(TraceLevel.ERROR)
@@ -0,0 +1,99 @@
+import random
+
+import pyarrow as pa
+
+from game_monitoring.rules import RuleEngine, RuleRegistry
+from game_monitoring.rules.batch import ActionTable, BatchRuleEvaluator
+from game_monitoring.rules.definitions import (
+    ChurnRiskRule,
+    ConsecutiveAttacksRule,
+    ConsecutiveFailuresRule,
+    SocialWithdrawalRule,
+    StaminaExhaustionRule,
+)
+
+ACTIONS = [
+    "lose_pvp", "complete_dungeon", "recruit_hero", "be_attacked", "leave_family",
+    "remove_friend", "clear_backpack", "sell_item", "stamina_exhausted", "login",
+]
+
+
+def _random_records(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            "player_id": rng.choice(["p1", "p2", "p3"]),
+            "action": rng.choice(ACTIONS),
+            "params": {"status": rng.choice(["fail", "success", ""])},
+            "timestamp": index,
+        }
+        for index in range(count)
+    ]
+
+
+def test_batch_evaluation_matches_streaming_engine():
+    """向量化批量评估与逐条流式评估的触发结果一致。"""
+    records = _random_records(600)
+    registry = RuleRegistry()
+    for rule in (ConsecutiveFailuresRule(), SocialWithdrawalRule(), ChurnRiskRule(),
+                 StaminaExhaustionRule(), ConsecutiveAttacksRule()):
+        registry.register(rule)
+    engine = RuleEngine(registry)
+
+    max_sequence_length = 20
+    sequences, expected = {}, set()
+    for row, record in enumerate(records):
+        sequence = sequences.setdefault(record["player_id"], [])
+        sequence.append(record)
+        evicted = sequence.pop(0) if len(sequence) > max_sequence_length else None
+        for result in engine.process_action(record["player_id"], record, sequence, evicted=evicted):
+            expected.add((row, result.rule_id))
+
+    result = BatchRuleEvaluator(window_size=3, max_sequence_length=max_sequence_length).evaluate(
+        ActionTable.from_records(records)
+    )
+
+    assert {(item["row"], item["rule_id"]) for item in result.to_records()} == expected
+
+
+def test_batch_evaluation_reports_player_positions_from_arrow_table():
+    """Arrow 输入按时间排序后返回 (玩家, 位置) 级别的触发结果。"""
+    table = pa.table({
+        "player_id": ["p1", "p2", "p1", "p1"],
+        "action": ["be_attacked", "be_attacked", "be_attacked", "be_attacked"],
+        "status": [None, None, None, None],
+        "timestamp": [3, 1, 1, 2],
+    })
+
+    result = BatchRuleEvaluator().evaluate(ActionTable.from_arrow(table))
+
+    assert result.to_records() == [{
+        "row": 0,
+        "player_id": "p1",
+        "position": 2,
+        "rule_id": "consecutive_attacks",
+        "scenario_name": "连续被攻击消极行为",
+    }]
+    assert result.counts() == {"consecutive_attacks": 1}
+
+
+def test_batch_stamina_only_counts_within_retained_sequence():
+    """体力耗尽间隔超过保留序列长度时不累计触发。"""
+    records = []
+    for hour in range(6):
+        records.append({"player_id": "p1", "action": "stamina_exhausted", "params": {}, "timestamp": hour * 10})
+        records.extend(
+            {"player_id": "p1", "action": "login", "params": {}, "timestamp": hour * 10 + offset}
+            for offset in range(1, 10)
+        )
+    records.append({"player_id": "p2", "action": "stamina_exhausted", "params": {}, "timestamp": 0})
+    records.extend(
+        {"player_id": "p2", "action": "stamina_exhausted", "params": {}, "timestamp": offset}
+        for offset in (5, 9)
+    )
+
+    result = BatchRuleEvaluator(max_sequence_length=10).evaluate(ActionTable.from_records(records))
+
+    assert {(item["player_id"], item["rule_id"]) for item in result.to_records()} == {
+        ("p2", "stamina_exhaustion")
+    }
@@ -0,0 +1,104 @@
+from game_monitoring.monitoring.behavior_monitor_v2 import BehaviorMonitorV2
+from game_monitoring.rules import RuleEngine, RuleRegistry
+from game_monitoring.rules.definitions import (
+    ConsecutiveAttacksRule,
+    ConsecutiveFailuresRule,
+    StaminaExhaustionRule,
+    build_legacy_rules,
+)
+
+
+def _feed(engine, player_id, names, **params):
+    actions, results = [], []
+    for name in names:
+        action = {"action": name, "params": dict(params)}
+        actions.append(action)
+        results = engine.process_action(player_id, action, actions)
+    return actions, results
+
+
+def test_incremental_state_matches_full_reevaluation():
+    """增量状态得到的结果与对完整序列重新评估一致。"""
+    registry = RuleRegistry().register(ConsecutiveFailuresRule()).register(StaminaExhaustionRule())
+    engine = RuleEngine(registry)
+    names = ["lose_pvp", "stamina_exhausted", "lose_pvp", "stamina_exhausted",
+             "stamina_exhausted", "lose_pvp", "lose_pvp", "lose_pvp"]
+
+    actions, streamed = _feed(engine, "p1", names, status="fail")
+    full = engine.analyze("p1", actions)
+
+    assert [r.to_dict() for r in streamed] == [r.to_dict() for r in full]
+    assert {r.rule_id for r in streamed} == {"consecutive_failures", "stamina_exhaustion"}
+
+
+def test_incremental_state_updates_even_when_plan_skips_rule():
+    """执行计划跳过的动作仍会更新增量状态，中断连续计数。"""
+    engine = RuleEngine(RuleRegistry().register(ConsecutiveAttacksRule()))
+
+    _, results = _feed(engine, "p1", ["be_attacked", "be_attacked", "login", "be_attacked"])
+    assert results == []
+
+    _, results = _feed(engine, "p2", ["be_attacked"] * 3)
+    assert [r.scenario_name for r in results] == ["连续被攻击消极行为"]
+
+
+def test_engine_runs_legacy_rules_and_resets_player_state():
+    """旧版规则可通过适配器在新引擎中运行，清空序列后增量状态重置。"""
+    registry = RuleRegistry()
+    for rule in build_legacy_rules():
+        registry.register(rule)
+    monitor = BehaviorMonitorV2(engine=RuleEngine(registry))
+
+    triggered = monitor.add_atomic_action("p1", "make_payment", {"amount": 6})
+    assert "充值行为积极表现" in {item["scenario_name"] for item in triggered}
+
+    monitor.add_atomic_action("p1", "be_attacked")
+    monitor.add_atomic_action("p1", "be_attacked")
+    monitor.clear_player_sequence("p1")
+    triggered = monitor.add_atomic_action("p1", "be_attacked")
+    assert "连续被攻击消极行为" not in {item["scenario_name"] for item in triggered}
+
+
+def test_incremental_state_drops_actions_evicted_from_sequence():
+    """动作移出保留序列后增量状态同步撤销，每一步都与完整重新评估一致。"""
+    registry = (
+        RuleRegistry()
+        .register(StaminaExhaustionRule())
+        .register(ConsecutiveAttacksRule())
+        .register(ConsecutiveFailuresRule())
+    )
+    engine = RuleEngine(registry)
+    monitor = BehaviorMonitorV2(engine=engine, max_sequence_length=5)
+    names = (["stamina_exhausted"] * 2 + ["login"] * 10 + ["stamina_exhausted"]
+             + ["be_attacked"] * 8 + ["lose_pvp"] * 7)
+
+    for name in names:
+        streamed = monitor.add_atomic_action("p1", name)
+        sequence = list(monitor.get_player_action_sequence("p1"))
+        full = [r.to_dict() for r in engine.analyze("p1", sequence) if r.triggered]
+        assert streamed == full, name
+
+    assert [item["description"] for item in streamed] == ["连续失败5次"]
+    assert "stamina_exhaustion" not in {item["rule_id"] for item in streamed}
+
+
+def test_reenabled_rule_rebuilds_state_from_sequence():
+    """规则停用期间到达的动作在重新启用后计入，结果与完整重新评估一致。"""
+    registry = RuleRegistry().register(StaminaExhaustionRule()).register(ConsecutiveAttacksRule())
+    engine = RuleEngine(registry)
+    actions = []
+
+    def feed(name):
+        action = {"action": name, "params": {}}
+        actions.append(action)
+        return engine.process_action("p1", action, actions)
+
+    feed("login")
+    registry.disable("stamina_exhaustion")
+    for _ in range(3):
+        feed("stamina_exhausted")
+    registry.enable("stamina_exhaustion")
+    streamed = feed("login")
+
+    assert [r.rule_id for r in streamed] == ["stamina_exhaustion"]
+    assert [r.to_dict() for r in streamed] == [r.to_dict() for r in engine.analyze("p1", actions)]
@@ -0,0 +1,50 @@
+from game_monitoring.rules import RuleEngine, RuleRegistry
+from game_monitoring.rules.definitions import ChurnRiskRule, ConsecutiveFailuresRule, StaminaExhaustionRule
+
+
+def _actions(*names, status="fail"):
+    return [{"action": name, "params": {"status": status}} for name in names]
+
+
+def test_registry_caches_plan_until_rules_change():
+    """执行计划在规则集合不变时复用，注册或启停规则后重新编译。"""
+    registry = RuleRegistry().register(ChurnRiskRule())
+    plan = registry.plan
+
+    assert registry.plan is plan
+
+    registry.register(StaminaExhaustionRule())
+    rebuilt = registry.plan
+    assert rebuilt is not plan
+    assert [rule.rule_id for rule in rebuilt.ordered] == ["stamina_exhaustion", "churn_risk"]
+
+    registry.disable("stamina_exhaustion")
+    assert [rule.rule_id for rule in registry.plan.ordered] == ["churn_risk"]
+
+    registry.enable("stamina_exhaustion")
+    registry.unregister("churn_risk")
+    assert [rule.rule_id for rule in registry.plan.ordered] == ["stamina_exhaustion"]
+
+
+def test_plan_only_selects_rules_interested_in_latest_action():
+    """声明了 action_names 的规则只在最新动作相关时参与评估。"""
+    registry = RuleRegistry()
+    registry.register(ConsecutiveFailuresRule()).register(ChurnRiskRule())
+
+    assert [rule.rule_id for rule in registry.plan.rules_for("login")] == ["churn_risk"]
+    assert [rule.rule_id for rule in registry.plan.rules_for("lose_pvp")] == [
+        "consecutive_failures",
+        "churn_risk",
+    ]
+
+
+def test_engine_results_match_full_scan_semantics():
+    """按动作索引筛选规则后，触发结果与逐条评估一致。"""
+    registry = RuleRegistry().register(ConsecutiveFailuresRule()).register(ChurnRiskRule())
+    engine = RuleEngine(registry)
+
+    triggered = engine.analyze("p1", _actions("lose_pvp", "complete_dungeon"))
+    assert [result.rule_id for result in triggered] == ["consecutive_failures"]
+
+    triggered = engine.analyze("p1", _actions("lose_pvp", "lose_pvp", "sell_item"))
+    assert [result.rule_id for result in triggered] == ["churn_risk"]
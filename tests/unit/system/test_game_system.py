@@ -115,3 +115,44 @@ def test_game_player_monitoring_system_logs_v2_intervention_result(monkeypatch):
     assert result["player_id"] == "player_1"
     assert fake_ui.activation_player_id == "player_1"
     assert fake_ui.intervention_result == result
+
+
+def test_threshold_interventions_are_scheduled_by_scenario_priority(monkeypatch):
+    """旧版负面行为阈值触发时带上命中情景，流失风险先于情绪和低优先级干预执行。"""
+    from datetime import datetime
+
+    from game_monitoring.application.services.intervention_scheduler import InterventionScheduler
+    from game_monitoring.simulator.player_behavior import PlayerBehavior
+
+    config_module = types.ModuleType("config")
+    config_module.custom_model_client = None
+    monkeypatch.setitem(sys.modules, "config", config_module)
+
+    game_system_module = importlib.import_module("game_monitoring.system.game_system")
+    game_system_module = importlib.reload(game_system_module)
+
+    system = game_system_module.GamePlayerMonitoringSystem(model_client=None)
+    handled = []
+
+    async def handler(player_id):
+        handled.append(player_id)
+
+    async def run():
+        system.scheduler = InterventionScheduler(handler, max_concurrency=1)
+        for player_id, action in [
+            ("player_comment", "发布消极评论"),
+            ("player_card", "不买月卡了"),
+            ("player_exit", "玩家点击退出游戏"),
+        ]:
+            for _ in range(system.monitor.threshold):
+                behavior = PlayerBehavior(player_id, datetime.now(), action)
+                if system.monitor.add_behavior(behavior):
+                    await system.schedule_intervention(player_id)
+                    system.monitor.reset_negative_count(player_id)
+        await system.scheduler.drain()
+
+    asyncio.run(run())
+
+    assert handled == ["player_exit", "player_comment", "player_card"]
+    scenarios = system.monitor.get_triggered_scenarios("player_exit")
+    assert [s["scenario"] for s in scenarios] == ["游戏卸载流失风险"]
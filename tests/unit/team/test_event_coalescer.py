@@ -0,0 +1,99 @@
+import asyncio
+
+from game_monitoring.domain.messages import PlayerEvent
+from game_monitoring.team.event_coalescer import PlayerEventCoalescer, merge_scenarios
+
+
+def _event(player_id, scenarios, history, session="s"):
+    return PlayerEvent(
+        player_id=player_id,
+        triggered_scenarios=[{"scenario": name} for name in scenarios],
+        behavior_history=[{"action": action} for action in history],
+        session_id=f"{player_id}-{session}",
+    )
+
+
+class RecordingDispatch:
+    def __init__(self, delay=0.0):
+        self.events = []
+        self.delay = delay
+
+    async def __call__(self, event):
+        self.events.append(event)
+        await asyncio.sleep(self.delay)
+        return {"player_id": event.player_id, "count": len(self.events)}
+
+
+def test_merge_scenarios_keeps_union_in_order():
+    """测试情景并集按名称去重并保留顺序"""
+    merged = merge_scenarios(
+        [{"scenario": "a", "v": 1}, {"scenario": "b"}],
+        [{"scenario": "a", "v": 2}, {"scenario": "c"}],
+    )
+
+    assert [item["scenario"] for item in merged] == ["a", "b", "c"]
+    assert merged[0]["v"] == 2
+
+
+def test_triggers_within_window_are_coalesced():
+    """测试防抖窗口内的多次触发合并为一次派发"""
+    dispatch = RecordingDispatch()
+
+    async def scenario():
+        coalescer = PlayerEventCoalescer(dispatch, debounce_seconds=0.05)
+        results = await asyncio.gather(
+            coalescer.submit(_event("p1", ["连续失败"], ["lose_pvp"], "1")),
+            coalescer.submit(_event("p1", ["流失风险"], ["lose_pvp", "uninstall"], "2")),
+            coalescer.submit(_event("p2", ["连续失败"], ["lose_pvp"], "3")),
+        )
+        return coalescer, results
+
+    coalescer, results = asyncio.run(scenario())
+
+    assert len(dispatch.events) == 2
+    p1_event = next(event for event in dispatch.events if event.player_id == "p1")
+    assert [s["scenario"] for s in p1_event.triggered_scenarios] == ["连续失败", "流失风险"]
+    assert [h["action"] for h in p1_event.behavior_history] == ["lose_pvp", "uninstall"]
+    assert p1_event.session_id == "p1-1"
+    assert results[0] is results[1]
+    assert coalescer.stats.merged == 1
+    assert coalescer.stats.dispatched == 2
+
+
+def test_duplicate_of_in_flight_event_is_dropped():
+    """测试与处理中事件相同的触发复用结果，不同内容则重新派发"""
+    dispatch = RecordingDispatch(delay=0.05)
+
+    async def scenario():
+        coalescer = PlayerEventCoalescer(dispatch, debounce_seconds=0.01)
+        first = asyncio.create_task(coalescer.submit(_event("p1", ["a"], ["x"], "1")))
+        await asyncio.sleep(0.02)  # 第一个事件已经派发，处理中
+        duplicate = await coalescer.submit(_event("p1", ["a"], ["x"], "2"))
+        changed = await coalescer.submit(_event("p1", ["a"], ["x", "y"], "3"))
+        return coalescer, await first, duplicate, changed
+
+    coalescer, first, duplicate, changed = asyncio.run(scenario())
+
+    assert duplicate is first
+    assert changed is not first
+    assert len(dispatch.events) == 2
+    assert coalescer.stats.deduplicated == 1
+
+
+def test_flush_dispatches_pending_and_propagates_errors():
+    """测试 flush 立即派发，派发异常传递给所有调用方"""
+
+    async def failing(event):
+        raise RuntimeError("runtime down")
+
+    async def scenario():
+        coalescer = PlayerEventCoalescer(failing, debounce_seconds=60)
+        submit = asyncio.create_task(coalescer.submit(_event("p1", ["a"], ["x"])))
+        await asyncio.sleep(0)
+        assert coalescer.pending_count() == 1
+        await coalescer.flush()
+        return await asyncio.gather(submit, return_exceptions=True)
+
+    (error,) = asyncio.run(scenario())
+
+    assert isinstance(error, RuntimeError)
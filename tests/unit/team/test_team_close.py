@@ -0,0 +1,43 @@
+import asyncio
+import threading
+import time
+
+from game_monitoring.team.team_manager import GameMonitoringTeamV2
+
+
+class SlowDeployment:
+    """close 时像 join Worker 进程一样阻塞的部署"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.closed_in = None
+
+    def close(self):
+        self.closed_in = threading.current_thread()
+        time.sleep(self.seconds)
+
+
+def test_close_joins_worker_processes_without_blocking_event_loop():
+    """测试关闭分布式 Worker 时事件循环上的其他任务继续运行"""
+    deployment = SlowDeployment(0.2)
+    team = GameMonitoringTeamV2(model_client=None, runtime=object(), worker_deployment=deployment)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        await team.close()
+        task.cancel()
+        return ticks
+
+    ticks = asyncio.run(run())
+
+    assert ticks > 5
+    assert deployment.closed_in is not threading.main_thread()
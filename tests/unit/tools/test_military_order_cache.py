@@ -0,0 +1,99 @@
+import asyncio
+import importlib
+import json
+import sys
+import types
+
+import pytest
+
+from game_monitoring.infrastructure.cache import PersistentResultCache
+from game_monitoring.infrastructure.llm import LLMGateway, LLMGatewayError, configure_llm_gateway
+
+
+class CountingBackend:
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    async def send(self, payload):
+        self.calls += 1
+        if self.fail:
+            raise LLMGatewayError("unavailable", status=400)
+        return {"choices": [{"message": {"content": f"军令{self.calls}"}}]}
+
+    async def close(self):
+        pass
+
+
+class FakeTemplateGenerator:
+    def __init__(self):
+        self.calls = 0
+
+    async def render(self, player_name, *args):
+        self.calls += 1
+        return f"{player_name}梯队军令"
+
+
+@pytest.fixture
+def order_tool(monkeypatch):
+    config_module = types.ModuleType("config")
+    config_module.doubao_client = None
+    config_module.qwen_client = None
+    monkeypatch.setitem(sys.modules, "config", config_module)
+
+    module = importlib.import_module("game_monitoring.tools.military_order_tool")
+    module.configure_order_cache(PersistentResultCache(":memory:"))
+    yield module
+    module.configure_order_cache(None)
+    configure_llm_gateway(None)
+
+
+def _generate(module, **kwargs):
+    result = asyncio.run(module.agenerate_military_order_with_llm(
+        "张三", team_levels=[52, 45, 40, 30], commander_order="全军进攻", **kwargs
+    ))
+    return json.loads(result)
+
+
+def test_repeated_order_is_served_from_cache(order_tool):
+    """测试相同输入的第二次生成直接命中缓存，不再调用LLM"""
+    backend = CountingBackend()
+    configure_llm_gateway(LLMGateway(backend))
+
+    first = _generate(order_tool)
+    second = _generate(order_tool)
+
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["military_order"] == first["military_order"] == "军令1"
+    assert backend.calls == 1
+
+
+def test_fallback_orders_are_not_cached(order_tool):
+    """测试LLM失败时的备用军令不写入缓存"""
+    backend = CountingBackend(fail=True)
+    configure_llm_gateway(LLMGateway(backend))
+
+    first = _generate(order_tool)
+    second = _generate(order_tool)
+
+    assert "作战军令" in first["military_order"]
+    assert second["cached"] is False
+    assert backend.calls == 2
+    assert len(order_tool.get_order_cache()) == 0
+
+
+def test_generation_mode_and_prompt_version_change_the_cache_key(order_tool, monkeypatch):
+    """测试生成方式或提示词版本变化时不命中旧缓存"""
+    backend = CountingBackend()
+    configure_llm_gateway(LLMGateway(backend))
+    templates = FakeTemplateGenerator()
+
+    assert _generate(order_tool)["cached"] is False
+    assert _generate(order_tool, template_generator=templates)["cached"] is False
+    assert _generate(order_tool, template_generator=templates)["cached"] is True
+    assert templates.calls == 1
+
+    monkeypatch.setattr(order_tool, "ORDER_PROMPT_VERSION", order_tool.ORDER_PROMPT_VERSION + 1)
+    assert _generate(order_tool)["cached"] is False
+    assert backend.calls == 2
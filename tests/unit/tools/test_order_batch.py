@@ -0,0 +1,79 @@
+import asyncio
+import json
+import threading
+
+from game_monitoring.tools.order_batch import stream_military_orders
+
+
+def _requests(count):
+    return {f"玩家{i}": {"player_name": f"玩家{i}", "delay": 0.01 * (count - i)} for i in range(count)}
+
+
+async def _generate(player_name, delay):
+    await asyncio.sleep(delay)
+    if player_name == "玩家0":
+        raise RuntimeError("LLM unavailable")
+    return json.dumps({"player_name": player_name, "military_order": f"{player_name}出征"})
+
+
+def test_stream_yields_in_completion_order_and_captures_errors():
+    """测试结果按完成顺序产出，单个玩家失败不影响其他玩家"""
+    async def run():
+        return [outcome async for outcome in stream_military_orders(_requests(4), _generate, 4)]
+
+    outcomes = asyncio.run(run())
+
+    assert [outcome.player_name for outcome in outcomes] == ["玩家3", "玩家2", "玩家1", "玩家0"]
+    assert outcomes[0].result["military_order"] == "玩家3出征"
+    assert not outcomes[-1].ok
+    assert outcomes[-1].error == "LLM unavailable"
+
+
+def test_stream_bounds_concurrency():
+    """测试同时进行的生成不超过 max_concurrency"""
+    state = {"now": 0, "max": 0}
+
+    async def generate(player_name, delay):
+        state["now"] += 1
+        state["max"] = max(state["max"], state["now"])
+        await asyncio.sleep(0.01)
+        state["now"] -= 1
+        return json.dumps({"player_name": player_name})
+
+    async def run():
+        return [outcome async for outcome in stream_military_orders(_requests(10), generate, 3)]
+
+    outcomes = asyncio.run(run())
+
+    assert len(outcomes) == 10
+    assert state["max"] == 3
+
+
+def test_stream_cancels_in_flight_generations():
+    """测试取消信号置位后停止产出并取消进行中的生成"""
+    cancel_event = threading.Event()
+    cancelled = []
+
+    async def generate(player_name, delay):
+        if player_name == "玩家0":
+            cancel_event.set()
+            return json.dumps({"player_name": player_name})
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(player_name)
+            raise
+
+    async def run():
+        requests = {f"玩家{i}": {"player_name": f"玩家{i}", "delay": 0} for i in range(6)}
+        return [
+            outcome
+            async for outcome in stream_military_orders(
+                requests, generate, 3, cancel_event=cancel_event, poll_interval=0.01
+            )
+        ]
+
+    outcomes = asyncio.run(run())
+
+    assert [outcome.player_name for outcome in outcomes] == ["玩家0"]
+    assert sorted(cancelled) == ["玩家1", "玩家2"]
@@ -0,0 +1,92 @@
+import asyncio
+
+from game_monitoring.tools.order_templates import (
+    NO_TEAM_COHORT,
+    CohortOrderGenerator,
+    cohort_of,
+    fill_order_template,
+)
+
+
+def _team(number, level, capability):
+    return {
+        "team_number": number,
+        "level": level,
+        "stamina": 80,
+        "capability": capability,
+        "assignment": f"第{number}队任务",
+    }
+
+
+def _fallback(player_name, team_assignments, backpack_items, reserve_troops, event_info):
+    return f"备用军令:{player_name}"
+
+
+def test_cohort_uses_strongest_team():
+    """测试梯队取最强可用队伍的能力"""
+    assert cohort_of([_team(1, 40, "8级地"), _team(2, 52, "12级地")]) == "12级地"
+    assert cohort_of([]) == NO_TEAM_COHORT
+
+
+def test_fill_order_template_replaces_placeholders():
+    """测试占位符替换为玩家差量"""
+    skeleton = "{player_name}将军：\n{team_details}\n{resource_advice}\n为国争光！"
+
+    order = fill_order_template(skeleton, "张三", [_team(1, 50, "12级地")], ["加速令"], 3000)
+
+    assert order.startswith("张三将军：")
+    assert "第1队（50级，体力80%）：第1队任务" in order
+    assert "预备兵3000" in order and "加速令" in order
+    assert "{" not in order
+
+
+def test_fill_order_template_appends_missing_placeholders():
+    """测试 LLM 漏掉占位符时补齐玩家信息"""
+    order = fill_order_template("全军出击！", "李四", [], [], 0)
+
+    assert order.startswith("李四将军：")
+    assert "暂无可用队伍" in order
+    assert "预备兵0" in order
+
+
+def test_skeleton_generated_once_per_cohort():
+    """测试同一梯队的并发玩家共享一次骨架生成"""
+    prompts = []
+
+    async def complete(prompt, system_message=None):
+        prompts.append(prompt)
+        await asyncio.sleep(0.01)
+        return "{player_name}将军：{team_details} {resource_advice}"
+
+    generator = CohortOrderGenerator(complete, "系统", _fallback)
+    players = [(f"玩家{i}", [_team(1, 50 if i % 2 else 42, "12级地" if i % 2 else "8级地")]) for i in range(10)]
+
+    async def run():
+        return await asyncio.gather(
+            *(generator.generate(name, teams, [], 100, {}, "总军令") for name, teams in players)
+        )
+
+    orders = asyncio.run(run())
+
+    assert len(prompts) == 2
+    assert all("玩家1" not in prompt and "玩家2" not in prompt for prompt in prompts)
+    assert orders[3].startswith("玩家3将军：")
+    assert generator.stats.skeletons == 2
+    assert generator.stats.filled == 10
+
+
+def test_skeleton_failure_falls_back_per_player():
+    """测试骨架生成失败时使用备用军令"""
+    async def complete(prompt, system_message=None):
+        raise RuntimeError("LLM unavailable")
+
+    generator = CohortOrderGenerator(complete, "系统", _fallback)
+
+    async def run():
+        return [
+            await generator.generate(name, [_team(1, 50, "12级地")], [], 0, {}, "总军令")
+            for name in ("甲", "乙")
+        ]
+
+    assert asyncio.run(run()) == ["备用军令:甲", "备用军令:乙"]
+    assert generator.stats.fallbacks == 2
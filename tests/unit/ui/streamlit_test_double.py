@@ -35,6 +35,7 @@ class FakeStreamlit(types.ModuleType):
         self.successes = []
         self.writes = []
         self.metrics = []
+        self.progress_values = []
         self.json_payloads = []
         self.expanders = []
         self.tab_sets = []
@@ -78,6 +79,9 @@ class FakeStreamlit(types.ModuleType):
     def metric(self, label, value, delta=None):
         self.metrics.append((label, value, delta))
 
+    def progress(self, value, text=None):
+        self.progress_values.append((value, text))
+
     def json(self, payload):
         self.json_payloads.append(payload)
 
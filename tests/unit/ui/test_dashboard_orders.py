@@ -93,3 +93,107 @@ def test_run_batch_generation_records_missing_player_and_generator_errors():
     assert "未找到玩家信息" in session_state["batch_generated_orders"][0]["error"]
     assert session_state["batch_generated_orders"][1]["error"] == "generator failed"
     assert session_state["batch_generation_error"] == "generator failed"
+
+
+def test_run_batch_generation_runs_players_concurrently_and_streams_results():
+    import asyncio
+
+    class Repo:
+        @staticmethod
+        def get_by_name(name):
+            return PlayerEntity(player_name=name, player_id=f"{name}_id")
+
+    session_state = {
+        "batch_generated_orders": [],
+        "batch_generation_processed": 0,
+        "batch_generation_in_progress": True,
+        "batch_generation_error": None,
+    }
+    in_flight = {"now": 0, "max": 0}
+
+    async def generate_order(**kwargs):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        # 慢玩家后完成，结果按完成顺序追加
+        await asyncio.sleep(0.05 if kwargs["player_name"] == "慢玩家" else 0.01)
+        in_flight["now"] -= 1
+        return json.dumps({"player_name": kwargs["player_name"], "military_order": "attack"})
+
+    run_batch_generation(
+        session_state,
+        {"player_repository": Repo()},
+        ["慢玩家", "玩家B", "玩家C", "玩家D"],
+        "总军令",
+        generate_order,
+        max_concurrency=2,
+    )
+
+    names = [order["player_name"] for order in session_state["batch_generated_orders"]]
+    assert session_state["batch_generation_processed"] == 4
+    assert in_flight["max"] == 2
+    assert names[0] == "玩家B"
+    assert sorted(names) == sorted(["慢玩家", "玩家B", "玩家C", "玩家D"])
+    assert session_state["batch_generation_cancelled"] is False
+
+
+def test_run_batch_generation_stops_when_cancelled():
+    import threading
+
+    class Repo:
+        @staticmethod
+        def get_by_name(name):
+            return PlayerEntity(player_name=name, player_id=f"{name}_id")
+
+    session_state = {"batch_generation_in_progress": True}
+    cancel_event = threading.Event()
+
+    def generate_order(**kwargs):
+        # 第一个玩家完成后取消，剩余玩家不再启动
+        cancel_event.set()
+        return json.dumps({"player_name": kwargs["player_name"], "military_order": "attack"})
+
+    run_batch_generation(
+        session_state,
+        {"player_repository": Repo()},
+        [f"玩家{i}" for i in range(5)],
+        "总军令",
+        generate_order,
+        max_concurrency=1,
+        cancel_event=cancel_event,
+    )
+
+    assert session_state["batch_generation_processed"] == 1
+    assert session_state["batch_generation_cancelled"] is True
+    assert session_state["batch_generation_in_progress"] is False
+
+
+def test_run_batch_generation_uses_given_runner():
+    import asyncio
+
+    class Repo:
+        @staticmethod
+        def get_by_name(name):
+            return PlayerEntity(player_name=name, player_id=f"{name}_id")
+
+    loop = asyncio.new_event_loop()
+    used_loops = []
+
+    async def generate_order(**kwargs):
+        used_loops.append(asyncio.get_running_loop())
+        return json.dumps({"player_name": kwargs["player_name"], "military_order": "attack"})
+
+    session_state = {"batch_generation_in_progress": True}
+    try:
+        run_batch_generation(
+            session_state,
+            {"player_repository": Repo()},
+            ["玩家1", "玩家2"],
+            "总军令",
+            generate_order,
+            runner=loop.run_until_complete,
+        )
+    finally:
+        loop.close()
+
+    assert used_loops == [loop, loop]
+    assert session_state["batch_generation_processed"] == 2
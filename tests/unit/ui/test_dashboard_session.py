@@ -1,3 +1,4 @@
+from game_monitoring.infrastructure.monitoring.tracer import TraceLevel, Tracer
 from game_monitoring.ui.dashboard_session import (
     TeamAnalysisLogCapture,
     append_dashboard_log,
@@ -71,3 +72,19 @@ def test_team_analysis_log_capture_syncs_session_state_only_while_capturing():
 
     assert capture.get_all_logs() == ["[10:00:00.000] hello"]
     assert session_state["team_analysis_logs"] == ["[10:00:00.000] hello"]
+
+
+def test_team_analysis_log_capture_subscribes_to_tracer_while_capturing():
+    tracer = Tracer()
+    session_state = {"team_analysis_logs": []}
+    capture = TeamAnalysisLogCapture(session_state, tracer=tracer)
+
+    tracer.info("tool.start", "before {player_id}", player_id="p1")
+    capture.start_capture()
+    tracer.info("tool.start", "during {player_id}", player_id="p1")
+    tracer.debug("monitor.detail", "too verbose")
+    capture.stop_capture()
+    tracer.info("tool.start", "after {player_id}", player_id="p1")
+
+    assert session_state["team_analysis_logs"] == ["during p1"]
+    assert not tracer.enabled(TraceLevel.INFO)
@@ -65,3 +65,46 @@ def test_render_orders_tab_shows_no_players_message(monkeypatch):
     tab_module.render_orders_tab(_build_ctx(runtime={}))
 
     assert any("暂无可用玩家" in value for value in fake_streamlit.infos)
+
+
+def test_render_orders_tab_shows_batch_progress_and_cancels(monkeypatch):
+    import threading
+
+    fake_streamlit = install_streamlit_test_double()
+    fake_streamlit.button_responses["cancel_batch_generation_tab4"] = True
+    tab_module = importlib.import_module("game_monitoring.ui.dashboard_tabs")
+    monkeypatch.setattr(tab_module, "get_player_names", lambda runtime: [])
+    cancel_event = threading.Event()
+
+    tab_module.render_orders_tab(
+        _build_ctx(
+            batch_generation_in_progress=True,
+            batch_generation_total=4,
+            batch_generation_processed=1,
+            batch_generation_cancel_event=cancel_event,
+        )
+    )
+
+    assert fake_streamlit.progress_values == [(0.25, "已完成 1/4")]
+    assert cancel_event.is_set()
+    assert fake_streamlit.rerun_called
+
+
+def test_render_orders_tab_marks_cached_orders(monkeypatch):
+    fake_streamlit = install_streamlit_test_double()
+    tab_module = importlib.import_module("game_monitoring.ui.dashboard_tabs")
+    monkeypatch.setattr(tab_module, "get_player_names", lambda runtime: [])
+
+    tab_module.render_orders_tab(
+        _build_ctx(
+            batch_generated_orders=[
+                {"player_name": "玩家A", "player_id": "a", "military_order": "进攻", "cached": True},
+                {"player_name": "玩家B", "player_id": "b", "military_order": "防守", "cached": False},
+            ]
+        )
+    )
+
+    labels = [label for label, _ in fake_streamlit.expanders]
+    assert "👤 玩家A (a) ⚡ 缓存" in labels
+    assert "👤 玩家B (b)" in labels
+    assert any("1/2 份军令来自缓存" in value for value in fake_streamlit.infos)
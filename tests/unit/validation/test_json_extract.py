@@ -0,0 +1,79 @@
+import json
+import time
+
+import pytest
+
+from game_monitoring.infrastructure.validation.json_extract import (
+    extract_json_object,
+    object_spans,
+)
+
+
+def test_extracts_object_from_code_fence():
+    """测试从 Markdown 代码块中提取"""
+    text = '分析如下：\n```json\n{"emotion_type": "愤怒", "confidence": 0.9}\n```\n以上。'
+
+    assert extract_json_object(text) == {"emotion_type": "愤怒", "confidence": 0.9}
+
+
+def test_braces_inside_strings_do_not_break_matching():
+    """测试字符串中的括号和转义引号不影响配对"""
+    text = '结果: {"reason": "玩家说 \\"}{\\" 然后离开", "confidence": 0.5} 完毕'
+
+    assert extract_json_object(text)["reason"] == '玩家说 "}{" 然后离开'
+
+
+def test_skips_prose_braces_and_returns_first_object():
+    """测试跳过正文中的花括号，返回第一个合法对象"""
+    text = '思考 {不是JSON} 然后 {"a": 1} 以及 {"b": 2}'
+
+    assert extract_json_object(text) == {"a": 1}
+
+
+def test_finds_object_nested_in_unparseable_wrapper():
+    """测试外层区间无法解析时继续尝试内层对象"""
+    text = '{ 说明: {"a": {"b": 1}} }'
+
+    assert extract_json_object(text) == {"a": {"b": 1}}
+
+
+def test_unclosed_braces_before_object():
+    """测试前面存在未闭合的括号时仍能找到对象"""
+    assert extract_json_object('{ 未闭合 {"a": 1}') == {"a": 1}
+
+
+def test_object_spans_are_sorted_by_start():
+    """测试配对区间按起始位置排序"""
+    assert object_spans('{"a": {"b": 1}}') == [(0, 15), (6, 14)]
+
+
+def test_no_object_raises():
+    """测试找不到对象时抛出 JSONDecodeError"""
+    with pytest.raises(json.JSONDecodeError):
+        extract_json_object("{ 只有 } 正文 {")
+
+
+def test_many_braces_are_scanned_in_linear_time():
+    """测试大量花括号的输出不会退化为平方复杂度"""
+    text = "{" * 50_000 + "{x} " * 50_000 + '{"emotion_type": "沮丧"}'
+
+    started = time.perf_counter()
+    result = extract_json_object(text)
+    elapsed = time.perf_counter() - started
+
+    assert result == {"emotion_type": "沮丧"}
+    assert elapsed < 2.0
+
+
+def test_stray_quote_in_prose_braces_does_not_hide_object():
+    """测试正文花括号中的孤立引号不会让后面的对象丢失"""
+    text = 'The set {x | x "in A} is empty. Answer: {"emotion_type": "angry", "confidence": 0.9}'
+
+    assert extract_json_object(text) == {"emotion_type": "angry", "confidence": 0.9}
+
+
+def test_stray_quote_after_colon_falls_back_to_direct_decoding():
+    """测试孤立引号跟在冒号后时，兜底解码仍能找到对象"""
+    text = '{注意: "未闭合} 结果: {"a": 1}'
+
+    assert extract_json_object(text) == {"a": 1}
@@ -0,0 +1,105 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic import ValidationError
+
+from game_monitoring.domain.schemas import (
+    BehaviorWorkerOutput,
+    ChurnWorkerOutput,
+    EmotionWorkerOutput,
+)
+from game_monitoring.infrastructure.validation.output_validator import OutputValidator
+from game_monitoring.infrastructure.validation.repair import repair_json_text, repair_payload
+
+
+def test_repair_json_text_fixes_quotes_trailing_commas_and_literals():
+    """测试修复单引号、尾逗号和 Python 字面量"""
+    text = "结果: {'is_bot': True, 'risk_tags': ['脚本', \"it's\",], 'note': None,} 完"
+
+    repaired = repair_json_text(text)
+
+    assert json.loads(repaired[4:-2]) == {"is_bot": True, "risk_tags": ["脚本", "it's"], "note": None}
+
+
+def test_repair_json_text_leaves_string_contents_alone():
+    """测试字符串内部的逗号和关键字不被改动"""
+    text = '{"reason": "True, ]", "confidence": 0.5}'
+
+    assert repair_json_text(text) == text
+
+
+def test_repair_payload_coerces_and_clamps_fields():
+    """测试数值字符串转换、置信度截断和理由截断"""
+    payload = {
+        "emotion_type": "愤怒",
+        "confidence": "1.3",
+        "intervention_actions": ["send_email", {"action_type": "ban_player"}, {"detail": "x"}],
+        "reason": "很" * 300,
+    }
+
+    repaired = repair_payload(EmotionWorkerOutput, payload)
+
+    assert repaired["confidence"] == 1.0
+    assert repaired["intervention_actions"] == [{"action_type": "send_email"}]
+    assert len(repaired["reason"]) == 200
+    assert payload["confidence"] == "1.3"
+
+
+def test_repair_payload_for_churn_and_behavior():
+    """测试流失和行为 Schema 的修复"""
+    churn = repair_payload(
+        ChurnWorkerOutput,
+        {"risk_level": "高风险", "risk_score": "85%", "retention_plan": [{}], "expected_effectiveness": -0.2},
+    )
+    behavior = repair_payload(
+        BehaviorWorkerOutput,
+        {"is_bot": "是", "bot_confidence": 0.9, "control_measures": [{"action_type": "limit"}], "risk_tags": []},
+    )
+
+    assert ChurnWorkerOutput.model_validate(churn).risk_score == 0.85
+    assert churn["expected_effectiveness"] == 0.0
+    assert churn["retention_plan"] == []
+    assert BehaviorWorkerOutput.model_validate(behavior).is_bot is True
+
+
+def test_validator_repairs_locally_without_llm_call():
+    """测试可本地修复的输出不调用 LLM"""
+    validator = OutputValidator(EmotionWorkerOutput)
+    model_client = AsyncMock()
+    raw = "{'emotion_type': '沮丧', 'confidence': '0.9', 'intervention_actions': [], 'reason': 'ok',}"
+
+    result = asyncio.run(validator.validate_output(raw, model_client))
+
+    assert result.confidence == 0.9
+    assert validator.local_repairs == 1
+    assert validator.llm_corrections == 0
+    model_client.create.assert_not_called()
+
+
+def test_validator_uses_llm_when_repair_fails():
+    """测试本地无法修复时仍走 LLM 自我修正"""
+    validator = OutputValidator(EmotionWorkerOutput)
+    model_client = AsyncMock()
+    model_client.create.return_value.choices = [AsyncMock()]
+    model_client.create.return_value.choices[0].message.content = json.dumps(
+        {"emotion_type": "正常", "confidence": 0.5, "intervention_actions": [], "reason": "修正"}
+    )
+
+    result = asyncio.run(validator.validate_output('{"emotion_type": "开心"}', model_client))
+
+    assert result.emotion_type == "正常"
+    assert validator.llm_corrections == 1
+
+
+def test_repair_payload_leaves_non_finite_numbers_for_validation():
+    """测试 NaN 和溢出的数值不会被截断成边界值，仍然验证失败"""
+    for confidence in (float("nan"), "nan", "1e400", float("-inf")):
+        payload = {"emotion_type": "愤怒", "confidence": confidence, "intervention_actions": [], "reason": "r"}
+
+        repaired = repair_payload(EmotionWorkerOutput, payload)
+
+        assert repaired["confidence"] is confidence
+        with pytest.raises(ValidationError):
+            EmotionWorkerOutput.model_validate(repaired)
@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import pytest
+
+from game_monitoring.domain.schemas import EmotionWorkerOutput
+from game_monitoring.infrastructure.validation import (
+    IncrementalObjectParser,
+    OutputValidationError,
+    StreamingOutputValidator,
+)
+
+VALID = {
+    "emotion_type": "愤怒",
+    "confidence": 0.9,
+    "intervention_actions": [{"action_type": "send_email"}],
+    "reason": "连续失败后情绪激动",
+}
+
+
+class ScriptedStream:
+    """按脚本逐块输出，记录每次调用消费到的块数"""
+
+    def __init__(self, *scripts):
+        self.scripts = list(scripts)
+        self.calls = []
+        self.consumed = []
+
+    def __call__(self, messages):
+        self.calls.append(messages)
+        chunks = self.scripts[len(self.calls) - 1]
+        index = len(self.consumed)
+        self.consumed.append(0)
+
+        async def generate():
+            for chunk in chunks:
+                self.consumed[index] += 1
+                yield chunk
+
+        return generate()
+
+
+def _chunks(text, size=4):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_incremental_parser_reports_completed_members():
+    """测试顶层成员在逗号或右括号到达时完成"""
+    parser = IncrementalObjectParser()
+
+    assert parser.feed('思考中 {"a": {"b": [1, ","]}') == []
+    assert parser.feed(', "c": "x\\"y"') == [("a", {"b": [1, ","]})]
+    assert parser.partial_string_value() is None
+    assert parser.feed(', "d": "ab') == [("c", 'x"y')]
+    assert parser.partial_string_value() == ("d", "ab")
+    assert parser.feed('c"} 尾巴') == [("d", "abc")]
+    assert parser.complete
+    assert json.loads(parser.text) == {"a": {"b": [1, ","]}, "c": 'x"y', "d": "abc"}
+
+
+def test_stream_returns_on_closing_brace_without_reading_rest():
+    """测试对象闭合后立即返回，不再读取后续输出"""
+    stream = ScriptedStream([*_chunks(json.dumps(VALID, ensure_ascii=False)), " 以上是分析", "。" * 50])
+    validator = StreamingOutputValidator(EmotionWorkerOutput)
+
+    result = asyncio.run(validator.validate_stream(stream, [{"role": "user", "content": "分析"}]))
+
+    assert result.emotion_type == "愤怒"
+    assert stream.consumed[0] < len(stream.scripts[0])
+    assert validator.stats.closed_early == 1
+
+
+def test_stream_aborts_on_invalid_literal_prefix_and_reprompts():
+    """测试枚举字段前缀不可能合法时立即中止并重新提示"""
+    bad = ['{"emotion_type": "', "开", "心", '", "confidence": 0.9'] + ["x"] * 20
+    stream = ScriptedStream(bad, [json.dumps(VALID, ensure_ascii=False)])
+    validator = StreamingOutputValidator(EmotionWorkerOutput)
+
+    result = asyncio.run(validator.validate_stream(stream, [{"role": "user", "content": "分析"}]))
+
+    assert result.emotion_type == "愤怒"
+    assert stream.consumed[0] == 2
+    assert validator.stats.aborted == 1
+    correction = stream.calls[1][-1]["content"]
+    assert "emotion_type" in correction
+    assert '{"emotion_type": "开' in correction
+
+
+def test_stream_repairs_fields_locally_instead_of_aborting():
+    """测试可本地修复的字段不会触发中止"""
+    payload = dict(VALID, confidence="1.4", intervention_actions=["send_email", {"action_type": "ban"}])
+    stream = ScriptedStream(_chunks(json.dumps(payload, ensure_ascii=False)))
+    validator = StreamingOutputValidator(EmotionWorkerOutput)
+
+    result = asyncio.run(validator.validate_stream(stream, [{"role": "user", "content": "分析"}]))
+
+    assert result.confidence == 1.0
+    assert result.intervention_actions == [{"action_type": "send_email"}]
+    assert len(stream.calls) == 1
+    assert validator.stats.aborted == 0
+
+
+def test_stream_raises_after_max_retries():
+    """测试多次中止后抛出 OutputValidationError"""
+    invalid = dict(VALID, confidence=2)
+    script = _chunks(json.dumps(invalid, ensure_ascii=False))
+    stream = ScriptedStream(script, script)
+    validator = StreamingOutputValidator(EmotionWorkerOutput, max_retries=2, local_repair=False)
+
+    with pytest.raises(OutputValidationError) as exc_info:
+        asyncio.run(validator.validate_stream(stream, [{"role": "user", "content": "分析"}]))
+
+    assert exc_info.value.retry_count == 2
+    assert len(stream.calls) == 2